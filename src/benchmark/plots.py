@@ -21,10 +21,21 @@ def _sort_level_keys(level_keys):
 
 def _get_levels_from_results(results):
     """Extract ordered level keys from results."""
-    first_method_key = next(iter(METHODS))
+    first_method_key = next(iter(results))
     return _sort_level_keys(results[first_method_key].keys())
 
 
+def _methods_in(results):
+    """(method_key, label) for every method present in results."""
+    return [(key, METHODS.get(key, key)) for key in results]
+
+
+def _bar_layout(n_methods):
+    """Bar width and per-method offsets for grouped bars."""
+    width = 0.8 / n_methods
+    return width, [(i - (n_methods - 1) / 2) * width for i in range(n_methods)]
+
+
 def _level_label(level_key):
     """Human-readable level label."""
     if isinstance(level_key, (int, float)):
@@ -53,12 +64,12 @@ def plot_clauses_per_level(results, output_dir):
     """Bar chart: total number of clauses per level, grouped by method."""
     levels = _get_levels_from_results(results)
     x = np.arange(len(levels))
-    width = 0.35
+    methods = _methods_in(results)
+    width, offsets = _bar_layout(len(methods))
 
     fig, ax = plt.subplots(figsize=(10, 6))
-    for i, (method_key, method_label) in enumerate(METHODS.items()):
+    for (method_key, method_label), offset in zip(methods, offsets):
         clauses = [results[method_key][lvl]["total_clauses"] for lvl in levels]
-        offset = (i - 0.5) * width + width / 2
         bars = ax.bar(x + offset, clauses, width, label=method_label)
         for bar, val in zip(bars, clauses):
             ax.text(
@@ -87,15 +98,18 @@ def plot_clauses_breakdown(results, output_dir):
     """Stacked bar chart: clause breakdown by constraint type, per level & method."""
     levels = _get_levels_from_results(results)
     all_constraint_names = set()
-    for method_key in METHODS:
+    methods = _methods_in(results)
+    for method_key, _ in methods:
         for lvl in levels:
             all_constraint_names.update(
                 results[method_key][lvl]["constraint_clauses"].keys()
             )
     constraint_names = sorted(all_constraint_names)
 
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6), sharey=True)
-    for ax, (method_key, method_label) in zip(axes, METHODS.items()):
+    fig, axes = plt.subplots(
+        1, len(methods), figsize=(8 * len(methods), 6), sharey=True, squeeze=False
+    )
+    for ax, (method_key, method_label) in zip(axes[0], methods):
         x = np.arange(len(levels))
         bottom = np.zeros(len(levels))
         for cname in constraint_names:
@@ -125,7 +139,8 @@ def plot_method_clauses_breakdown(results, output_dir):
     """Stacked bar: clause breakdown by sub-method inside MovementConstraints."""
     levels = _get_levels_from_results(results)
     all_method_names = set()
-    for method_key in METHODS:
+    methods = _methods_in(results)
+    for method_key, _ in methods:
         for lvl in levels:
             mc = results[method_key][lvl]["constraint_method_clauses"].get(
                 "MovementConstraints", {}
@@ -133,8 +148,10 @@ def plot_method_clauses_breakdown(results, output_dir):
             all_method_names.update(mc.keys())
     method_names = sorted(all_method_names)
 
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6), sharey=True)
-    for ax, (method_key, method_label) in zip(axes, METHODS.items()):
+    fig, axes = plt.subplots(
+        1, len(methods), figsize=(8 * len(methods), 6), sharey=True, squeeze=False
+    )
+    for ax, (method_key, method_label) in zip(axes[0], methods):
         x = np.arange(len(levels))
         bottom = np.zeros(len(levels))
         for mname in method_names:
@@ -166,13 +183,13 @@ def plot_times_per_level(results, output_dir):
     """Bar chart: mean generation time and solve time, grouped by method."""
     levels = _get_levels_from_results(results)
     x = np.arange(len(levels))
-    width = 0.35
+    methods = _methods_in(results)
+    width, offsets = _bar_layout(len(methods))
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-    for i, (method_key, method_label) in enumerate(METHODS.items()):
+    for (method_key, method_label), offset in zip(methods, offsets):
         means = [results[method_key][lvl]["mean_gen_time"] for lvl in levels]
         stds = [results[method_key][lvl]["std_gen_time"] for lvl in levels]
-        offset = (i - 0.5) * width + width / 2
         ax1.bar(x + offset, means, width, yerr=stds, label=method_label, capsize=3)
     ax1.set_xlabel("Level")
     ax1.set_ylabel("Time (seconds)")
@@ -182,10 +199,9 @@ def plot_times_per_level(results, output_dir):
     ax1.legend()
     ax1.grid(axis="y", alpha=0.3)
 
-    for i, (method_key, method_label) in enumerate(METHODS.items()):
+    for (method_key, method_label), offset in zip(methods, offsets):
         means = [results[method_key][lvl]["mean_solve_time"] for lvl in levels]
         stds = [results[method_key][lvl]["std_solve_time"] for lvl in levels]
-        offset = (i - 0.5) * width + width / 2
         ax2.bar(x + offset, means, width, yerr=stds, label=method_label, capsize=3)
     ax2.set_xlabel("Level")
     ax2.set_ylabel("Time (seconds)")
@@ -205,13 +221,13 @@ def plot_total_time(results, output_dir):
     """Bar chart: mean total time (gen + solve), grouped by method."""
     levels = _get_levels_from_results(results)
     x = np.arange(len(levels))
-    width = 0.35
+    methods = _methods_in(results)
+    width, offsets = _bar_layout(len(methods))
 
     fig, ax = plt.subplots(figsize=(10, 6))
-    for i, (method_key, method_label) in enumerate(METHODS.items()):
+    for (method_key, method_label), offset in zip(methods, offsets):
         gen_means = [results[method_key][lvl]["mean_gen_time"] for lvl in levels]
         solve_means = [results[method_key][lvl]["mean_solve_time"] for lvl in levels]
-        offset = (i - 0.5) * width + width / 2
         ax.bar(x + offset, gen_means, width, label=f"{method_label} — generation")
         ax.bar(
             x + offset,
@@ -240,7 +256,7 @@ def plot_clause_vs_time_scatter(results, output_dir):
     levels = _get_levels_from_results(results)
 
     fig, ax = plt.subplots(figsize=(10, 6))
-    for method_key, method_label in METHODS.items():
+    for method_key, method_label in _methods_in(results):
         clauses, solve_times, labels = [], [], []
         for lvl in levels:
             data = results[method_key][lvl]
@@ -19,7 +19,7 @@ def _sort_level_keys(level_keys):
 
 def print_summary_table(results):
     """Print a summary table to the console."""
-    first_method_key = next(iter(METHODS))
+    first_method_key = next(iter(results))
     levels = _sort_level_keys(results[first_method_key].keys())
 
     print("\n" + "=" * 90)
@@ -30,7 +30,8 @@ def print_summary_table(results):
     print("=" * 90)
 
     for lvl in levels:
-        for method_key, method_label in METHODS.items():
+        for method_key in results:
+            method_label = METHODS.get(method_key, method_key)
             data = results[method_key][lvl]
             print(
                 f"{str(lvl):<18} "
@@ -7,26 +7,88 @@ import numpy as np
 from lle import World
 
 from levels import LLE_LEVELS
-from solver import LLEAdapter, WorldSolver
-from solver.constraints.movements import METHOD_GLOBAL, METHOD_LOCAL
+from solver import CNFCache, LLEAdapter, WorldSolver
+from solver.constraints.cardinality import (
+    AMO_COMMANDER,
+    AMO_LADDER,
+    AMO_PRODUCT,
+    AMO_SEQUENTIAL,
+)
+from solver.constraints.lasers import LASER_BLOCKER, LASER_RAY
+from solver.constraints.movements import (
+    COLLISION_OCCUPANCY,
+    METHOD_GLOBAL,
+    METHOD_LOCAL,
+)
+from solver.result_store import VARIANT_SOLVE, ResultStore
 
 METHODS = {
     METHOD_LOCAL: "Local (neighbor exclusion)",
     METHOD_GLOBAL: "Global (all-pairs exclusion)",
+    "local_numpy": "Local, NumPy generation",
+    "global_numpy": "Global, NumPy generation",
+    "global_sequential": "Global, sequential counter AMO",
+    "global_commander": "Global, commander AMO",
+    "global_product": "Global, product AMO",
+    "global_ladder": "Global, ladder AMO",
+    "local_occupancy": "Local, occupancy collisions",
+    "local_ray": "Local, ray laser variables",
+    "local_blocker": "Local, ray blocker auxiliaries",
 }
 
+# The two movement rules; the other encodings are opt-in through methods.
+DEFAULT_METHODS = (METHOD_LOCAL, METHOD_GLOBAL)
 
-def run_single(world: World, t_max: int, method: str) -> dict:
-    """Run solver once with profiling. Returns profiling dict."""
+# WorldSolver keyword arguments behind each benchmarked method.
+METHOD_OPTIONS = {
+    METHOD_LOCAL: {"movement_method": METHOD_LOCAL},
+    METHOD_GLOBAL: {"movement_method": METHOD_GLOBAL},
+    "local_numpy": {"movement_method": METHOD_LOCAL, "vectorized": True},
+    "global_numpy": {"movement_method": METHOD_GLOBAL, "vectorized": True},
+    "global_sequential": {"movement_method": METHOD_GLOBAL, "amo_encoding": AMO_SEQUENTIAL},
+    "global_commander": {"movement_method": METHOD_GLOBAL, "amo_encoding": AMO_COMMANDER},
+    "global_product": {"movement_method": METHOD_GLOBAL, "amo_encoding": AMO_PRODUCT},
+    "global_ladder": {"movement_method": METHOD_GLOBAL, "amo_encoding": AMO_LADDER},
+    "local_occupancy": {
+        "movement_method": METHOD_LOCAL,
+        "collision_encoding": COLLISION_OCCUPANCY,
+    },
+    "local_ray": {"movement_method": METHOD_LOCAL, "laser_encoding": LASER_RAY},
+    "local_blocker": {
+        "movement_method": METHOD_LOCAL,
+        "laser_encoding": LASER_BLOCKER,
+    },
+}
+
+
+def run_single(
+    world: World,
+    t_max: int,
+    method: str,
+    cnf_cache: CNFCache | None = None,
+    solve: bool = True,
+) -> dict:
+    """Run solver once with profiling. Returns profiling dict.
+
+    With solve=False the model is only encoded (for its clause breakdown)
+    and "satisfiable" is None.
+    """
+    if method not in METHOD_OPTIONS:
+        raise ValueError(f"Unknown benchmark method: {method}")
     world.reset()
     adapted = LLEAdapter(world)
     solver = WorldSolver(
         adapted,
         T_MAX=t_max,
         enable_profiling=True,
-        movement_method=method,
+        cnf_cache=cnf_cache,
+        **METHOD_OPTIONS[method],
     )
-    result, _model = solver.solve()
+    if solve:
+        result, _model = solver.solve()
+    else:
+        solver.build_model()
+        result = None
     data = solver.get_profiling_data()
     data["satisfiable"] = result
     return data
@@ -107,9 +169,26 @@ def _fresh_world(world: World) -> World:
     return deepcopy(world)
 
 
-def run_benchmark(num_runs=100, levels=None):
+def _stored_answer(result_store: ResultStore, world: World, t_max: int):
+    """The level's stored answer, None when it has none yet."""
+    world.reset()
+    stored = result_store.get(LLEAdapter(world), t_max, VARIANT_SOLVE)
+    return None if stored is None else stored.satisfiable
+
+
+def _check_answer(satisfiable, expected: bool, label: str):
+    if bool(satisfiable) != expected:
+        raise RuntimeError(
+            f"{label}: answer {bool(satisfiable)} disagrees with the stored "
+            f"answer {expected}"
+        )
+
+
+def run_benchmark(
+    num_runs=100, levels=None, methods=None, cnf_cache=None, result_store=None
+):
     """
-    Run benchmark for all movement methods and provided levels.
+    Run benchmark for the selected methods and provided levels.
 
     Parameters
     ----------
@@ -121,6 +200,17 @@ def run_benchmark(num_runs=100, levels=None):
           - dict[level_key] = (world, t_max)
           - iterable of (level_key, world, t_max)
           - iterable of (level_key, (world, t_max))
+    methods : None | iterable of str
+        Keys of METHODS to run. If None, run DEFAULT_METHODS.
+    cnf_cache : None | CNFCache
+        If given, the first run of every method/level still encodes (for the
+        clause breakdown) and stores its CNF; the timing runs then load it,
+        so gen_times measure cache loads and solve_times are unaffected.
+    result_store : None | ResultStore
+        If given, a stored answer replaces the untimed first solve, whose
+        model is then only encoded for the clause breakdown; a missing one is
+        stored. Timing runs still solve, since solving is what they measure,
+        and each of their answers must agree with the stored one.
 
     Returns
     -------
@@ -130,16 +220,47 @@ def run_benchmark(num_runs=100, levels=None):
     if num_runs < 1:
         raise ValueError(f"num_runs must be >= 1. Got {num_runs}")
 
+    method_keys = list(DEFAULT_METHODS if methods is None else methods)
+    for method_key in method_keys:
+        if method_key not in METHODS:
+            raise ValueError(f"Unknown benchmark method: {method_key}")
+
     level_entries = list(_normalize_levels(levels))
     results = {}
 
-    for method_key, method_label in METHODS.items():
+    for method_key in method_keys:
+        method_label = METHODS[method_key]
         results[method_key] = {}
 
         for level_key, world_template, t_max in level_entries:
             print(f"  [{method_label}] Level {level_key}: ", end="", flush=True)
 
-            first_run = run_single(_fresh_world(world_template), t_max, method_key)
+            label = f"[{method_key}] level {level_key}"
+            stored = None
+            if result_store is not None:
+                stored = _stored_answer(
+                    result_store, _fresh_world(world_template), t_max
+                )
+            # A stored answer spares the untimed solve: the first run only
+            # encodes, for the clause breakdown.
+            first_run = run_single(
+                _fresh_world(world_template), t_max, method_key, solve=stored is None
+            )
+            satisfiable = first_run["satisfiable"] if stored is None else stored
+            if result_store is not None and stored is None:
+                world = _fresh_world(world_template)
+                world.reset()
+                result_store.put(
+                    LLEAdapter(world), t_max, VARIANT_SOLVE, bool(satisfiable)
+                )
+            if cnf_cache is not None:
+                run_single(
+                    _fresh_world(world_template),
+                    t_max,
+                    method_key,
+                    cnf_cache,
+                    solve=False,
+                )
             total_clauses = first_run["total_clauses"]
             constraint_clauses = {}
             constraint_method_clauses = {}
@@ -153,9 +274,13 @@ def run_benchmark(num_runs=100, levels=None):
             gen_times = []
             solve_times = []
             for i in range(num_runs):
-                data = run_single(_fresh_world(world_template), t_max, method_key)
+                data = run_single(
+                    _fresh_world(world_template), t_max, method_key, cnf_cache
+                )
                 gen_times.append(data["total_generation_time"])
                 solve_times.append(data["solve_time"])
+                if result_store is not None:
+                    _check_answer(data["satisfiable"], bool(satisfiable), label)
                 if (i + 1) % 10 == 0:
                     print(".", end="", flush=True)
 
@@ -172,7 +297,7 @@ def run_benchmark(num_runs=100, levels=None):
                 "mean_solve_time": np.mean(solve_times),
                 "std_solve_time": np.std(solve_times),
                 "mean_total_time": np.mean(gen_times) + np.mean(solve_times),
-                "satisfiable": first_run["satisfiable"],
+                "satisfiable": satisfiable,
             }
 
     return results
@@ -2,6 +2,7 @@ import argparse
 from pathlib import Path
 
 from generators import GENERATOR_REGISTRY
+from generators.batch import DEFAULT_SHARD_SIZE
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -17,6 +18,37 @@ def build_parser() -> argparse.ArgumentParser:
 
     parser.add_argument("--save", type=Path, help="Folder to save generated levels")
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Generate levels in this many processes (level i uses seed --seed + i)",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["txt", "jsonl"],
+        default="txt",
+        help=(
+            "txt: one generated_level_<i>.txt per level; jsonl: append-only "
+            "levels-<k>.jsonl shards with world string, seed and attempts"
+        ),
+    )
+
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=DEFAULT_SHARD_SIZE,
+        help="Levels per JSONL shard",
+    )
+
+    parser.add_argument(
+        "--png",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Render a PNG per saved level once generation is done (default: txt only)",
+    )
+
     # Subparsers for generators
     subparsers = parser.add_subparsers(
         dest="generator", required=True, help="Generator to use"
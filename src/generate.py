@@ -1,35 +1,57 @@
+from contextlib import nullcontext
+
 import matplotlib.pyplot as plt
+from lle import World
 
 from cli import build_parser
-from generators import GENERATOR_REGISTRY
+from generators.batch import (
+    JsonlLevelWriter,
+    TextLevelWriter,
+    generate_levels,
+    render_pngs,
+)
 
 
 def main():
     parser = build_parser()
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error(f"--workers must be >= 1. Got {args.workers}")
+    if args.workers > 1 and getattr(args, "candidate_workers", 1) > 1:
+        parser.error("--workers and --candidate-workers cannot both be above 1")
+    if args.workers > 1 and getattr(args, "portfolio", None):
+        parser.error("--workers > 1 cannot be combined with --portfolio")
+
+    # PNGs default on for txt output and off for JSONL datasets.
+    png = args.format == "txt" if args.png is None else args.png
+
+    writer = None
+    if args.save:
+        if args.format == "jsonl":
+            writer = JsonlLevelWriter(args.save, shard_size=args.shard_size)
+        else:
+            writer = TextLevelWriter(args.save)
+
+    # Levels are written as they finish; images are only drawn afterwards.
+    to_render = []
+    with writer or nullcontext():
+        start_index = 0 if writer is None else writer.next_index
+        levels = generate_levels(args, workers=args.workers, start_index=start_index)
+        for level in levels:
+            if writer is not None:
+                writer.write(level)
+                if png:
+                    to_render.append((level.index, level.world))
 
-    generator_cls = GENERATOR_REGISTRY[args.generator]
-    generator = generator_cls.from_args(args)
-
-    for i in range(args.number):
-        world = generator.generate()
-        image = world.get_image()
-
-        if args.display or args.save:
             if args.display:
                 fig, ax = plt.subplots()
-                ax.imshow(image)
+                ax.imshow(World(level.world).get_image())
                 ax.axis("off")
                 plt.show()
                 plt.close(fig)
 
-            if args.save:
-                args.save.mkdir(parents=True, exist_ok=True)
-                filepath = args.save / f"generated_level_{i}.txt"
-                with filepath.open("w", encoding="utf-8") as f:
-                    f.write(world.world_string)
-
-                plt.imsave(args.save / f"generated_level_{i}.png", image)
+    if to_render:
+        render_pngs(args.save, to_render, workers=args.workers)
 
 
 if __name__ == "__main__":
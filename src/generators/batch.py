@@ -0,0 +1,188 @@
+"""
+Batch level generation for generate.py.
+
+Level i is produced by its own generator, built from the CLI arguments
+with seed = base + i, so a dataset only depends on the base seed: one
+process or many, the same levels come out. generate.py used to draw every
+level from one generator's random stream, so a given --seed call now
+yields a different dataset than it did then. Workers hand back plain
+GeneratedLevel records (world string, seed, attempts) as they finish, and
+the main process streams them to disk straight away. Rendering a PNG
+needs a full lle.World per level, so images are drawn afterwards from the
+stored world strings, and only when asked for.
+"""
+
+import json
+import multiprocessing as mp
+import random
+from argparse import Namespace
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+from lle import World
+
+from generators.registry import GENERATOR_REGISTRY
+
+DEFAULT_SHARD_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class GeneratedLevel:
+    index: int
+    generator: str
+    seed: int
+    attempts: int
+    world: str  # LLE world string
+
+
+def level_seeds(base_seed: int | None, number: int) -> list[int]:
+    """Per-level seeds; a missing base seed is drawn at random."""
+    if base_seed is None:
+        base_seed = random.SystemRandom().getrandbits(32)
+    return [base_seed + i for i in range(number)]
+
+
+def generate_level(args: Namespace, index: int, seed: int) -> GeneratedLevel:
+    generator = GENERATOR_REGISTRY[args.generator].from_args(
+        Namespace(**dict(vars(args), seed=seed))
+    )
+    world = generator.generate()
+    return GeneratedLevel(
+        index=index,
+        generator=args.generator,
+        seed=seed,
+        attempts=getattr(generator, "last_attempts", 1),
+        world=world.world_string,
+    )
+
+
+def _generate_job(job) -> GeneratedLevel:
+    return generate_level(*job)
+
+
+def generate_levels(args: Namespace, workers: int = 1, start_index: int = 0):
+    """Yield args.number GeneratedLevels, in completion order with workers > 1.
+
+    Indices start at start_index, so a run can continue a dataset's.
+    """
+    seeds = level_seeds(getattr(args, "seed", None), args.number)
+    jobs = [(args, start_index + i, seed) for i, seed in enumerate(seeds)]
+    if workers == 1:
+        for job in jobs:
+            yield _generate_job(job)
+        return
+
+    with mp.get_context().Pool(workers) as pool:
+        yield from pool.imap_unordered(_generate_job, jobs)
+
+
+class TextLevelWriter:
+    """One generated_level_{index}.txt file per level."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Every run numbers its files from 0, replacing earlier ones.
+        self.next_index = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, level: GeneratedLevel):
+        filepath = self.directory / f"generated_level_{level.index}.txt"
+        with filepath.open("w", encoding="utf-8") as f:
+            f.write(level.world)
+
+    def close(self):
+        pass
+
+
+class JsonlLevelWriter:
+    """
+    Append-only JSONL shards, levels-00000.jsonl, levels-00001.jsonl, ...
+
+    Each record is flushed as soon as it is written, so an interrupted run
+    keeps every level finished so far. A new run opens shards after the
+    highest numbered one already in the directory, never appending to an
+    existing shard, and next_index continues after the highest index stored
+    so far, so records of different runs never share an index.
+    """
+
+    def __init__(self, directory: Path, shard_size: int = DEFAULT_SHARD_SIZE):
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be >= 1. Got {shard_size}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        numbers = [int(path.stem.split("-")[1]) for path in _shards(self.directory)]
+        self._shard = max(numbers, default=-1) + 1
+        self.next_index = max(
+            (level.index + 1 for level in read_levels(self.directory)), default=0
+        )
+        self._written = 0
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, level: GeneratedLevel):
+        if self._file is None or self._written == self.shard_size:
+            self.close()
+            path = self.directory / f"levels-{self._shard:05d}.jsonl"
+            self._file = path.open("a", encoding="utf-8")
+            self._shard += 1
+            self._written = 0
+        self._file.write(json.dumps(asdict(level)) + "\n")
+        self._file.flush()
+        self._written += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+
+
+def read_levels(directory: Path) -> list[GeneratedLevel]:
+    """Every record of the JSONL shards in directory, by index."""
+    levels = []
+    for path in _shards(directory):
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    levels.append(GeneratedLevel(**json.loads(line)))
+    return sorted(levels, key=lambda level: level.index)
+
+
+def _shards(directory: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in Path(directory).glob("levels-*.jsonl")
+        if path.stem.split("-")[1].isdigit()
+    )
+
+
+def _render_png(job):
+    filepath, world_string = job
+    plt.imsave(filepath, World(world_string).get_image())
+
+
+def render_pngs(directory: Path, levels: list[tuple[int, str]], workers: int = 1):
+    """Draw generated_level_{index}.png for (index, world string) pairs."""
+    jobs = [
+        (Path(directory) / f"generated_level_{index}.png", world)
+        for index, world in levels
+    ]
+    if workers == 1:
+        for job in jobs:
+            _render_png(job)
+        return
+    with mp.get_context().Pool(workers) as pool:
+        for _ in pool.imap_unordered(_render_png, jobs):
+            pass
@@ -4,7 +4,6 @@ from generators.constructive_solvable_generator import ConstructiveSolvableGener
 from generators.random_solvable_generator import CandidateLayout
 from generators.registry import register_generator
 from generators.world_builder import Direction
-from solver import LLEAdapter
 from solver.cooperation_profile_analyzer import CooperationProfileAnalyzer
 
 
@@ -82,21 +81,26 @@ class ConstructiveCooperativeGenerator(ConstructiveSolvableGenerator):
         )
 
     def _analyze_profile(self, world):
-        world.reset()
-        adapted = LLEAdapter(world)
-        return CooperationProfileAnalyzer(adapted, T_MAX=self.t_max).analyze()
+        return CooperationProfileAnalyzer(
+            self._world_data(world),
+            T_MAX=self.t_max,
+            solver_backend=self.solver_backend,
+            portfolio=self.portfolio,
+            budget=self.budget,
+            result_store=self.result_store,
+        ).lazy()
 
     def _accept_world(self, world):
         accepted, reason = super()._accept_world(world)
         if not accepted:
             return accepted, reason
 
-        analysis = self._analyze_profile(world)
-        if not analysis.matches_profile(self.profile):
-            return (
-                False,
-                f"profile={analysis.profile}, required={self.profile}",
-            )
+        with self._analyze_profile(world) as analysis:
+            if not analysis.matches_profile(self.profile):
+                if analysis.undecided:
+                    return False, self._budget_rejection()
+                return False, f"{analysis.describe()}, required={self.profile}"
+            analysis = analysis.result()
 
         return True, f"profile={analysis.profile}, constructive_cooperative"
 
@@ -0,0 +1,158 @@
+"""
+Necessary conditions checked on a candidate layout before any SAT call.
+
+Every stage only rejects layouts that no plan can solve within t_max, so
+the generators' acceptance is unchanged, only cheaper. Stages run
+cheapest first and the first failing one names the rejection:
+
+  - connectivity: every agent reaches some exit around walls and laser
+    sources;
+  - distance: every agent has an exit within t_max steps (BFS);
+  - beams: the same, with lethal beam cells removed. The first cell of a
+    beam can never be blocked (an agent of the beam's color standing on
+    it is itself the block), so it is lethal to every other color; a beam
+    whose color has no agent is lethal along its whole length;
+  - matching: the agents can be sent to distinct exits within t_max
+    (Hall's condition, checked with augmenting paths).
+
+lle_refusal covers the layouts LLE itself refuses to build, so they are
+rejected before SAT instead of after it: overlapping entities, fewer exits
+than agents, and an agent starting on another color's beam (LLE drops that
+start, since the agent would die on the first step).
+"""
+
+from collections import deque
+
+from generators.world_builder import Direction
+
+PREFILTER_CONNECTIVITY = "connectivity"
+PREFILTER_DISTANCE = "distance"
+PREFILTER_BEAMS = "beams"
+PREFILTER_MATCHING = "matching"
+
+PREFILTER_STAGES = (
+    PREFILTER_CONNECTIVITY,
+    PREFILTER_DISTANCE,
+    PREFILTER_BEAMS,
+    PREFILTER_MATCHING,
+)
+
+# Layouts LLE refuses to build
+LLE_OVERLAP = "overlap"
+LLE_TOO_FEW_EXITS = "too_few_exits"
+LLE_START_ON_BEAM = "start_on_beam"
+
+LLE_REFUSALS = (LLE_OVERLAP, LLE_TOO_FEW_EXITS, LLE_START_ON_BEAM)
+
+_DELTAS = {
+    Direction.NORTH: (-1, 0),
+    Direction.SOUTH: (1, 0),
+    Direction.WEST: (0, -1),
+    Direction.EAST: (0, 1),
+}
+
+
+def prefilter_layout(layout, rows: int, cols: int, t_max: int) -> str | None:
+    """The first stage the layout fails, or None when SAT has to decide."""
+    obstacles = set(layout.walls) | {pos for _, pos, _ in layout.lasers}
+    exits = list(layout.exits)
+
+    distances = [_bfs(start, obstacles, rows, cols) for start in layout.agents]
+    if any(not any(e in dist for e in exits) for dist in distances):
+        return PREFILTER_CONNECTIVITY
+    if any(min(dist.get(e, t_max + 1) for e in exits) > t_max for dist in distances):
+        return PREFILTER_DISTANCE
+
+    lethal = _lethal_beam_cells(layout, obstacles, rows, cols)
+    distances = []
+    for color, start in enumerate(layout.agents):
+        blocked = obstacles | lethal[color]
+        dist = {} if start in blocked else _bfs(start, blocked, rows, cols)
+        if all(dist.get(e, t_max + 1) > t_max for e in exits):
+            return PREFILTER_BEAMS
+        distances.append(dist)
+
+    reachable = [
+        [i for i, e in enumerate(exits) if dist.get(e, t_max + 1) <= t_max]
+        for dist in distances
+    ]
+    if _matching_size(reachable, len(exits)) < len(layout.agents):
+        return PREFILTER_MATCHING
+    return None
+
+
+def lle_refusal(layout, rows: int, cols: int) -> str | None:
+    """Why LLE would refuse to build the layout, or None."""
+    sources = [pos for _, pos, _ in layout.lasers]
+    cells = [*layout.agents, *layout.exits, *layout.walls, *sources]
+    if len(set(cells)) != len(cells):
+        return LLE_OVERLAP
+    if len(layout.exits) < len(layout.agents):
+        return LLE_TOO_FEW_EXITS
+
+    # Beams as they are at the start: an agent of the beam's color stops it.
+    obstacles = set(layout.walls) | set(sources)
+    starts = {pos: color for color, pos in enumerate(layout.agents)}
+    for owner, (r, c), direction in layout.lasers:
+        dr, dc = _DELTAS[direction]
+        r, c = r + dr, c + dc
+        while 0 <= r < rows and 0 <= c < cols and (r, c) not in obstacles:
+            color = starts.get((r, c))
+            if color == owner:
+                break
+            if color is not None:
+                return LLE_START_ON_BEAM
+            r, c = r + dr, c + dc
+    return None
+
+
+def _bfs(start, blocked, rows: int, cols: int) -> dict[tuple[int, int], int]:
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for dr, dc in _DELTAS.values():
+            nxt = (r + dr, c + dc)
+            if nxt in dist or nxt in blocked:
+                continue
+            if 0 <= nxt[0] < rows and 0 <= nxt[1] < cols:
+                dist[nxt] = dist[(r, c)] + 1
+                queue.append(nxt)
+    return dist
+
+
+def _lethal_beam_cells(layout, obstacles, rows: int, cols: int) -> list[set]:
+    """Per agent color, the beam cells it can never stand on."""
+    num_agents = len(layout.agents)
+    lethal = [set() for _ in range(num_agents)]
+    for owner, (r, c), direction in layout.lasers:
+        dr, dc = _DELTAS[direction]
+        beam = []
+        r, c = r + dr, c + dc
+        while 0 <= r < rows and 0 <= c < cols and (r, c) not in obstacles:
+            beam.append((r, c))
+            r, c = r + dr, c + dc
+        if not beam:
+            continue
+        cells = set(beam) if owner >= num_agents else {beam[0]}
+        for color in range(num_agents):
+            if color != owner:
+                lethal[color] |= cells
+    return lethal
+
+
+def _matching_size(reachable: list[list[int]], num_exits: int) -> int:
+    """Size of a maximum agent-to-exit matching (Kuhn's augmenting paths)."""
+    match = [None] * num_exits
+
+    def augment(agent, seen):
+        for e in reachable[agent]:
+            if e in seen:
+                continue
+            seen.add(e)
+            if match[e] is None or augment(match[e], seen):
+                match[e] = agent
+                return True
+        return False
+
+    return sum(augment(agent, set()) for agent in range(len(reachable)))
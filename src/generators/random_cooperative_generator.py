@@ -1,6 +1,10 @@
-from generators.random_solvable_generator import RandomSolvableGenerator
+from generators.random_solvable_generator import (
+    RandomSolvableGenerator,
+    _budget_from_args,
+    _portfolio_from_args,
+    _result_store_from_args,
+)
 from generators.registry import register_generator
-from solver import LLEAdapter
 from solver.cooperation_profile_analyzer import CooperationProfileAnalyzer
 
 
@@ -44,6 +48,12 @@ class RandomCooperativeGenerator(RandomSolvableGenerator):
             t_min=args.t_min,
             max_attempts=args.max_attempts,
             seed=args.seed,
+            solver_backend=args.solver_backend,
+            portfolio=_portfolio_from_args(args),
+            budget=_budget_from_args(args),
+            result_store=_result_store_from_args(args),
+            workers=args.candidate_workers,
+            prefilter=not args.no_prefilter,
         )
         obj.debug_rejections = bool(args.debug_rejections)
         obj.profile = args.profile
@@ -55,21 +65,28 @@ class RandomCooperativeGenerator(RandomSolvableGenerator):
         self.profile = "cooperative"
 
     def _analyze_profile(self, world):
-        world.reset()
-        adapted = LLEAdapter(world)
-        return CooperationProfileAnalyzer(adapted, T_MAX=self.t_max).analyze()
+        return CooperationProfileAnalyzer(
+            self._world_data(world),
+            T_MAX=self.t_max,
+            solver_backend=self.solver_backend,
+            portfolio=self.portfolio,
+            budget=self.budget,
+            result_store=self.result_store,
+        ).lazy()
 
     def _accept_world(self, world):
         accepted, reason = super()._accept_world(world)
         if not accepted:
             return accepted, reason
 
-        analysis = self._analyze_profile(world)
-        if not analysis.matches_profile(self.profile):
-            return (
-                False,
-                f"profile={analysis.profile}, required={self.profile}",
-            )
+        # Rejections only pay for the facts the target profile reads;
+        # the full profile is computed (and stored) on acceptance.
+        with self._analyze_profile(world) as analysis:
+            if not analysis.matches_profile(self.profile):
+                if analysis.undecided:
+                    return False, self._budget_rejection()
+                return False, f"{analysis.describe()}, required={self.profile}"
+            analysis = analysis.result()
 
         return True, f"profile={analysis.profile}, cooperative_and_solvable"
 
@@ -1,12 +1,53 @@
+import multiprocessing as mp
 import random
+from collections import deque
 from dataclasses import dataclass
 
 from lle import World
 
 from generators.base_generator import BaseGenerator
+from generators.prefilters import (
+    LLE_REFUSALS,
+    PREFILTER_STAGES,
+    lle_refusal,
+    prefilter_layout,
+)
 from generators.registry import register_generator
 from generators.world_builder import Direction, WorldBuilder
-from solver import LLEAdapter, WorldSolver
+from solver import (
+    IncrementalWorldSolver,
+    LLEAdapter,
+    Portfolio,
+    WorldData,
+    WorldSnapshot,
+    WorldSolver,
+)
+from solver.backends import (
+    DEFAULT_SOLVER_BACKEND,
+    SOLVER_BACKENDS,
+    canonical_backend,
+)
+from solver.budget import SolveBudget
+from solver.result_store import VARIANT_SOLVE, ResultStore
+
+
+def _portfolio_from_args(args) -> Portfolio | None:
+    specs = getattr(args, "portfolio", None)
+    return Portfolio.from_specs(specs) if specs else None
+
+
+def _budget_from_args(args) -> SolveBudget | None:
+    budget = SolveBudget(
+        time_limit=getattr(args, "time_budget", None),
+        conflicts=getattr(args, "conflict_budget", None),
+        propagations=getattr(args, "propagation_budget", None),
+    )
+    return None if budget.unlimited else budget
+
+
+def _result_store_from_args(args) -> ResultStore | None:
+    path = getattr(args, "result_store", None)
+    return ResultStore(path) if path else None
 
 
 @dataclass(frozen=True)
@@ -36,6 +77,12 @@ class RandomSolvableGenerator(BaseGenerator):
         t_min: int = 0,
         max_attempts: int = 10_000,
         seed: int | None = None,
+        solver_backend: str = DEFAULT_SOLVER_BACKEND,
+        portfolio: Portfolio | None = None,
+        budget: SolveBudget | None = None,
+        result_store: ResultStore | None = None,
+        workers: int = 1,
+        prefilter: bool = True,
     ):
         self.rows, self.cols = size
         if self.rows < 1 or self.cols < 1:
@@ -52,6 +99,21 @@ class RandomSolvableGenerator(BaseGenerator):
         self.t_max = (self.area // 2) if t_max is None else t_max
         self.t_min = t_min
         self.max_attempts = max_attempts
+        self.solver_backend = canonical_backend(solver_backend)
+        # When set, every SAT check races the portfolio's configurations.
+        self.portfolio = portfolio
+        # Per-solve limits; candidates whose checks run out are rejected.
+        self.budget = budget
+        # SAT answers and cooperation profiles are looked up here first.
+        self.result_store = result_store
+        # Above 1, generate() evaluates candidates in a process pool.
+        self.workers = workers
+        # Cheap necessary conditions (see generators.prefilters) run before
+        # the LLE build and SAT; rejections are counted per stage.
+        self.prefilter = prefilter
+        self.prefilter_rejections = dict.fromkeys(PREFILTER_STAGES, 0)
+        # Layouts LLE would refuse to build, caught before SAT as well.
+        self.lle_rejections = dict.fromkeys(LLE_REFUSALS, 0)
 
         if self.lasers < 0:
             raise ValueError(f"lasers must be >= 0. Got {self.lasers}")
@@ -81,6 +143,13 @@ class RandomSolvableGenerator(BaseGenerator):
                 f"max_attempts must be >= 1. Got {self.max_attempts}"
             )
 
+        if self.workers < 1:
+            raise ValueError(f"workers must be >= 1. Got {self.workers}")
+
+        if self.workers > 1 and self.portfolio is not None:
+            # Pool workers are daemonic and cannot start the portfolio's racers.
+            raise ValueError("workers > 1 cannot be combined with a portfolio")
+
         total_needed = (2 * self.agents) + self.num_walls + self.lasers
         if total_needed > self.area:
             raise ValueError(
@@ -111,6 +180,65 @@ class RandomSolvableGenerator(BaseGenerator):
         )
         parser.add_argument("--max-attempts", type=int, default=10_000)
         parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument(
+            "--solver-backend",
+            choices=SOLVER_BACKENDS,
+            default=DEFAULT_SOLVER_BACKEND,
+            help="pysat engine used for the SAT checks (default: minisat22)",
+        )
+        parser.add_argument(
+            "--portfolio",
+            nargs="+",
+            metavar="METHOD[:BACKEND[:SEED]]",
+            default=None,
+            help=(
+                "Race these solver configurations in parallel for every SAT "
+                "check, e.g. local:minisat22 global:cadical195:1"
+            ),
+        )
+        parser.add_argument(
+            "--time-budget",
+            type=float,
+            default=None,
+            metavar="SECONDS",
+            help="Wall-clock limit per SAT call; undecided candidates are rejected",
+        )
+        parser.add_argument(
+            "--conflict-budget",
+            type=int,
+            default=None,
+            help="Conflict limit per SAT call",
+        )
+        parser.add_argument(
+            "--propagation-budget",
+            type=int,
+            default=None,
+            help="Propagation limit per SAT call",
+        )
+        parser.add_argument(
+            "--result-store",
+            default=None,
+            metavar="PATH",
+            help=(
+                "SQLite file of stored SAT answers and cooperation profiles; "
+                "known candidates skip their solver calls"
+            ),
+        )
+        parser.add_argument(
+            "--candidate-workers",
+            type=int,
+            default=1,
+            metavar="N",
+            help=(
+                "Evaluate candidates in N worker processes; a given --seed "
+                "gives the same level for every N"
+            ),
+        )
+        parser.add_argument(
+            "--no-prefilter",
+            action="store_true",
+            help="Send every candidate to SAT, skipping the cheap necessary checks",
+        )
 
     @classmethod
     def from_args(cls, args):
@@ -123,6 +251,12 @@ class RandomSolvableGenerator(BaseGenerator):
             t_min=args.t_min,
             max_attempts=args.max_attempts,
             seed=args.seed,
+            solver_backend=args.solver_backend,
+            portfolio=_portfolio_from_args(args),
+            budget=_budget_from_args(args),
+            result_store=_result_store_from_args(args),
+            workers=args.candidate_workers,
+            prefilter=not args.no_prefilter,
         )
 
     def _sample_unique_positions(self, k: int) -> list[tuple[int, int]]:
@@ -182,8 +316,11 @@ class RandomSolvableGenerator(BaseGenerator):
     def validate_candidate(self, layout: CandidateLayout) -> tuple[bool, str]:
         return True, "ok"
 
-    def _accept_world(self, world: World) -> tuple[bool, str]:
-        if not self._meets_difficulty_window(world):
+    def _accept_world(self, world: World | WorldData) -> tuple[bool, str]:
+        within_window = self._meets_difficulty_window(world)
+        if within_window is None:
+            return False, self._budget_rejection()
+        if not within_window:
             return (
                 False,
                 f"outside_difficulty_window[t_min={self.t_min}, t_max={self.t_max}]",
@@ -193,6 +330,9 @@ class RandomSolvableGenerator(BaseGenerator):
     def _failure_description(self) -> str:
         return "a valid solvable world"
 
+    def _budget_rejection(self) -> str:
+        return f"solver_budget_exhausted[{self.budget}]"
+
     def _debug_reject(self, attempt: int, reason: str) -> None:
         if getattr(self, "debug_rejections", False):
             print(f"[reject #{attempt}] {reason}")
@@ -201,56 +341,230 @@ class RandomSolvableGenerator(BaseGenerator):
         if getattr(self, "debug_rejections", False):
             print(f"[accept #{attempt}] {reason}")
 
-    def _is_satisfiable(self, world: World, t: int) -> bool:
-        world.reset()
-        adapted = LLEAdapter(world)
-        solver = WorldSolver(adapted, T_MAX=t)
-        result, _ = solver.solve()
-        return bool(result)
-
-    def _meets_difficulty_window(self, world: World) -> bool:
-        # Must be solvable by t_max
-        if not self._is_satisfiable(world, self.t_max):
-            return False
-
+    def _world_data(self, world: World | WorldData) -> WorldData:
+        """The solver's view of a candidate; an lle.World is reset and adapted."""
+        if isinstance(world, World):
+            world.reset()
+            return LLEAdapter(world)
+        return world
+
+    def _is_satisfiable(self, world: World | WorldData, t: int) -> bool | None:
+        """SAT check at horizon t; None when the solve budget runs out."""
+        adapted = self._world_data(world)
+        stored = self._stored_answer(adapted, t)
+        if stored is not None:
+            return stored
+        if self.portfolio is not None:
+            solver = self.portfolio.solver(adapted, T_MAX=t, budget=self.budget)
+        else:
+            solver = WorldSolver(
+                adapted,
+                T_MAX=t,
+                streaming=True,
+                solver_backend=self.solver_backend,
+                budget=self.budget,
+            )
+        with solver:
+            result, model = solver.solve()
+            if self.result_store is not None and result is not None:
+                plan = solver.decode_positions(model) if result else None
+                self.result_store.put(adapted, t, VARIANT_SOLVE, result, plan=plan)
+        return None if result is None else bool(result)
+
+    def _stored_answer(self, adapted, t: int) -> bool | None:
+        if self.result_store is None:
+            return None
+        stored = self.result_store.get(adapted, t, VARIANT_SOLVE)
+        return None if stored is None else stored.satisfiable
+
+    def _store_answer(self, adapted, t: int, result):
+        if self.result_store is not None and result is not None:
+            self.result_store.put(adapted, t, VARIANT_SOLVE, result)
+
+    def _meets_difficulty_window(self, world: World | WorldData) -> bool | None:
         # If t_min == 0, no lower-bound constraint
         if self.t_min == 0:
-            return True
-
-        # Must NOT be solvable by t_min - 1
-        return not self._is_satisfiable(world, self.t_min - 1)
+            return self._is_satisfiable(world, self.t_max)
+
+        if self.portfolio is not None:
+            solvable = self._is_satisfiable(world, self.t_max)
+            if not solvable:
+                return solvable
+            too_easy = self._is_satisfiable(world, self.t_min - 1)
+            return None if too_easy is None else not too_easy
+
+        adapted = self._world_data(world)
+        solvable = self._stored_answer(adapted, self.t_max)
+        too_easy = self._stored_answer(adapted, self.t_min - 1)
+        if solvable is False or (solvable and too_easy is not None):
+            return solvable and not too_easy
+
+        # Both bounds share one encoding: the t_min - 1 check only adds an
+        # activation literal to the solver already built for t_max.
+        with IncrementalWorldSolver(
+            adapted,
+            T_MAX=self.t_max,
+            solver_backend=self.solver_backend,
+            budget=self.budget,
+        ) as solver:
+            # Must be solvable by t_max
+            if solvable is None:
+                solvable = solver.is_satisfiable(self.t_max)
+                self._store_answer(adapted, self.t_max, solvable)
+            if not solvable:
+                return solvable
+
+            # Must NOT be solvable by t_min - 1
+            if too_easy is None:
+                too_easy = solver.is_satisfiable(self.t_min - 1)
+                self._store_answer(adapted, self.t_min - 1, too_easy)
+            return None if too_easy is None else not too_easy
 
     def generate(self) -> World:
+        """
+        Evaluate candidates until one is accepted.
+
+        Candidate i is sampled from its own rng, seeded from (base, i) where
+        base is drawn from the generator's rng, so any process can evaluate
+        any candidate and the world only depends on the seed: one worker or
+        many, the same level comes out.
+        """
+        base = self._rng.getrandbits(64)
+        if self.workers > 1:
+            return self._generate_parallel(base)
+
         self.last_attempts = 0
         for attempt in range(1, self.max_attempts + 1):
             self.last_attempts = attempt
+            _layout, world = self._evaluate_seeded(attempt, f"{base}/{attempt}")
+            if world is not None:
+                return world
+
+        raise self._generation_failure()
+
+    def _generate_parallel(self, base: int) -> World:
+        """
+        generate() over a pool of self.workers processes.
+
+        At most _IN_FLIGHT_PER_WORKER candidates per worker are submitted
+        ahead of the one being waited on. Results are consumed in candidate
+        order and the first accepted one wins, not the fastest; leaving the
+        pool terminates the candidates still in flight.
+        """
+        attempts = iter(range(1, self.max_attempts + 1))
+        pending = deque()
+        self.last_attempts = 0
+        ctx = mp.get_context()
+        with ctx.Pool(
+            self.workers, initializer=_init_candidate_worker, initargs=(self,)
+        ) as pool:
+
+            def submit():
+                attempt = next(attempts, None)
+                if attempt is not None:
+                    job = (attempt, f"{base}/{attempt}")
+                    pending.append(pool.apply_async(_evaluate_candidate, (job,)))
+
+            for _ in range(self.workers * _IN_FLIGHT_PER_WORKER):
+                submit()
+            while pending:
+                attempt, layout, prefiltered, refused = pending.popleft().get()
+                submit()
+                self.last_attempts = attempt
+                for stage, count in prefiltered.items():
+                    self.prefilter_rejections[stage] += count
+                for reason, count in refused.items():
+                    self.lle_rejections[reason] += count
+                if layout is not None:
+                    return self._build_world_from_layout(layout)
+
+        raise self._generation_failure()
+
+    def _evaluate_seeded(self, attempt: int, seed: str):
+        """(layout, world or None) of a candidate drawn from its own rng."""
+        rng, self._rng = self._rng, random.Random(seed)
+        try:
             layout = self._make_candidate_layout()
-
-            valid, _reason = self.validate_candidate(layout)
-            if not valid:
-                self._debug_reject(attempt, f"invalid_layout={_reason}")
-                continue
-
-            try:
-                world = self._build_world_from_layout(layout)
-            except Exception as exc:
-                self._debug_reject(
-                    attempt, f"lle_build_error={type(exc).__name__}"
-                )
-                continue
-
-            try:
-                accepted, reason = self._accept_world(world)
-                if accepted:
-                    self._debug_accept(attempt, reason)
-                    return world
-                self._debug_reject(attempt, reason)
-            except Exception as exc:
-                self._debug_reject(attempt, f"solver_error={type(exc).__name__}")
-                continue
-
-        raise RuntimeError(
+            return layout, self._evaluate_layout(attempt, layout)
+        finally:
+            self._rng = rng
+
+    def _evaluate_layout(self, attempt: int, layout: CandidateLayout) -> World | None:
+        """The candidate's world if it is accepted, otherwise None."""
+        valid, _reason = self.validate_candidate(layout)
+        if not valid:
+            self._debug_reject(attempt, f"invalid_layout={_reason}")
+            return None
+
+        refusal = lle_refusal(layout, self.rows, self.cols)
+        if refusal is not None:
+            self.lle_rejections[refusal] += 1
+            self._debug_reject(attempt, f"lle_refusal={refusal}")
+            return None
+
+        if self.prefilter:
+            stage = prefilter_layout(layout, self.rows, self.cols, self.t_max)
+            if stage is not None:
+                self.prefilter_rejections[stage] += 1
+                self._debug_reject(attempt, f"prefilter={stage}")
+                return None
+
+        # SAT and the cooperation analysis run on a plain snapshot of the
+        # layout; the lle.World is only built for accepted candidates.
+        snapshot = WorldSnapshot.from_layout(layout, self.rows, self.cols)
+        try:
+            accepted, reason = self._accept_world(snapshot)
+        except Exception as exc:
+            self._debug_reject(attempt, f"solver_error={type(exc).__name__}")
+            return None
+        if not accepted:
+            self._debug_reject(attempt, reason)
+            return None
+
+        try:
+            world = self._build_world_from_layout(layout)
+        except Exception as exc:
+            self._debug_reject(attempt, f"lle_build_error={type(exc).__name__}")
+            return None
+        if WorldSnapshot.from_world(LLEAdapter(world)) != snapshot:
+            # LLE dropped or moved something lle_refusal did not foresee.
+            self._debug_reject(attempt, "lle_world_mismatch")
+            return None
+
+        self._debug_accept(attempt, reason)
+        return world
+
+    def _generation_failure(self) -> RuntimeError:
+        return RuntimeError(
             f"Could not find {self._failure_description()} in "
             f"{self.max_attempts} attempts for window "
             f"t_min={self.t_min}, t_max={self.t_max}."
         )
+
+
+# Candidates submitted per pool worker ahead of the one being waited on.
+_IN_FLIGHT_PER_WORKER = 2
+
+# Each pool worker evaluates candidates on its own copy of the generator.
+_worker_generator: RandomSolvableGenerator | None = None
+
+
+def _init_candidate_worker(generator: RandomSolvableGenerator):
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _evaluate_candidate(job):
+    """(attempt, accepted layout or None, this candidate's rejection counts)."""
+    attempt, seed = job
+    generator = _worker_generator
+    generator.prefilter_rejections = dict.fromkeys(PREFILTER_STAGES, 0)
+    generator.lle_rejections = dict.fromkeys(LLE_REFUSALS, 0)
+    layout, world = generator._evaluate_seeded(attempt, seed)
+    accepted = None if world is None else layout
+    return (
+        attempt,
+        accepted,
+        generator.prefilter_rejections,
+        generator.lle_rejections,
+    )
@@ -1,6 +1,6 @@
 """Example custom benchmark levels built with WorldBuilder."""
 
-from lle.lle import World
+from lle import World
 
 from generators.world_builder import Direction, WorldBuilder
 
@@ -53,6 +53,16 @@ CUSTOM_BENCHMARK_LEVELS: dict[str, tuple[World, int]] = {
         ),
         15,
     ),
+    "16x6_agents=3_long_beams": (
+        _world(
+            width=16,
+            height=6,
+            agents=[(0, 0), (0, 1), (0, 2)],
+            exits=[(5, 13), (5, 14), (5, 15)],
+            lasers=[(0, (2, 0), E), (1, (3, 15), W), (2, (4, 0), E)],
+        ),
+        24,
+    ),
     "lle_level6": (
         World.level(6),
         21,
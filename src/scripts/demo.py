@@ -12,6 +12,7 @@ from lle import World
 from matplotlib.animation import FuncAnimation, PillowWriter
 
 from solver import LLEAdapter, WorldSolver
+from solver.world_solver import plan_from_actions
 
 if __package__ in (None, ""):
     from scripts.custom_levels import CUSTOM_BENCHMARK_LEVELS
@@ -19,13 +20,16 @@ else:
     from .custom_levels import CUSTOM_BENCHMARK_LEVELS
 
 
-def display_sequence_interactive(world: World, solver, model):
-    """Step through the solution with arrow keys."""
+def display_sequence_interactive(world: World, actions):
+    """Step through the solution with arrow keys.
+
+    actions is the (A, T) action array of solver.decode_trajectories.
+    """
     world.reset()
     images = [world.get_image()]
-    for actions in solver.extract_plan(model):
+    for step in plan_from_actions(actions):
         try:
-            world.step(list(actions))
+            world.step(list(step))
             images.append(world.get_image())
         except Exception as e:
             print(e)
@@ -58,16 +62,14 @@ def display_sequence_interactive(world: World, solver, model):
     plt.show()
 
 
-def create_gif(
-    world: World, solver, model, filename="agent_movement.gif", duration=500
-):
-    """Create a GIF of the solution."""
+def create_gif(world: World, actions, filename="agent_movement.gif", duration=500):
+    """Create a GIF of the solution from its (A, T) action array."""
     world.reset()
     images = [world.get_image()]
     step_count = 0
-    for actions in solver.extract_plan(model):
+    for step in plan_from_actions(actions):
         try:
-            world.step(list(actions))
+            world.step(list(step))
             images.append(world.get_image())
             step_count += 1
         except Exception as e:
@@ -109,9 +111,10 @@ def main():
     print("Solvable:", is_solvable)
 
     if is_solvable:
-        print(solver.extract_plan(model))
-        create_gif(world, solver, model, f"{level}.gif", duration=500)
-        display_sequence_interactive(world, solver, model)
+        _, actions = solver.decode_trajectories(model)
+        print(plan_from_actions(actions))
+        create_gif(world, actions, f"{level}.gif", duration=500)
+        display_sequence_interactive(world, actions)
     else:
         print("No solution found")
 
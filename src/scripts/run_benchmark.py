@@ -16,7 +16,8 @@ from benchmark import (
     run_benchmark,
     save_results_json,
 )
-from benchmark.runner import _normalize_levels
+from benchmark.runner import DEFAULT_METHODS, METHODS, _normalize_levels
+from solver import CNFCache, ResultStore
 
 
 def _safe_name(name):
@@ -78,6 +79,37 @@ def main():
         action="store_true",
         help="Save one PNG snapshot per benchmark level in <output-dir>/levels/",
     )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=list(METHODS),
+        default=None,
+        help=f"Methods to benchmark (default: {' '.join(DEFAULT_METHODS)})",
+    )
+    parser.add_argument(
+        "--cnf-cache",
+        type=str,
+        default=None,
+        help=(
+            "Directory of cached CNFs; timing runs load the encoded model "
+            "instead of re-encoding it (gen times then measure cache loads)"
+        ),
+    )
+    parser.add_argument(
+        "--cnf-cache-max-mb",
+        type=int,
+        default=1024,
+        help="Size bound of the CNF cache directory in MB (default: 1024)",
+    )
+    parser.add_argument(
+        "--result-store",
+        type=str,
+        default=None,
+        help=(
+            "SQLite file of stored answers; a stored answer skips the untimed "
+            "first solve, and timing runs are checked against it"
+        ),
+    )
     args = parser.parse_args()
 
     output_dir = args.output_dir
@@ -102,7 +134,18 @@ def main():
     print(f"Running benchmark: {args.runs} timing runs per level/method")
     print(f"Output directory: {output_dir}\n")
 
-    results = run_benchmark(num_runs=args.runs, levels=levels)
+    cnf_cache = None
+    if args.cnf_cache:
+        cnf_cache = CNFCache(args.cnf_cache, max_bytes=args.cnf_cache_max_mb << 20)
+        print(f"CNF cache: {args.cnf_cache}")
+
+    results = run_benchmark(
+        num_runs=args.runs,
+        levels=levels,
+        methods=args.methods,
+        cnf_cache=cnf_cache,
+        result_store=ResultStore(args.result_store) if args.result_store else None,
+    )
 
     print_summary_table(results)
 
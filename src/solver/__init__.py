@@ -1,15 +1,28 @@
 from .adapter import LLEAdapter
+from .budget import SolveBudget
+from .cnf_cache import CNFCache, world_fingerprint
 from .cooperation_profile_analyzer import (
     CooperationProfileAnalyzer,
     CooperationProfileResult,
     HelperEvent,
+    LazyCooperationProfile,
 )
 from .cooperation_solver import (
     CooperationResult,
     CooperationSolver,
 )
+from .incremental_world_solver import IncrementalWorldSolver
+from .makespan_search import MakespanResult, MakespanSearch
+from .portfolio_solver import (
+    Portfolio,
+    PortfolioConfig,
+    PortfolioResult,
+    PortfolioSolver,
+)
 from .profiler import SolverProfiler
-from .world_data import AgentData, LaserSourceData, WorldData
+from .result_store import ResultStore, StoredResult, canonical_world_hash
+from .world_data import AgentData, LaserSourceData, WorldData, WorldSnapshot
 from .world_solver import WorldSolver
 from .world_solver_selective_strict_laser import WorldSolverSelectiveStrictLaser
 from .world_solver_strict_laser import WorldSolverStrictLaser
+from .world_solver_switchable_laser import WorldSolverSwitchableLaser
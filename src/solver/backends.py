@@ -0,0 +1,43 @@
+"""
+SAT backend selection.
+
+A backend is any engine pysat ships, named by its canonical name
+("minisat22", "glucose4", "cadical195", ...) or one of pysat's aliases
+("m22", "g4", "cd19", ...).
+"""
+
+from pysat.solvers import Solver, SolverNames
+
+DEFAULT_SOLVER_BACKEND = "minisat22"
+
+_ALIASES = {
+    alias: name
+    for name, aliases in vars(SolverNames).items()
+    if not name.startswith("_")
+    for alias in aliases
+}
+
+SOLVER_BACKENDS = tuple(sorted(set(_ALIASES.values())))
+
+
+def canonical_backend(backend: str) -> str:
+    """Canonical pysat name of a backend or of one of its aliases."""
+    name = _ALIASES.get(backend)
+    if name is None:
+        raise ValueError(f"Unknown solver backend: {backend}")
+    return name
+
+
+def new_solver(backend: str, bootstrap_with=None) -> Solver:
+    return Solver(name=canonical_backend(backend), bootstrap_with=bootstrap_with)
+
+
+def solver_stats(solver: Solver) -> dict:
+    """Accumulated conflicts, decisions, propagations and restarts.
+
+    Empty for engines that do not expose their statistics (Kissat).
+    """
+    try:
+        return dict(solver.accum_stats() or {})
+    except NotImplementedError:
+        return {}
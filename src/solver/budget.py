@@ -0,0 +1,96 @@
+"""
+Per-call solve budgets.
+
+A budget-limited call answers SAT, UNSAT or UNKNOWN. Solvers keep
+returning (result, model) with result True, False or None, where None
+means that the budget ran out before the solver decided.
+CooperationSolver and CooperationProfileAnalyzer report such answers as
+undecided (profile "unknown"), and the generators reject the candidate as
+solver_budget_exhausted.
+"""
+
+import threading
+from dataclasses import dataclass
+
+# Solve status constants
+STATUS_SAT = "sat"
+STATUS_UNSAT = "unsat"
+STATUS_UNKNOWN = "unknown"
+
+
+def solve_status(result) -> str:
+    if result is None:
+        return STATUS_UNKNOWN
+    return STATUS_SAT if result else STATUS_UNSAT
+
+
+@dataclass(frozen=True)
+class SolveBudget:
+    """
+    Limits for one SAT call: wall-clock seconds, conflicts, propagations.
+
+    Every limit applies per call, so an incremental solver gets a fresh
+    budget for each query. Encoding time is not counted. Backends without
+    limited solving (Lingeling, some limits of CaDiCaL) raise
+    NotImplementedError when they are given a limit they cannot enforce.
+    """
+
+    time_limit: float | None = None
+    conflicts: int | None = None
+    propagations: int | None = None
+
+    def __post_init__(self):
+        for name in ("time_limit", "conflicts", "propagations"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0. Got {value}")
+
+    @property
+    def unlimited(self) -> bool:
+        return (
+            self.time_limit is None
+            and self.conflicts is None
+            and self.propagations is None
+        )
+
+    def __str__(self):
+        limits = [
+            f"{name}={value}"
+            for name, value in (
+                ("time_limit", self.time_limit),
+                ("conflicts", self.conflicts),
+                ("propagations", self.propagations),
+            )
+            if value is not None
+        ]
+        return ", ".join(limits) or "unlimited"
+
+    def run(self, solver, assumptions=()):
+        """solve_limited under this budget; None when it is exhausted."""
+        if self.conflicts is not None:
+            solver.conf_budget(self.conflicts)
+        if self.propagations is not None:
+            solver.prop_budget(self.propagations)
+
+        timer = None
+        if self.time_limit is not None:
+            # Fails up front on backends that cannot be interrupted.
+            solver.clear_interrupt()
+            timer = threading.Timer(self.time_limit, solver.interrupt)
+            timer.daemon = True
+            timer.start()
+
+        try:
+            return solver.solve_limited(
+                assumptions=assumptions, expect_interrupt=timer is not None
+            )
+        finally:
+            if timer is not None:
+                timer.cancel()
+                timer.join()
+                solver.clear_interrupt()
+            # Budgets persist in the solver; lift them for later calls.
+            if self.conflicts is not None:
+                solver.conf_budget(-1)
+            if self.propagations is not None:
+                solver.prop_budget(-1)
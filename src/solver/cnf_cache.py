@@ -0,0 +1,185 @@
+"""
+On-disk cache of encoded CNFs.
+
+Benchmarks, tests and repeated analyses encode the same world with the same
+options again and again. The cache stores the clause buffer of a built
+SATModel under a key derived from everything the clauses depend on: the
+world fingerprint, T_MAX, the solver variant and its options, and
+ENCODING_VERSION. Entries are .npz files holding the int32 literal buffer,
+the int64 clause offsets and the number of variables, so loading one is a
+couple of array reads instead of an encoding pass.
+
+Writes go through a temporary file and os.replace, so concurrent processes
+sharing a directory never read half-written entries. Every hit refreshes
+the entry's mtime, and stores evict the least recently used entries until
+the directory fits max_bytes (and max_entries, when set).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .model import SATModel
+from .world_data import WorldData
+
+# Bump whenever constraint generation changes the clauses or the variable
+# numbering of an already cached configuration.
+ENCODING_VERSION = 2
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+_SUFFIX = ".npz"
+
+
+def world_fingerprint(world: WorldData, canonical: bool = False) -> str:
+    """
+    sha256 of what the encoding reads from a world.
+
+    Agents, lasers and exits keep their order, which fixes the variable
+    layout; walls are only ever looked up, so they are sorted. With
+    canonical=True every component is sorted, so every listing of the same
+    level hashes alike (agents keep their colors).
+    """
+    order = sorted if canonical else list
+    payload = {
+        "size": [world.height, world.width],
+        "agents": order([a.color, list(a.position)] for a in world.agents),
+        "lasers": order(
+            [src.color, list(src.direction), list(src.position)]
+            for src in world.laser_sources
+        ),
+        "exits": order(list(pos) for pos in world.exit_positions),
+        "walls": sorted(list(pos) for pos in world.wall_positions),
+    }
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedCNF:
+    model: SATModel
+    num_vars: int
+
+
+class CNFCache:
+    """A directory of encoded models, bounded by size and entry count."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, max_entries=None):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be > 0. Got {max_bytes}")
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f"max_entries must be > 0. Got {max_entries}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(signature: dict) -> str:
+        """Cache key of an encoding signature (see WorldSolver.encoding_signature)."""
+        payload = dict(signature, encoding_version=ENCODING_VERSION)
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode()
+        ).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def __contains__(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def __len__(self):
+        return len(self._entries())
+
+    def load(self, key: str) -> CachedCNF | None:
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                literals = data["literals"]
+                offsets = data["offsets"]
+                num_vars = int(data["num_vars"])
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError):
+            # Truncated or foreign file: drop it and encode again.
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        try:
+            _touch(path)
+        except FileNotFoundError:
+            pass  # evicted by another process meanwhile; the data is loaded
+        self.hits += 1
+        return CachedCNF(SATModel.from_arrays(literals, offsets), num_vars)
+
+    def store(self, key: str, model: SATModel, num_vars: int):
+        literals, offsets = model.to_arrays()
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.directory, prefix=f".{key}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    literals=literals,
+                    offsets=offsets,
+                    num_vars=np.int64(num_vars),
+                )
+            _touch(tmp_name)
+            os.replace(tmp_name, self.path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the bounds hold."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            over_size = total > self.max_bytes
+            over_count = self.max_entries is not None and count > self.max_entries
+            if not (over_size or over_count):
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            count -= 1
+
+    def clear(self):
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def export_dimacs(self, key: str, filepath):
+        """Write a cached entry as a DIMACS CNF file."""
+        cached = self.load(key)
+        if cached is None:
+            raise KeyError(f"No cached CNF for key {key}")
+        cached.model.write_dimacs(filepath, cached.num_vars)
+
+    def _entries(self):
+        return list(self.directory.glob(f"*{_SUFFIX}"))
+
+
+def _touch(path):
+    # Explicit nanosecond stamps: filesystem clocks may be too coarse to
+    # order entries written or read in quick succession.
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
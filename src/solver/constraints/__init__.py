@@ -4,3 +4,4 @@ from .lasers import LaserConstraints
 from .movements import MovementConstraints
 from .selective_strict_laser_constraint import SelectiveStrictLaserConstraints
 from .strict_laser_constraint import StrictLaserConstraints
+from .switchable_laser_constraint import SwitchableLaserConstraints
@@ -1,15 +1,38 @@
 from abc import ABC, abstractmethod
+from collections import deque
+from itertools import chain
 
+import numpy as np
+
+from solver.variables import AgentVariables, BeamVariables, LaserVariables
 from solver.world_data import WorldData
 
 
 class ConstraintContext:
-    """Pre-computed data shared across all constraint classes. Built once."""
+    """Pre-computed data shared across all constraint classes.
+
+    Built once; incremental solvers only extend it with new time layers.
+    """
 
-    def __init__(self, world: WorldData, var_factory, T_MAX):
+    def __init__(
+        self,
+        world: WorldData,
+        var_factory,
+        T_MAX,
+        prune=False,
+        fixed_horizon=True,
+        vectorized=False,
+        beam_variables=True,
+    ):
         self.world = world
         self.var = var_factory
         self.T_MAX = T_MAX
+        self.prune = prune
+        # Build clause families as NumPy blocks instead of one list per clause.
+        self.vectorized = vectorized
+        # Exit-distance pruning depends on T_MAX, so it is only sound when the
+        # horizon never grows afterwards.
+        self.fixed_horizon = fixed_horizon
 
         # Pre-compute sets
         self.walls = frozenset(world.wall_positions)
@@ -17,6 +40,13 @@ class ConstraintContext:
         self.blocked = self.walls | self.laser_positions
         self.agents = [(a, a.position) for a in world.agents]
         self.lasers = [(src, src.position) for src in world.laser_sources]
+        # Same-color lasers share their laser variables, and those that also
+        # point the same way share their beam; their clauses would only repeat.
+        self.laser_colors = list(dict.fromkeys(src.color for src, _ in self.lasers))
+        beams = {}
+        for src, _ in self.lasers:
+            beams.setdefault((src.color, src.direction), src)
+        self.beam_lasers = list(beams.values())
         self.exits = world.exit_positions
         self.all_positions = world.all_positions()
         self.valid_positions = [p for p in self.all_positions if p not in self.blocked]
@@ -27,28 +57,50 @@ class ConstraintContext:
             neighbors = [n for n in world.get_neighbors(pos) if n not in self.blocked]
             self.neighbor_map[pos] = [pos] + neighbors
 
-        # Pre-compute variable IDs
-        self.agent_var = {}
-        for agent, _ in self.agents:
-            c = agent.color
-            for t in range(T_MAX + 2):
-                for x, y in self.all_positions:
-                    self.agent_var[c, x, y, t] = var_factory.agent(c, x, y, t)
+        # Cell pairs that share some neighborhood, each listed once. The local
+        # movement rules exclude exactly these pairs; per neighborhood, most
+        # pairs would be emitted two or three times.
+        seen = set()
+        self.neighbor_pairs = []
+        for pos in self.valid_positions:
+            n_pos = self.neighbor_map[pos]
+            for i in range(len(n_pos)):
+                for j in range(i + 1, len(n_pos)):
+                    pair = (n_pos[i], n_pos[j])
+                    key = frozenset(pair)
+                    if key not in seen:
+                        seen.add(key)
+                        self.neighbor_pairs.append(pair)
 
-        self.laser_var = {}
-        for laser, _ in self.lasers:
-            c = laser.color
-            for t in range(T_MAX + 1):
-                for x, y in self.all_positions:
-                    self.laser_var[c, x, y, t] = var_factory.laser(c, x, y, t)
+        # Reachability windows: agent c can only be on cell p at time t if
+        # earliest[c][p] <= t and, for a fixed horizon, t + exit_distance[p] <= T_MAX.
+        self.false_var = None
+        self.earliest = {}
+        self.exit_distance = None
+        if prune:
+            self.false_var = var_factory.false()
+            for agent, pos in self.agents:
+                self.earliest[agent.color] = self._bfs_distances([pos])
+            # Every agent must end on an exit only if there are enough exits
+            # for all of them; otherwise the backward bound does not hold.
+            if fixed_horizon and len(self.exits) >= len(self.agents):
+                self.exit_distance = self._bfs_distances(self.exits)
 
-        self.beam_var = {}
-        for laser, _ in self.lasers:
-            c = laser.color
-            d = laser.direction
-            for t in range(T_MAX + 1):
-                for x, y in self.all_positions:
-                    self.beam_var[c, d, x, y, t] = var_factory.beam(c, d, x, y, t)
+        # Variable IDs are computed from the factory layout, not stored.
+        # Ray-based laser encodings number their own variables, so the
+        # per-cell laser and beam slabs are only laid out when asked for.
+        lasers = self.lasers if beam_variables else []
+        var_factory.declare_layout(
+            world.height,
+            world.width,
+            [agent.color for agent, _ in self.agents],
+            [laser.color for laser, _ in lasers],
+            [(laser.color, laser.direction) for laser, _ in lasers],
+        )
+        self.agent_var = AgentVariables(var_factory, self.false_var)
+        self.laser_var = LaserVariables(var_factory) if beam_variables else None
+        self.beam_var = BeamVariables(var_factory) if beam_variables else None
+        self._allocate_variables(0, T_MAX)
 
         # Pre-compute beam propagation map per laser.
         # Beams never propagate into a laser source tile, which prevents a
@@ -69,14 +121,125 @@ class ConstraintContext:
                 entries.append((x, y, nx, ny, is_blocker))
             self.beam_propagation_map[key] = entries
 
+        # Cells each laser source actually lights, in beam order: the map
+        # followed from the source up to a wall, a laser tile or the border.
+        self.laser_rays = []
+        for laser, (x, y) in self.lasers:
+            step = {
+                (sx, sy): (nx, ny, is_wall)
+                for sx, sy, nx, ny, is_wall in self.beam_propagation_map[
+                    laser.color, laser.direction
+                ]
+            }
+            ray = []
+            while (x, y) in step:
+                x, y, is_wall = step[x, y]
+                if is_wall:
+                    break
+                ray.append((x, y))
+            self.laser_rays.append((laser, ray))
+
+    def extend_horizon(self, T_MAX):
+        """Allocate the variables of every time layer up to the new T_MAX."""
+        if T_MAX <= self.T_MAX:
+            return
+        if self.exit_distance is not None:
+            raise ValueError("Cannot extend a context pruned for a fixed horizon")
+        old_T = self.T_MAX
+        self.T_MAX = T_MAX
+        self._allocate_variables(old_T + 1, T_MAX)
+
+    def _allocate_variables(self, t_from, T_MAX):
+        """Allocate the time layers t_from..T_MAX.
+
+        Agent variables live one layer further than the laser ones (the
+        no-overlap rule of the last step looks at t + 1), so every layer
+        reaches T_MAX + 1.
+        """
+        self.var.ensure_layers(T_MAX + 2)
+        if not self.prune:
+            return
+
+        width = self.world.width
+        agent_t_from = t_from + 1 if t_from > 0 else 0
+        for t in range(agent_t_from, T_MAX + 2):
+            mask = bytearray(self.var.layer_size)
+            for agent, _ in self.agents:
+                c = agent.color
+                base = self.var.agent_offset(c)
+                for (x, y), earliest in self.earliest[c].items():
+                    if earliest <= t and self._before_exit_deadline((x, y), t):
+                        mask[base + x * width + y] = 1
+            self.agent_var.set_live(t, mask)
+
+    def _bfs_distances(self, sources):
+        """Shortest walking distance from the nearest source to every free cell."""
+        distances = {pos: 0 for pos in sources if pos in self.neighbor_map}
+        queue = deque(distances)
+        while queue:
+            pos = queue.popleft()
+            for nxt in self.neighbor_map[pos]:
+                if nxt not in distances:
+                    distances[nxt] = distances[pos] + 1
+                    queue.append(nxt)
+        return distances
+
+    def _before_exit_deadline(self, pos, t):
+        if self.exit_distance is None:
+            return True
+        to_exit = self.exit_distance.get(pos)
+        return to_exit is not None and t + to_exit <= self.T_MAX
+
+    def cell_index(self, positions):
+        """Flat x * W + y indices of positions, as used by the literal blocks."""
+        width = self.world.width
+        return np.array([x * width + y for x, y in positions], dtype=np.int64)
+
+    def simplify_block(self, block):
+        """Vectorized simplify() for a 2D block of equal-width clauses."""
+        false_var = self.false_var
+        block = block[~(block == -false_var).any(axis=1)]
+        is_false = block == false_var
+        counts = is_false.sum(axis=1)
+        if not counts.any():
+            return [block]
+        # Rows with the same number of false literals keep the same width.
+        width = block.shape[1]
+        simplified = []
+        for k in np.unique(counts):
+            rows = counts == k
+            simplified.append(
+                block[rows][~is_false[rows]].reshape(int(rows.sum()), width - k)
+            )
+        return simplified
+
+    def simplify(self, clauses):
+        """Drop clauses satisfied by a pruned literal and strip the false ones."""
+        false_var = self.false_var
+        for clause in clauses:
+            if -false_var in clause:
+                continue
+            if false_var in clause:
+                clause = [lit for lit in clause if lit != false_var]
+            yield clause
+
 
 class Constraint(ABC):
     def __init__(self, ctx: ConstraintContext):
         self.ctx = ctx
         self.world = ctx.world
         self.var = ctx.var
-        self.T_MAX = ctx.T_MAX
         self.profiler = None
+        # When set (a SATModel or SolverSink), clauses are written straight
+        # into it and generate() returns nothing.
+        self.sink = None
+        # First time layer still to encode. 0 means a full build; incremental
+        # solvers move it forward to only emit the layers added by a new horizon.
+        self.t_from = 0
+
+    @property
+    def T_MAX(self):
+        return self.ctx.T_MAX
 
     def set_profiler(self, constraint_profiler):
         self.profiler = constraint_profiler
@@ -85,10 +248,49 @@ class Constraint(ABC):
     def generate(self):
         return []
 
-    def _profile_method(self, method_name: str, method_func):
+    def _state_times(self):
+        """Time steps t whose state clauses are still to be emitted."""
+        return range(self.t_from, self.T_MAX + 1)
+
+    def _transition_times(self):
+        """Time steps t whose t -> t + 1 transition clauses are still to be emitted."""
+        return range(max(self.t_from - 1, 0), self.T_MAX)
+
+    def _profile_method(self, method_name: str, method_func, vectorized_func=None):
+        if self.ctx.vectorized and vectorized_func is not None:
+            return self._profile_blocks(method_name, vectorized_func)
+        if self.ctx.prune:
+            clauses = self.ctx.simplify(method_func())
+        else:
+            clauses = method_func()
+        if self.sink is not None:
+            return self._stream(method_name, clauses)
         if self.profiler:
             with self.profiler.profile_method(method_name) as method_profiler:
-                clauses = method_profiler.count_clauses(method_func())
+                clauses = method_profiler.count_clauses(clauses)
                 return clauses
         else:
-            return list(method_func())
+            return list(clauses)
+
+    def _profile_blocks(self, method_name: str, vectorized_func):
+        """Like _profile_method, for methods yielding (n, width) literal blocks."""
+        blocks = vectorized_func()
+        if self.ctx.prune:
+            blocks = chain.from_iterable(map(self.ctx.simplify_block, blocks))
+        if self.sink is not None:
+            return self._stream(method_name, blocks)
+        if self.profiler:
+            with self.profiler.profile_method(method_name) as method_profiler:
+                return method_profiler.count_blocks(blocks)
+        return list(blocks)
+
+    def _stream(self, method_name: str, clauses):
+        """Write clauses (or blocks) into the sink without collecting them."""
+        if self.profiler:
+            with self.profiler.profile_method(method_name) as method_profiler:
+                start = len(self.sink)
+                self.sink.extend(clauses)
+                method_profiler.clause_count += len(self.sink) - start
+        else:
+            self.sink.extend(clauses)
+        return []
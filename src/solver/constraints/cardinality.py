@@ -0,0 +1,109 @@
+"""
+At-most-one encodings.
+
+Every encoder takes a list of literals and a `fresh(count)` callable that
+returns the first of `count` new variable ids, and yields clauses.
+"""
+
+import math
+
+# AMO encoding constants
+AMO_PAIRWISE = "pairwise"
+AMO_SEQUENTIAL = "sequential"
+AMO_COMMANDER = "commander"
+AMO_PRODUCT = "product"
+AMO_LADDER = "ladder"
+
+AMO_ENCODINGS = (AMO_PAIRWISE, AMO_SEQUENTIAL, AMO_COMMANDER, AMO_PRODUCT, AMO_LADDER)
+
+# Below this size every encoding falls back to pairwise, which is smaller.
+_PAIRWISE_LIMIT = 4
+_COMMANDER_GROUP = 3
+
+
+def at_most_one(lits, encoding, fresh):
+    if encoding not in AMO_ENCODINGS:
+        raise ValueError(f"Unknown AMO encoding: {encoding}")
+    if len(lits) <= 1:
+        return
+    if encoding == AMO_PAIRWISE or len(lits) <= _PAIRWISE_LIMIT:
+        yield from _pairwise(lits)
+    elif encoding == AMO_SEQUENTIAL:
+        yield from _sequential(lits, fresh)
+    elif encoding == AMO_COMMANDER:
+        yield from _commander(lits, fresh)
+    elif encoding == AMO_PRODUCT:
+        yield from _product(lits, fresh)
+    else:
+        yield from _ladder(lits, fresh)
+
+
+def _pairwise(lits):
+    n = len(lits)
+    for i in range(n):
+        v1 = -lits[i]
+        for j in range(i + 1, n):
+            yield [v1, -lits[j]]
+
+
+def _sequential(lits, fresh):
+    """Sinz's sequential counter: s_i holds iff some x_j with j <= i is true."""
+    n = len(lits)
+    s = fresh(n - 1)
+    yield [-lits[0], s]
+    for i in range(1, n - 1):
+        yield [-lits[i], s + i]
+        yield [-(s + i - 1), s + i]
+        yield [-lits[i], -(s + i - 1)]
+    yield [-lits[n - 1], -(s + n - 2)]
+
+
+def _commander(lits, fresh):
+    """Klieber and Kwon: pairwise inside groups, recurse on group commanders."""
+    groups = [
+        lits[i : i + _COMMANDER_GROUP] for i in range(0, len(lits), _COMMANDER_GROUP)
+    ]
+    first = fresh(len(groups))
+    commanders = []
+    for k, group in enumerate(groups):
+        c = first + k
+        commanders.append(c)
+        yield from _pairwise(group)
+        for x in group:
+            yield [-x, c]
+        yield [-c] + list(group)
+    yield from at_most_one(commanders, AMO_COMMANDER, fresh)
+
+
+def _product(lits, fresh):
+    """Chen's 2-product: x at (row, col) implies its row and column literals."""
+    n = len(lits)
+    p = math.ceil(math.sqrt(n))
+    q = math.ceil(n / p)
+    rows = fresh(p)
+    cols = fresh(q)
+    for i, x in enumerate(lits):
+        r, c = divmod(i, q)
+        yield [-x, rows + r]
+        yield [-x, cols + c]
+    yield from at_most_one(list(range(rows, rows + p)), AMO_PRODUCT, fresh)
+    yield from at_most_one(list(range(cols, cols + q)), AMO_PRODUCT, fresh)
+
+
+def _ladder(lits, fresh):
+    """Gent and Nightingale's ladder: x_i <-> y_i and not y_(i-1).
+
+    y_i holds iff the chosen literal is among the first i, and the ladder
+    y_(i-1) -> y_i keeps those prefixes consistent.
+    """
+    n = len(lits)
+    y = fresh(n)
+    for i, x in enumerate(lits):
+        yield [-x, y + i]
+        if i > 0:
+            prev = y + i - 1
+            yield [-prev, y + i]
+            yield [-x, -prev]
+            yield [-(y + i), prev, x]
+        else:
+            yield [-y, x]
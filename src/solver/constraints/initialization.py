@@ -15,6 +15,8 @@ class InitializationConstraints(Constraint):
         return all_clauses
 
     def _agents_initial_position(self):
+        if self.t_from > 0:
+            return
         agent_var = self.ctx.agent_var
         all_positions = self.ctx.all_positions
         for agent, (x, y) in self.ctx.agents:
@@ -26,8 +28,10 @@ class InitializationConstraints(Constraint):
 
     def _lasers_initial_beam(self):
         beam_var = self.ctx.beam_var
+        if beam_var is None:
+            return
         for laser, (x, y) in self.ctx.lasers:
             c = laser.color
             d = laser.direction
-            for t in range(self.T_MAX + 1):
+            for t in self._state_times():
                 yield [beam_var[c, d, x, y, t]]
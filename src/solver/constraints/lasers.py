@@ -1,19 +1,51 @@
-from .base import Constraint
+import numpy as np
+
+from .base import Constraint, ConstraintContext
+
+# Laser encoding constants
+LASER_BEAM = "beam"
+LASER_RAY = "ray"
+LASER_BLOCKER = "blocker"
+
+LASER_ENCODINGS = (LASER_BEAM, LASER_RAY, LASER_BLOCKER)
 
 
 class LaserConstraints(Constraint):
+    def __init__(self, ctx: ConstraintContext, laser_encoding=LASER_BEAM):
+        super().__init__(ctx)
+        if laser_encoding not in LASER_ENCODINGS:
+            raise ValueError(f"Unknown laser encoding: {laser_encoding}")
+        if laser_encoding == LASER_BEAM and ctx.beam_var is None:
+            raise ValueError("The beam laser encoding needs a context with beam variables")
+        self.laser_encoding = laser_encoding
+
     def generate(self):
+        if self.laser_encoding == LASER_RAY:
+            return self._generate_ray()
+        if self.laser_encoding == LASER_BLOCKER:
+            return self._generate_blocker()
+
         all_clauses = []
         all_clauses.extend(
             self._profile_method(
-                "no_step_on_active_laser", self._no_step_on_active_laser
+                "no_step_on_active_laser",
+                self._no_step_on_active_laser,
+                self._no_step_on_active_laser_vectorized,
             )
         )
         all_clauses.extend(
-            self._profile_method("beam_propagation", self._beam_propagation)
+            self._profile_method(
+                "beam_propagation",
+                self._beam_propagation,
+                self._beam_propagation_vectorized,
+            )
         )
         all_clauses.extend(
-            self._profile_method("link_beam_and_laser", self._link_beam_and_laser)
+            self._profile_method(
+                "link_beam_and_laser",
+                self._link_beam_and_laser,
+                self._link_beam_and_laser_vectorized,
+            )
         )
         return all_clauses
 
@@ -22,12 +54,12 @@ class LaserConstraints(Constraint):
         laser_var = self.ctx.laser_var
         all_positions = self.ctx.all_positions
 
-        for laser, _ in self.ctx.lasers:
+        for c2 in self.ctx.laser_colors:
             for agent, _ in self.ctx.agents:
-                c1, c2 = agent.color, laser.color
+                c1 = agent.color
                 if c1 == c2:
                     continue
-                for t in range(self.T_MAX + 1):
+                for t in self._state_times():
                     for x, y in all_positions:
                         yield [-agent_var[c1, x, y, t], -laser_var[c2, x, y, t]]
 
@@ -36,13 +68,13 @@ class LaserConstraints(Constraint):
         beam_var = self.ctx.beam_var
         propagation_map = self.ctx.beam_propagation_map
 
-        for laser, _ in self.ctx.lasers:
+        for laser in self.ctx.beam_lasers:
             c = laser.color
             d = laser.direction
             entries = propagation_map[c, d]
 
             for x, y, nx, ny, is_wall in entries:
-                for t in range(self.T_MAX + 1):
+                for t in self._state_times():
                     if is_wall:
                         yield [-beam_var[c, d, nx, ny, t]]
                     else:
@@ -54,16 +86,205 @@ class LaserConstraints(Constraint):
                         yield [-av_dst, -bv_dst]
 
     def _link_beam_and_laser(self):
+        """laser(c) on a cell <-> some beam of color c, in any direction, on it."""
         beam_var = self.ctx.beam_var
         laser_var = self.ctx.laser_var
         all_positions = self.ctx.all_positions
 
-        for laser, _ in self.ctx.lasers:
-            c = laser.color
-            d = laser.direction
+        for c, directions in self._beam_directions().items():
             for x, y in all_positions:
-                for t in range(self.T_MAX + 1):
-                    bv = beam_var[c, d, x, y, t]
+                for t in self._state_times():
                     lv = laser_var[c, x, y, t]
-                    yield [-bv, lv]
-                    yield [bv, -lv]
+                    beams = [beam_var[c, d, x, y, t] for d in directions]
+                    for bv in beams:
+                        yield [-bv, lv]
+                    yield [-lv] + beams
+
+    def _beam_directions(self):
+        """Per laser color, the directions of its beams."""
+        directions = {}
+        for laser in self.ctx.beam_lasers:
+            directions.setdefault(laser.color, []).append(laser.direction)
+        return directions
+
+    # Ray encoding: one variable per laser source, ray cell and step, and
+    # nothing for cells no beam can reach.
+
+    def _generate_ray(self):
+        self._allocate_ray_vars()
+        all_clauses = []
+        all_clauses.extend(
+            self._profile_method("ray_propagation", self._ray_propagation)
+        )
+        all_clauses.extend(
+            self._profile_method("no_step_on_active_laser", self._no_step_on_ray)
+        )
+        return all_clauses
+
+    # Blocker encoding: no beam state at all. Cell k of a ray is lethal unless
+    # the laser's own agent stands on an earlier cell, tracked by a running OR
+    # blocked(k) over the ray. blocked(k) only appears positively, so it only
+    # needs the "blocked(k) -> someone blocks at j <= k" direction.
+
+    def _generate_blocker(self):
+        self._allocate_ray_vars()
+        all_clauses = []
+        all_clauses.extend(self._profile_method("ray_blockers", self._ray_blockers))
+        all_clauses.extend(
+            self._profile_method("no_step_on_active_laser", self._no_step_on_ray)
+        )
+        return all_clauses
+
+    def _allocate_ray_vars(self):
+        """First id of the variables of every (ray, t) still to encode.
+
+        The ray encoding numbers lit(k) for every cell k, the blocker encoding
+        blocked(k) for every cell but the last. Rays whose own agent cannot
+        block them are lit on every cell, so they get no variables at all.
+        """
+        self._ray_vars = {}
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            count = len(ray) if self.laser_encoding == LASER_RAY else len(ray) - 1
+            if count <= 0 or not self._blocks_own_beam(laser.color):
+                continue
+            for t in self._state_times():
+                self._ray_vars[i, t] = self.var.fresh(count)
+
+    def _ray_propagation(self):
+        """lit(k) <-> lit(k - 1) and no agent of the laser's color on cell k."""
+        agent_var = self.ctx.agent_var
+
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            c = laser.color
+            for t in self._state_times():
+                first = self._ray_vars.get((i, t))
+                if first is None:
+                    continue
+                for k, (x, y) in enumerate(ray):
+                    lit = first + k
+                    av = agent_var[c, x, y, t]
+                    if k == 0:
+                        # The source always emits.
+                        yield [av, lit]
+                    else:
+                        yield [-(lit - 1), av, lit]
+                        yield [lit - 1, -lit]
+                    yield [-av, -lit]
+
+    def _ray_blockers(self):
+        """blocked(k) -> blocked(k - 1) or the laser's own agent on cell k."""
+        agent_var = self.ctx.agent_var
+
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            c = laser.color
+            for t in self._state_times():
+                first = self._ray_vars.get((i, t))
+                if first is None:
+                    continue
+                for k, (x, y) in enumerate(ray[:-1]):
+                    clause = [-(first + k), agent_var[c, x, y, t]]
+                    if k > 0:
+                        clause.append(first + k - 1)
+                    yield clause
+
+    def _ray_safe_literal(self, i, t, k):
+        """Literal that makes cell k of ray i harmless at t, None if it never is."""
+        first = self._ray_vars.get((i, t))
+        if first is None:
+            return None
+        if self.laser_encoding == LASER_RAY:
+            return -(first + k)
+        return first + k - 1 if k > 0 else None
+
+    def _no_step_on_ray(self):
+        agent_var = self.ctx.agent_var
+
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            victims = [
+                agent.color
+                for agent, _ in self.ctx.agents
+                if not self._is_immune(agent.color, laser.color)
+            ]
+            for t in self._state_times():
+                for k, (x, y) in enumerate(ray):
+                    safe = self._ray_safe_literal(i, t, k)
+                    for c1 in victims:
+                        if safe is None:
+                            yield [-agent_var[c1, x, y, t]]
+                        else:
+                            yield [-agent_var[c1, x, y, t], safe]
+
+    # Vectorized twins. Variants change the rules through the two hooks below,
+    # so these stay in sync with their overridden per-clause methods.
+
+    def _is_immune(self, agent_color, laser_color):
+        """Whether an agent may stand in an active beam of laser_color."""
+        return agent_color == laser_color
+
+    def _blocks_own_beam(self, color):
+        """Whether an agent of this color stops the beam of its own color."""
+        return True
+
+    def _no_step_on_active_laser_vectorized(self):
+        times = list(self._state_times())
+        if not times:
+            return
+        agent_var = self.ctx.agent_var
+        laser_var = self.ctx.laser_var
+        cells = self.ctx.cell_index(self.ctx.all_positions)
+
+        for color in self.ctx.laser_colors:
+            lv = laser_var.block(color, times)[:, cells]
+            for agent, _ in self.ctx.agents:
+                if self._is_immune(agent.color, color):
+                    continue
+                av = agent_var.block(agent.color, times)[:, cells]
+                yield np.stack([-av, -lv], axis=-1).reshape(-1, 2)
+
+    def _beam_propagation_vectorized(self):
+        times = list(self._state_times())
+        if not times:
+            return
+        agent_var = self.ctx.agent_var
+        beam_var = self.ctx.beam_var
+        width = self.world.width
+
+        for laser in self.ctx.beam_lasers:
+            c = laser.color
+            d = laser.direction
+            entries = self.ctx.beam_propagation_map[c, d]
+            if not entries:
+                continue
+            x, y, nx, ny, is_wall = (np.array(col) for col in zip(*entries))
+            src = x * width + y
+            dst = nx * width + ny
+            is_wall = is_wall.astype(bool)
+            bv = beam_var.block(c, d, times)
+
+            yield -bv[:, dst[is_wall]].reshape(-1, 1)
+
+            bv_src = bv[:, src[~is_wall]]
+            bv_dst = bv[:, dst[~is_wall]]
+            if self._blocks_own_beam(c):
+                av_dst = agent_var.block(c, times)[:, dst[~is_wall]]
+                yield np.stack([-bv_src, av_dst, bv_dst], axis=-1).reshape(-1, 3)
+                yield np.stack([bv_src, -bv_dst], axis=-1).reshape(-1, 2)
+                yield np.stack([-av_dst, -bv_dst], axis=-1).reshape(-1, 2)
+            else:
+                yield np.stack([-bv_src, bv_dst], axis=-1).reshape(-1, 2)
+                yield np.stack([bv_src, -bv_dst], axis=-1).reshape(-1, 2)
+
+    def _link_beam_and_laser_vectorized(self):
+        times = list(self._state_times())
+        if not times:
+            return
+        cells = self.ctx.cell_index(self.ctx.all_positions)
+
+        for c, directions in self._beam_directions().items():
+            lv = self.ctx.laser_var.block(c, times)[:, cells]
+            beams = [
+                self.ctx.beam_var.block(c, d, times)[:, cells] for d in directions
+            ]
+            for bv in beams:
+                yield np.stack([-bv, lv], axis=-1).reshape(-1, 2)
+            yield np.stack([-lv, *beams], axis=-1).reshape(-1, len(beams) + 1)
@@ -1,25 +1,56 @@
+import numpy as np
+
 from .base import Constraint, ConstraintContext
+from .cardinality import AMO_ENCODINGS, AMO_PAIRWISE, at_most_one
 
 # Movement method constants
 METHOD_LOCAL = "local"
 METHOD_GLOBAL = "global"
 
+# Agent collision encoding constants
+COLLISION_PAIRWISE = "pairwise"
+COLLISION_OCCUPANCY = "occupancy"
+
 
 class MovementConstraints(Constraint):
-    def __init__(self, ctx: ConstraintContext, movement_method=METHOD_LOCAL):
+    def __init__(
+        self,
+        ctx: ConstraintContext,
+        movement_method=METHOD_LOCAL,
+        include_goal=True,
+        amo_encoding=AMO_PAIRWISE,
+        collision_encoding=COLLISION_PAIRWISE,
+    ):
         super().__init__(ctx)
+        if amo_encoding not in AMO_ENCODINGS:
+            raise ValueError(f"Unknown AMO encoding: {amo_encoding}")
+        if collision_encoding not in (COLLISION_PAIRWISE, COLLISION_OCCUPANCY):
+            raise ValueError(f"Unknown collision encoding: {collision_encoding}")
         self.movement_method = movement_method
+        # At-most-one encoding of the global method's per-step uniqueness.
+        self.amo_encoding = amo_encoding
+        self.collision_encoding = collision_encoding
+        # Incremental solvers leave the goal out and guard it per horizon.
+        self.include_goal = include_goal
 
     def generate(self):
         all_clauses = []
 
         if self.movement_method == METHOD_LOCAL:
             all_clauses.extend(
-                self._profile_method("movement_rules", self._movement_rules_local)
+                self._profile_method(
+                    "movement_rules",
+                    self._movement_rules_local,
+                    self._movement_rules_local_vectorized,
+                )
             )
         elif self.movement_method == METHOD_GLOBAL:
             all_clauses.extend(
-                self._profile_method("movement_rules", self._movement_rules_global)
+                self._profile_method(
+                    "movement_rules",
+                    self._movement_rules_global,
+                    self._movement_rules_global_vectorized,
+                )
             )
             all_clauses.extend(
                 self._profile_method("unique_position", self._unique_position)
@@ -27,10 +58,24 @@ class MovementConstraints(Constraint):
         else:
             raise ValueError(f"Unknown movement method: {self.movement_method}")
 
-        all_clauses.extend(self._profile_method("no_overlap", self._no_overlap))
-        all_clauses.extend(
-            self._profile_method("must_be_on_exit", self._must_be_on_exit)
-        )
+        if self.collision_encoding == COLLISION_OCCUPANCY:
+            all_clauses.extend(
+                self._profile_method(
+                    "no_overlap",
+                    self._no_overlap_occupancy,
+                    self._no_overlap_occupancy_vectorized,
+                )
+            )
+        else:
+            all_clauses.extend(
+                self._profile_method(
+                    "no_overlap", self._no_overlap, self._no_overlap_vectorized
+                )
+            )
+        if self.include_goal:
+            all_clauses.extend(
+                self._profile_method("must_be_on_exit", self._must_be_on_exit)
+            )
         all_clauses.extend(self._profile_method("stays_on_exit", self._stays_on_exit))
         return all_clauses
 
@@ -41,7 +86,7 @@ class MovementConstraints(Constraint):
 
         for agent, _ in self.ctx.agents:
             c = agent.color
-            for t in range(self.T_MAX):
+            for t in self._transition_times():
                 t1 = t + 1
                 for x, y in valid_positions:
                     n_pos = neighbor_map[x, y]
@@ -54,14 +99,10 @@ class MovementConstraints(Constraint):
                     yield [-agent_var[c, x, y, t1]] + [
                         agent_var[c, nx, ny, t] for nx, ny in n_pos
                     ]
-                    # Inline uniqueness: pairwise exclusion on neighbors at t+1
-                    n = len(n_pos)
-                    for i in range(n):
-                        x1, y1 = n_pos[i]
-                        v1 = -agent_var[c, x1, y1, t1]
-                        for j in range(i + 1, n):
-                            x2, y2 = n_pos[j]
-                            yield [v1, -agent_var[c, x2, y2, t1]]
+                # Inline uniqueness: pairwise exclusion on neighbors at t+1,
+                # once per pair even when it shares several neighborhoods
+                for (x1, y1), (x2, y2) in self.ctx.neighbor_pairs:
+                    yield [-agent_var[c, x1, y1, t1], -agent_var[c, x2, y2, t1]]
 
     def _movement_rules_global(self):
         agent_var = self.ctx.agent_var
@@ -70,7 +111,7 @@ class MovementConstraints(Constraint):
 
         for agent, _ in self.ctx.agents:
             c = agent.color
-            for t in range(self.T_MAX):
+            for t in self._transition_times():
                 t1 = t + 1
                 for x, y in valid_positions:
                     n_pos = neighbor_map[x, y]
@@ -78,20 +119,86 @@ class MovementConstraints(Constraint):
                         agent_var[c, nx, ny, t1] for nx, ny in n_pos
                     ]
 
+    def _agent_blocks(self, times):
+        """Agent literals as an (agents, len(times), H*W) array."""
+        agent_var = self.ctx.agent_var
+        return np.stack(
+            [agent_var.block(agent.color, times) for agent, _ in self.ctx.agents]
+        )
+
+    def _neighbor_groups(self):
+        """Valid cells grouped by neighborhood size: (cells, neighbors) index arrays.
+
+        neighbors[i] lists the cells reachable from cells[i] in one step, the
+        cell itself first, in the same order as neighbor_map.
+        """
+        groups = {}
+        for pos in self.ctx.valid_positions:
+            groups.setdefault(len(self.ctx.neighbor_map[pos]), []).append(pos)
+        return [
+            (
+                self.ctx.cell_index(positions),
+                np.stack(
+                    [self.ctx.cell_index(self.ctx.neighbor_map[p]) for p in positions]
+                ),
+            )
+            for positions in groups.values()
+        ]
+
+    def _movement_rules_local_vectorized(self):
+        times = list(self._transition_times())
+        if not times or not self.ctx.agents:
+            return
+        at_t = self._agent_blocks(times)
+        at_t1 = self._agent_blocks([t + 1 for t in times])
+
+        for cells, neighbors in self._neighbor_groups():
+            k = neighbors.shape[1]
+            # Forward: at (x, y, t) -> at some neighbor at t + 1
+            yield np.concatenate(
+                [-at_t[:, :, cells, None], at_t1[:, :, neighbors]], axis=-1
+            ).reshape(-1, k + 1)
+            # Backward: at (x, y, t + 1) -> at some neighbor at t
+            yield np.concatenate(
+                [-at_t1[:, :, cells, None], at_t[:, :, neighbors]], axis=-1
+            ).reshape(-1, k + 1)
+        # Inline uniqueness: pairwise exclusion on neighbors at t + 1
+        if self.ctx.neighbor_pairs:
+            first, second = zip(*self.ctx.neighbor_pairs)
+            yield np.stack(
+                [
+                    -at_t1[:, :, self.ctx.cell_index(first)],
+                    -at_t1[:, :, self.ctx.cell_index(second)],
+                ],
+                axis=-1,
+            ).reshape(-1, 2)
+
+    def _movement_rules_global_vectorized(self):
+        times = list(self._transition_times())
+        if not times or not self.ctx.agents:
+            return
+        at_t = self._agent_blocks(times)
+        at_t1 = self._agent_blocks([t + 1 for t in times])
+
+        for cells, neighbors in self._neighbor_groups():
+            yield np.concatenate(
+                [-at_t[:, :, cells, None], at_t1[:, :, neighbors]], axis=-1
+            ).reshape(-1, neighbors.shape[1] + 1)
+
     def _unique_position(self):
         agent_var = self.ctx.agent_var
         all_positions = self.ctx.all_positions
-        n = len(all_positions)
+        false_var = self.ctx.false_var
 
         for agent, _ in self.ctx.agents:
             c = agent.color
-            for t in range(1, self.T_MAX + 1):
-                for i in range(n):
-                    x1, y1 = all_positions[i]
-                    v1 = -agent_var[c, x1, y1, t]
-                    for j in range(i + 1, n):
-                        x2, y2 = all_positions[j]
-                        yield [v1, -agent_var[c, x2, y2, t]]
+            for t in range(max(self.t_from, 1), self.T_MAX + 1):
+                lits = [agent_var[c, x, y, t] for x, y in all_positions]
+                if false_var is not None:
+                    # Pruned cells can never be occupied; keep them out of
+                    # the encoding instead of paying auxiliaries for them.
+                    lits = [lit for lit in lits if lit != false_var]
+                yield from at_most_one(lits, self.amo_encoding, self.var.fresh)
 
     def _no_overlap(self):
         agent_var = self.ctx.agent_var
@@ -103,7 +210,7 @@ class MovementConstraints(Constraint):
             c1 = agents[i][0].color
             for j in range(i + 1, n_agents):
                 c2 = agents[j][0].color
-                for t in range(self.T_MAX + 1):
+                for t in self._state_times():
                     t1 = t + 1
                     for x, y in all_positions:
                         v1_t = agent_var[c1, x, y, t]
@@ -112,19 +219,101 @@ class MovementConstraints(Constraint):
                         yield [-agent_var[c1, x, y, t1], -v2_t]
                         yield [-v1_t, -agent_var[c2, x, y, t1]]
 
+    def _no_overlap_vectorized(self):
+        times = list(self._state_times())
+        i, j = np.triu_indices(len(self.ctx.agents), 1)
+        if not times or not len(i):
+            return
+        cells = self.ctx.cell_index(self.ctx.all_positions)
+        at_t = self._agent_blocks(times)[:, :, cells]
+        at_t1 = self._agent_blocks([t + 1 for t in times])[:, :, cells]
+
+        yield np.stack([-at_t[i], -at_t[j]], axis=-1).reshape(-1, 2)
+        yield np.stack([-at_t1[i], -at_t[j]], axis=-1).reshape(-1, 2)
+        yield np.stack([-at_t[i], -at_t1[j]], axis=-1).reshape(-1, 2)
+
+    def _no_overlap_occupancy(self):
+        """
+        Same rule as _no_overlap with O(A) clauses per cell and step.
+
+        s_k says "one of the first k + 1 agents is on the cell at t". The
+        chain is a sequential counter, so at most one agent occupies the cell,
+        and s_(A-1) is its occupancy: an agent on the cell at t + 1 while it
+        was occupied at t must be the agent that was there.
+        """
+        agent_var = self.ctx.agent_var
+        false_var = self.ctx.false_var
+        colors = [agent.color for agent, _ in self.ctx.agents]
+        times = list(self._state_times())
+        cells = self.ctx.all_positions
+        n = len(colors)
+        if n < 2 or not times:
+            return
+        # Auxiliary s_k of cell ci at times[ti] is base + (k * #t + ti) * #cells + ci.
+        base = self.var.fresh(n * len(times) * len(cells))
+        last = n - 1
+
+        for ti, t in enumerate(times):
+            t1 = t + 1
+            for ci, (x, y) in enumerate(cells):
+                at_t = [agent_var[c, x, y, t] for c in colors]
+                at_t1 = [agent_var[c, x, y, t1] for c in colors]
+                if false_var is not None and all(
+                    lit == false_var for lit in at_t + at_t1
+                ):
+                    continue
+                s = [base + (k * len(times) + ti) * len(cells) + ci for k in range(n)]
+                yield [-at_t[0], s[0]]
+                for k in range(1, n):
+                    yield [-at_t[k], s[k]]
+                    yield [-s[k - 1], s[k]]
+                    yield [-at_t[k], -s[k - 1]]
+                for k in range(n):
+                    yield [-at_t1[k], -s[last], at_t[k]]
+
+    def _no_overlap_occupancy_vectorized(self):
+        times = list(self._state_times())
+        n = len(self.ctx.agents)
+        if n < 2 or not times:
+            return
+        cells = self.ctx.cell_index(self.ctx.all_positions)
+        at_t = self._agent_blocks(times)[:, :, cells]
+        at_t1 = self._agent_blocks([t + 1 for t in times])[:, :, cells]
+        base = self.var.fresh(n * len(times) * len(cells))
+        s = base + np.arange(at_t.size, dtype=np.int64).reshape(at_t.shape)
+
+        if self.ctx.false_var is not None:
+            live = (at_t != self.ctx.false_var).any(axis=0) | (
+                at_t1 != self.ctx.false_var
+            ).any(axis=0)
+            at_t, at_t1, s = at_t[:, live], at_t1[:, live], s[:, live]
+
+        yield np.stack([-at_t, s], axis=-1).reshape(-1, 2)
+        yield np.stack([-s[:-1], s[1:]], axis=-1).reshape(-1, 2)
+        yield np.stack([-at_t[1:], -s[:-1]], axis=-1).reshape(-1, 2)
+        occupied = np.broadcast_to(s[-1], at_t1.shape)
+        yield np.stack([-at_t1, -occupied, at_t], axis=-1).reshape(-1, 3)
+
     def _must_be_on_exit(self):
+        return self.goal_clauses(self.T_MAX)
+
+    def goal_clauses(self, T):
+        """Every exit is occupied by some agent at time T."""
         agent_var = self.ctx.agent_var
-        T = self.T_MAX
 
         for x, y in self.ctx.exits:
             yield [agent_var[agent.color, x, y, T] for agent, _ in self.ctx.agents]
 
     def _stays_on_exit(self):
         agent_var = self.ctx.agent_var
+        # On a dead-end exit the movement rules already emit this clause.
+        exits = [
+            pos for pos in self.ctx.exits if len(self.ctx.neighbor_map.get(pos, ())) != 1
+        ]
 
         for agent, _ in self.ctx.agents:
             c = agent.color
-            for t in range(self.T_MAX):
+            for t in self._transition_times():
                 t1 = t + 1
-                for x, y in self.ctx.exits:
+                for x, y in exits:
                     yield [-agent_var[c, x, y, t], agent_var[c, x, y, t1]]
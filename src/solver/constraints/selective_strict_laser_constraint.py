@@ -1,4 +1,4 @@
-from .lasers import LaserConstraints
+from .lasers import LASER_BEAM, LaserConstraints
 
 
 class SelectiveStrictLaserConstraints(LaserConstraints):
@@ -7,21 +7,27 @@ class SelectiveStrictLaserConstraints(LaserConstraints):
     same-color immunity and same-color beam-blocking ability.
     """
 
-    def __init__(self, ctx, strict_colors):
-        super().__init__(ctx)
+    def __init__(self, ctx, strict_colors, laser_encoding=LASER_BEAM):
+        super().__init__(ctx, laser_encoding)
         self.strict_colors = frozenset(strict_colors)
 
+    def _is_immune(self, agent_color, laser_color):
+        return agent_color == laser_color and agent_color not in self.strict_colors
+
+    def _blocks_own_beam(self, color):
+        return color not in self.strict_colors
+
     def _no_step_on_active_laser(self):
         agent_var = self.ctx.agent_var
         laser_var = self.ctx.laser_var
         all_positions = self.ctx.all_positions
 
-        for laser, _ in self.ctx.lasers:
+        for c2 in self.ctx.laser_colors:
             for agent, _ in self.ctx.agents:
-                c1, c2 = agent.color, laser.color
+                c1 = agent.color
                 if c1 == c2 and c1 not in self.strict_colors:
                     continue
-                for t in range(self.T_MAX + 1):
+                for t in self._state_times():
                     for x, y in all_positions:
                         yield [-agent_var[c1, x, y, t], -laser_var[c2, x, y, t]]
 
@@ -30,13 +36,13 @@ class SelectiveStrictLaserConstraints(LaserConstraints):
         beam_var = self.ctx.beam_var
         propagation_map = self.ctx.beam_propagation_map
 
-        for laser, _ in self.ctx.lasers:
+        for laser in self.ctx.beam_lasers:
             c = laser.color
             d = laser.direction
             entries = propagation_map[c, d]
 
             for x, y, nx, ny, is_wall in entries:
-                for t in range(self.T_MAX + 1):
+                for t in self._state_times():
                     if is_wall:
                         yield [-beam_var[c, d, nx, ny, t]]
                     else:
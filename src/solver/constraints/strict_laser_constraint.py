@@ -7,6 +7,9 @@ class StrictLaserConstraints(LaserConstraints):
     It only stops at walls / bounds (same as base behavior except agent blocking).
     """
 
+    def _blocks_own_beam(self, color):
+        return False
+
     def _beam_propagation(self):
         """
         Override only this method from LaserConstraints.
@@ -16,13 +19,13 @@ class StrictLaserConstraints(LaserConstraints):
         beam_var = self.ctx.beam_var
         propagation_map = self.ctx.beam_propagation_map
 
-        for laser, _ in self.ctx.lasers:
+        for laser in self.ctx.beam_lasers:
             c = laser.color
             d = laser.direction
             entries = propagation_map[c, d]
 
             for x, y, nx, ny, is_wall in entries:
-                for t in range(self.T_MAX + 1):
+                for t in self._state_times():
                     if is_wall:
                         yield [-beam_var[c, d, nx, ny, t]]
                     else:
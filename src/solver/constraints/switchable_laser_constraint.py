@@ -0,0 +1,140 @@
+from .lasers import LASER_BEAM, LaserConstraints
+
+
+class SwitchableLaserConstraints(LaserConstraints):
+    """
+    Laser constraints whose strictness is chosen per color at solve time.
+
+    Every laser color c gets two selector literals:
+      - nonblocking[c]: an agent of color c no longer stops its own beam
+        (the strict-laser rule);
+      - vulnerable[c]: an agent of color c also loses its immunity to its
+        own beam (together with nonblocking[c], the selective strict rule).
+
+    The clauses of both rules are guarded by the selectors, so the normal,
+    strict and selective strict variants share one encoding and are picked
+    through solver assumptions. Every query assumes every selector, switched
+    off ones negatively: a free selector would let the solver pick the rule
+    of each color by itself.
+    """
+
+    # Guarded clauses are only generated per clause.
+    _no_step_on_active_laser_vectorized = None
+    _beam_propagation_vectorized = None
+
+    def __init__(self, ctx, laser_encoding=LASER_BEAM):
+        super().__init__(ctx, laser_encoding)
+        self.nonblocking = {}
+        self.vulnerable = {}
+        for c in ctx.laser_colors:
+            self.nonblocking[c] = self.var.named(("nonblocking", c))
+            self.vulnerable[c] = self.var.named(("vulnerable", c))
+        self._colors = {lit: c for c, lit in self.nonblocking.items()}
+        self._colors.update({lit: c for c, lit in self.vulnerable.items()})
+
+    def assumptions(self, nonblocking=(), vulnerable=()):
+        """Every selector: the given colors' strict rules on, the others off."""
+        nonblocking, vulnerable = set(nonblocking), set(vulnerable)
+        lits = [
+            lit if c in nonblocking else -lit for c, lit in self.nonblocking.items()
+        ]
+        lits += [lit if c in vulnerable else -lit for c, lit in self.vulnerable.items()]
+        return lits
+
+    def colors_of(self, literals) -> frozenset[int]:
+        """Colors whose switched-on selectors appear among literals (e.g. a core)."""
+        colors = self._colors
+        return frozenset(colors[lit] for lit in literals if lit in colors)
+
+    def _no_step_on_active_laser(self):
+        agent_var = self.ctx.agent_var
+        laser_var = self.ctx.laser_var
+        all_positions = self.ctx.all_positions
+
+        for c2 in self.ctx.laser_colors:
+            for agent, _ in self.ctx.agents:
+                c1 = agent.color
+                guard = [-self.vulnerable[c2]] if c1 == c2 else []
+                for t in self._state_times():
+                    for x, y in all_positions:
+                        yield guard + [-agent_var[c1, x, y, t], -laser_var[c2, x, y, t]]
+
+    def _beam_propagation(self):
+        agent_var = self.ctx.agent_var
+        beam_var = self.ctx.beam_var
+        propagation_map = self.ctx.beam_propagation_map
+
+        for laser in self.ctx.beam_lasers:
+            c = laser.color
+            d = laser.direction
+            nonblocking = self.nonblocking[c]
+            entries = propagation_map[c, d]
+
+            for x, y, nx, ny, is_wall in entries:
+                for t in self._state_times():
+                    if is_wall:
+                        yield [-beam_var[c, d, nx, ny, t]]
+                    else:
+                        bv_src = beam_var[c, d, x, y, t]
+                        bv_dst = beam_var[c, d, nx, ny, t]
+                        av_dst = agent_var[c, nx, ny, t]
+                        yield [-bv_src, av_dst, bv_dst]
+                        yield [bv_src, -bv_dst]
+                        yield [nonblocking, -av_dst, -bv_dst]
+                        yield [-nonblocking, -bv_src, bv_dst]
+
+    def _ray_propagation(self):
+        """lit(k) <-> lit(k - 1) and, unless nonblocking, no own agent on cell k."""
+        agent_var = self.ctx.agent_var
+
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            c = laser.color
+            nonblocking = self.nonblocking[c]
+            for t in self._state_times():
+                first = self._ray_vars.get((i, t))
+                if first is None:
+                    continue
+                for k, (x, y) in enumerate(ray):
+                    lit = first + k
+                    av = agent_var[c, x, y, t]
+                    if k == 0:
+                        yield [av, lit]
+                        yield [-nonblocking, lit]
+                    else:
+                        yield [-(lit - 1), av, lit]
+                        yield [lit - 1, -lit]
+                        yield [-nonblocking, -(lit - 1), lit]
+                    yield [nonblocking, -av, -lit]
+
+    def _ray_blockers(self):
+        """blocked(k) -> blocked(k - 1) or own agent on cell k; never if nonblocking."""
+        agent_var = self.ctx.agent_var
+
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            c = laser.color
+            nonblocking = self.nonblocking[c]
+            for t in self._state_times():
+                first = self._ray_vars.get((i, t))
+                if first is None:
+                    continue
+                for k, (x, y) in enumerate(ray[:-1]):
+                    clause = [-(first + k), agent_var[c, x, y, t]]
+                    if k > 0:
+                        clause.append(first + k - 1)
+                    yield clause
+                    yield [-nonblocking, -(first + k)]
+
+    def _no_step_on_ray(self):
+        agent_var = self.ctx.agent_var
+
+        for i, (laser, ray) in enumerate(self.ctx.laser_rays):
+            c2 = laser.color
+            for t in self._state_times():
+                for k, (x, y) in enumerate(ray):
+                    safe = self._ray_safe_literal(i, t, k)
+                    safe = [] if safe is None else [safe]
+                    for agent, _ in self.ctx.agents:
+                        c1 = agent.color
+                        guard = [-self.vulnerable[c2]] if c1 == c2 else []
+                        yield guard + [-agent_var[c1, x, y, t]] + safe
+
@@ -1,11 +1,50 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
+from functools import cached_property
 
+from .backends import DEFAULT_SOLVER_BACKEND
+from .budget import SolveBudget
 from .cooperation_solver import CooperationSolver
+from .portfolio_solver import Portfolio
+from .result_store import (
+    VARIANT_PROFILE,
+    VARIANT_SOLVE,
+    VARIANT_STRICT,
+    ResultStore,
+    selective_variant,
+)
 from .world_solver import WorldSolver
 from .world_solver_selective_strict_laser import WorldSolverSelectiveStrictLaser
+from .world_solver_switchable_laser import WorldSolverSwitchableLaser
+
+# Necessary-helper search constants
+HELPER_SEARCH_LINEAR = "linear"
+HELPER_SEARCH_GROUP = "group"
+HELPER_SEARCH_AUTO = "auto"
+
+HELPER_SEARCHES = (HELPER_SEARCH_LINEAR, HELPER_SEARCH_GROUP, HELPER_SEARCH_AUTO)
+
+# Below this many agents, per-agent checks cost no more than group testing.
+GROUP_SEARCH_MIN_AGENTS = 8
+
+_PROFILE_TARGETS = (
+    None,
+    "",
+    "any",
+    "independent",
+    "cooperative",
+    "asymmetric",
+    "mutual",
+    "chain",
+    "distributed",
+    "fully_coupled",
+)
+
+
+# Fields describe() leaves out: known upfront, or too long for a reason.
+_UNDESCRIBED = ("num_agents", "helper_events")
 
 
 @dataclass(frozen=True)
@@ -17,38 +56,45 @@ class HelperEvent:
     laser_source: tuple[int, int]
 
 
-@dataclass(frozen=True)
-class CooperationProfileResult:
-    solvable: bool
-    cooperation_required: bool
-    num_agents: int
-    necessary_helpers: frozenset[int]
-    dependency_edges: frozenset[tuple[int, int]]
-    helper_events: tuple[HelperEvent, ...]
-    mutual_pairs: frozenset[tuple[int, int]]
-    longest_chain_length: int
-    largest_scc_size: int
-    synchronous_width: int
-    profile: str
+class _ProfileMatching:
+    """matches_profile over the fields of a profile, eager or lazy."""
 
     def matches_profile(self, target: str | None) -> bool:
+        """
+        Whether the profile fits target.
+
+        Facts are read cheapest first and the first one that rules the
+        target out (or is undecided) ends the check: solvability and
+        cooperation_required settle most targets, and the helper structure
+        is only read by the structural ones, so a lazy profile never
+        computes more than needed. An unknown profile matches nothing.
+        """
+        if target not in _PROFILE_TARGETS:
+            raise ValueError(f"Unknown cooperation profile: {target}")
+        if self.solvable is None:
+            return False
+        if not self.solvable:
+            # cooperation_required is False, and there is no helper structure.
+            return target in (None, "", "any", "independent")
+        if self.cooperation_required is None:
+            return False
         if target in (None, "", "any"):
             return True
         if target == "independent":
             return not self.cooperation_required
-        if target == "cooperative":
-            return self.cooperation_required
-        if target == "asymmetric":
-            return self.cooperation_required and self.profile == "asymmetric"
         if target == "mutual":
             return bool(self.mutual_pairs)
+        if not self.cooperation_required:
+            return False
+        if target == "cooperative":
+            return True
+        if target == "asymmetric":
+            return self.profile == "asymmetric"
         if target == "chain":
-            return self.cooperation_required and self._is_chain_like()
+            return self._is_chain_like()
         if target == "distributed":
-            return self.cooperation_required and self._has_distributed_support()
-        if target == "fully_coupled":
-            return self.cooperation_required and self.largest_scc_size == self.num_agents
-        raise ValueError(f"Unknown cooperation profile: {target}")
+            return self._has_distributed_support()
+        return self.largest_scc_size == self.num_agents
 
     def _has_distributed_support(self) -> bool:
         indegree = defaultdict(int)
@@ -76,113 +122,481 @@ class CooperationProfileResult:
         return self.longest_chain_length >= max(1, len(nodes) - 1)
 
 
-class CooperationProfileAnalyzer:
-    def __init__(self, world, T_MAX: int = 10, movement_method="local"):
-        self.world = world
-        self.T_MAX = T_MAX
-        self.movement_method = movement_method
+@dataclass(frozen=True)
+class CooperationProfileResult(_ProfileMatching):
+    # solvable and cooperation_required are None when a solve budget ran out
+    # before the question was decided; the profile is then "unknown".
+    solvable: bool | None
+    cooperation_required: bool | None
+    num_agents: int
+    necessary_helpers: frozenset[int]
+    dependency_edges: frozenset[tuple[int, int]]
+    helper_events: tuple[HelperEvent, ...]
+    mutual_pairs: frozenset[tuple[int, int]]
+    longest_chain_length: int
+    largest_scc_size: int
+    synchronous_width: int
+    profile: str
+    # Helpers whose selective strict check ran out of budget.
+    undecided_helpers: frozenset[int] = frozenset()
+
+    def to_dict(self) -> dict:
+        """JSON-ready form, sets as sorted lists."""
+        data = asdict(self)
+        for key in ("necessary_helpers", "undecided_helpers"):
+            data[key] = sorted(data[key])
+        for key in ("dependency_edges", "mutual_pairs"):
+            data[key] = sorted(list(pair) for pair in data[key])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CooperationProfileResult:
+        data = dict(data)
+        for key in ("necessary_helpers", "undecided_helpers"):
+            data[key] = frozenset(data[key])
+        for key in ("dependency_edges", "mutual_pairs"):
+            data[key] = frozenset(tuple(pair) for pair in data[key])
+        data["helper_events"] = tuple(
+            HelperEvent(
+                helper=event["helper"],
+                beneficiary=event["beneficiary"],
+                time=event["time"],
+                position=tuple(event["position"]),
+                laser_source=tuple(event["laser_source"]),
+            )
+            for event in data["helper_events"]
+        )
+        return cls(**data)
+
+    @property
+    def is_unknown(self) -> bool:
+        return self.profile == "unknown"
+
+
+class LazyCooperationProfile(_ProfileMatching):
+    """
+    A cooperation profile whose fields are computed on first access.
+
+    Every field of CooperationProfileResult is cached once read, and each is
+    backed by the analyzer's queries: cooperation_required costs the normal
+    and the strict solve, the helper structure the selective strict checks
+    on top. matches_profile then only pays for what the target reads.
+
+    It holds the analyzer's shared solver until closed; use it as a context
+    manager, one at a time per analyzer.
+    """
+
+    def __init__(self, analyzer, stored: CooperationProfileResult | None = None):
+        self._analyzer = analyzer
+        self._stored = stored
+        self.num_agents = len(analyzer.world.agents)
+        if stored is not None:
+            for field in fields(CooperationProfileResult):
+                self.__dict__[field.name] = getattr(stored, field.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._analyzer._reset_queries()
+
+    @cached_property
+    def _solution(self):
+        return self._analyzer._solve_with_plan()
+
+    @cached_property
+    def solvable(self) -> bool | None:
+        return self._solution[0]
+
+    @property
+    def plan(self):
+        """The (A, T + 1, 2) positions of the normal solve, None unless SAT."""
+        return self._solution[1]
+
+    @cached_property
+    def cooperation_required(self) -> bool | None:
+        if not self.solvable:
+            return None if self.solvable is None else False
+        return self._analyzer._cooperation_required()
+
+    @property
+    def is_unknown(self) -> bool:
+        return self.solvable is None or (
+            self.solvable and self.cooperation_required is None
+        )
 
-    def analyze(self) -> CooperationProfileResult:
-        solver = WorldSolver(
-            self.world,
-            T_MAX=self.T_MAX,
-            movement_method=self.movement_method,
+    @property
+    def undecided(self) -> bool:
+        """Whether a fact read so far was left undecided by the solve budget."""
+        cached = vars(self)
+        return any(
+            name in cached and cached[name] is None
+            for name in ("solvable", "cooperation_required")
         )
-        sat, model = solver.solve()
-        num_agents = len(self.world.agents)
-
-        if not sat:
-            return CooperationProfileResult(
-                solvable=False,
-                cooperation_required=False,
-                num_agents=num_agents,
-                necessary_helpers=frozenset(),
-                dependency_edges=frozenset(),
-                helper_events=tuple(),
-                mutual_pairs=frozenset(),
-                longest_chain_length=0,
-                largest_scc_size=0,
-                synchronous_width=0,
-                profile="unsolvable",
-            )
 
-        cooperation_required = CooperationSolver(
-            self.world,
-            T_MAX=self.T_MAX,
-            movement_method=self.movement_method,
-        ).analyze().cooperation_needed
+    def describe(self) -> str:
+        """The facts read so far as name=value pairs; computes nothing."""
+        cached = vars(self)
+        return ", ".join(
+            f"{field.name}={cached[field.name]}"
+            for field in fields(CooperationProfileResult)
+            if field.name in cached and field.name not in _UNDESCRIBED
+        )
+
+    def _has_structure(self) -> bool:
+        """Helper structure exists for solvable worlds with a decided answer."""
+        return bool(self.solvable) and self.cooperation_required is not None
+
+    @cached_property
+    def helper_events(self) -> tuple[HelperEvent, ...]:
+        if not self._has_structure():
+            return tuple()
+        events = self._analyzer._extract_helper_events(self.plan)
+        return tuple(sorted(events, key=lambda e: (e.time, e.helper, e.beneficiary)))
+
+    @cached_property
+    def _helpers(self) -> tuple[frozenset[int], frozenset[int]]:
+        if not self._has_structure():
+            return frozenset(), frozenset()
+        necessary, undecided = self._analyzer._find_necessary_helpers()
+        return frozenset(necessary), frozenset(undecided)
+
+    @cached_property
+    def necessary_helpers(self) -> frozenset[int]:
+        return self._helpers[0]
+
+    @cached_property
+    def undecided_helpers(self) -> frozenset[int]:
+        return self._helpers[1]
 
-        positions_by_time = self._extract_positions_by_time(solver, model)
-        helper_events = self._extract_helper_events(positions_by_time)
-        necessary_helpers = self._find_necessary_helpers()
-        dependency_edges = self._extract_dependency_edges(helper_events)
+    @cached_property
+    def dependency_edges(self) -> frozenset[tuple[int, int]]:
+        edges = self._analyzer._extract_dependency_edges(self.helper_events)
 
         # If selective strict checks prove a helper is necessary but the sampled plan
         # does not expose a concrete beneficiary, keep the signal by attaching a
         # conservative edge to every other agent.
-        for helper in necessary_helpers:
-            if any(src == helper for src, _ in dependency_edges):
+        for helper in self.necessary_helpers:
+            if any(src == helper for src, _ in edges):
                 continue
-            for agent in range(num_agents):
+            for agent in range(self.num_agents):
                 if agent != helper:
-                    dependency_edges.add((helper, agent))
-
-        mutual_pairs = self._mutual_pairs(dependency_edges)
-        largest_scc_size = self._largest_scc_size(dependency_edges, num_agents)
-        longest_chain_length = self._longest_chain_length(dependency_edges, num_agents)
-        synchronous_width = self._synchronous_width(helper_events)
-        profile = self._classify_profile(
-            cooperation_required=cooperation_required,
-            dependency_edges=dependency_edges,
-            mutual_pairs=mutual_pairs,
-            largest_scc_size=largest_scc_size,
-            num_agents=num_agents,
+                    edges.add((helper, agent))
+        return frozenset(edges)
+
+    @cached_property
+    def mutual_pairs(self) -> frozenset[tuple[int, int]]:
+        return frozenset(self._analyzer._mutual_pairs(self.dependency_edges))
+
+    @cached_property
+    def largest_scc_size(self) -> int:
+        if not self._has_structure():
+            return 0
+        return self._analyzer._largest_scc_size(self.dependency_edges, self.num_agents)
+
+    @cached_property
+    def longest_chain_length(self) -> int:
+        if not self._has_structure():
+            return 0
+        return self._analyzer._longest_chain_length(
+            self.dependency_edges, self.num_agents
         )
 
-        return CooperationProfileResult(
-            solvable=True,
-            cooperation_required=cooperation_required,
-            num_agents=num_agents,
-            necessary_helpers=frozenset(necessary_helpers),
-            dependency_edges=frozenset(dependency_edges),
-            helper_events=tuple(sorted(helper_events, key=lambda e: (e.time, e.helper, e.beneficiary))),
-            mutual_pairs=frozenset(mutual_pairs),
-            longest_chain_length=longest_chain_length,
-            largest_scc_size=largest_scc_size,
-            synchronous_width=synchronous_width,
-            profile=profile,
+    @cached_property
+    def synchronous_width(self) -> int:
+        return self._analyzer._synchronous_width(self.helper_events)
+
+    @cached_property
+    def profile(self) -> str:
+        if self.solvable is False:
+            return "unsolvable"
+        if self.is_unknown:
+            return "unknown"
+        if not self.cooperation_required:
+            # Decided without looking at any helper.
+            return "independent"
+        return self._analyzer._classify_profile(
+            cooperation_required=True,
+            dependency_edges=self.dependency_edges,
+            mutual_pairs=self.mutual_pairs,
+            largest_scc_size=self.largest_scc_size,
+            num_agents=self.num_agents,
         )
 
-    def _extract_positions_by_time(self, solver: WorldSolver, model) -> dict[int, dict[int, tuple[int, int]]]:
-        positions_by_time: dict[int, dict[int, tuple[int, int]]] = defaultdict(dict)
-        for lit in model:
-            if lit <= 0:
-                continue
-            obj = solver.var.pool.obj(abs(lit))
-            if not obj or obj[0] != "agent":
-                continue
-            _, color, position, t = obj
-            positions_by_time[t][color] = position
-        return positions_by_time
+    def result(self) -> CooperationProfileResult:
+        """Every field computed; a decided profile goes to the result store."""
+        if self._stored is not None:
+            return self._stored
+        names = [field.name for field in fields(CooperationProfileResult)]
+        result = CooperationProfileResult(**{name: getattr(self, name) for name in names})
+        analyzer = self._analyzer
+        if analyzer.result_store is not None and result.profile != "unknown":
+            analyzer.result_store.put(
+                analyzer.world,
+                analyzer.T_MAX,
+                VARIANT_PROFILE,
+                bool(result.solvable),
+                data=result.to_dict(),
+            )
+        self._stored = result
+        return result
 
-    def _find_necessary_helpers(self) -> set[int]:
-        necessary = set()
-        for agent in self.world.agents:
-            sat, _ = WorldSolverSelectiveStrictLaser(
+
+class CooperationProfileAnalyzer:
+    def __init__(
+        self,
+        world,
+        T_MAX: int = 10,
+        movement_method="local",
+        solver_backend=DEFAULT_SOLVER_BACKEND,
+        portfolio: Portfolio | None = None,
+        budget: SolveBudget | None = None,
+        result_store: ResultStore | None = None,
+        shared_encoding: bool = True,
+        helper_search: str = HELPER_SEARCH_AUTO,
+    ):
+        if helper_search not in HELPER_SEARCHES:
+            raise ValueError(f"Unknown helper search: {helper_search}")
+        self.world = world
+        self.T_MAX = T_MAX
+        self.movement_method = movement_method
+        self.solver_backend = solver_backend
+        self.portfolio = portfolio
+        self.budget = budget
+        # Answers, plans and whole profiles are read from and written to it.
+        self.result_store = result_store
+        # Without a portfolio, every query of an analysis runs on one warm
+        # WorldSolverSwitchableLaser instead of 2 + N separate encodings.
+        self.shared_encoding = shared_encoding
+        self._queries = None
+        # Selective strict answers already implied by earlier queries.
+        self._cleared = set()
+        self._necessary = set()
+        self._last_core = None
+        # Linear: one selective strict check per agent. Group: adaptive
+        # group testing. Auto: group testing from GROUP_SEARCH_MIN_AGENTS on.
+        self.helper_search = helper_search
+
+    def _new_solver(self, solver_cls=WorldSolver, **kwargs):
+        """A solver of the given variant, or a portfolio race of it."""
+        if self.portfolio is not None:
+            return self.portfolio.solver(
+                self.world,
+                self.T_MAX,
+                solver_cls=solver_cls,
+                budget=self.budget,
+                **kwargs,
+            )
+        return solver_cls(
+            self.world,
+            T_MAX=self.T_MAX,
+            movement_method=self.movement_method,
+            streaming=True,
+            solver_backend=self.solver_backend,
+            budget=self.budget,
+            **kwargs,
+        )
+
+    def analyze(self) -> CooperationProfileResult:
+        with self.lazy() as profile:
+            return profile.result()
+
+    def lazy(self) -> LazyCooperationProfile:
+        """The profile as a LazyCooperationProfile, read from the store if kept."""
+        stored = None
+        if self.result_store is not None:
+            entry = self.result_store.get(self.world, self.T_MAX, VARIANT_PROFILE)
+            if entry is not None:
+                stored = CooperationProfileResult.from_dict(entry.data)
+        return LazyCooperationProfile(self, stored)
+
+    def _reset_queries(self):
+        if self._queries is not None:
+            self._queries.close()
+        self._queries = None
+        self._cleared = set()
+        self._necessary = set()
+
+    def _query_solver(self) -> WorldSolverSwitchableLaser | None:
+        """The shared warm solver, None when queries run on separate solvers."""
+        if self.portfolio is not None or not self.shared_encoding:
+            return None
+        if self._queries is None:
+            self._queries = WorldSolverSwitchableLaser(
+                self.world,
+                T_MAX=self.T_MAX,
+                movement_method=self.movement_method,
+                streaming=True,
+                solver_backend=self.solver_backend,
+                budget=self.budget,
+            )
+        return self._queries
+
+    def _note_model(self, queries, model):
+        """Every color whose strict rules a SAT model satisfies is no helper."""
+        self._cleared |= queries.strict_colors_in(model)
+
+    def _solve_with_plan(self):
+        """(sat, positions) of the normal solver; positions only when SAT."""
+        store = self.result_store
+        if store is not None:
+            stored = store.get(self.world, self.T_MAX, VARIANT_SOLVE)
+            if stored is not None and (
+                not stored.satisfiable or stored.plan is not None
+            ):
+                return stored.satisfiable, stored.plan
+
+        queries = self._query_solver()
+        if queries is not None:
+            sat, model = queries.solve()
+            positions = queries.decode_positions(model) if sat else None
+            if sat:
+                self._note_model(queries, model)
+        else:
+            with self._new_solver() as solver:
+                sat, model = solver.solve()
+                positions = solver.decode_positions(model) if sat else None
+        if store is not None and sat is not None:
+            store.put(self.world, self.T_MAX, VARIANT_SOLVE, sat, plan=positions)
+        return sat, positions
+
+    def _cooperation_required(self) -> bool | None:
+        queries = self._query_solver()
+        if queries is None:
+            return CooperationSolver(
                 self.world,
-                strict_colors={agent.color},
                 T_MAX=self.T_MAX,
                 movement_method=self.movement_method,
-            ).solve()
-            if not sat:
-                necessary.add(agent.color)
-        return necessary
+                solver_backend=self.solver_backend,
+                portfolio=self.portfolio,
+                budget=self.budget,
+                result_store=self.result_store,
+            ).analyze().cooperation_needed
+
+        if self.result_store is not None:
+            stored = self.result_store.get(self.world, self.T_MAX, VARIANT_STRICT)
+            if stored is not None:
+                return not stored.satisfiable
+
+        strict_sat, model = queries.solve_strict()
+        if strict_sat is None:
+            return None
+        if strict_sat:
+            self._note_model(queries, model)
+        elif len(queries.last_core) == 1:
+            # That color's beam alone must be blocked: making it strict
+            # selectively is UNSAT too, so it is a necessary helper.
+            self._necessary |= queries.last_core
+        if self.result_store is not None:
+            self.result_store.put(self.world, self.T_MAX, VARIANT_STRICT, strict_sat)
+        return not strict_sat
+
+    def _find_necessary_helpers(self) -> tuple[set[int], set[int]]:
+        """Helpers proven necessary, and those whose check ran out of budget."""
+        colors = [agent.color for agent in self.world.agents]
+        if self._group_search(len(colors)):
+            return self._group_test_helpers(colors)
 
-    def _extract_helper_events(self, positions_by_time) -> set[HelperEvent]:
+        necessary = set()
+        undecided = set()
+        for color in colors:
+            sat = self._selective_strict_sat({color})
+            if sat is None:
+                undecided.add(color)
+            elif not sat:
+                necessary.add(color)
+        return necessary, undecided
+
+    def _group_search(self, num_agents: int) -> bool:
+        if self.helper_search == HELPER_SEARCH_AUTO:
+            return num_agents >= GROUP_SEARCH_MIN_AGENTS
+        return self.helper_search == HELPER_SEARCH_GROUP
+
+    def _group_test_helpers(self, colors) -> tuple[set[int], set[int]]:
+        """
+        Adaptive group testing over the selective strict checks.
+
+        Making a whole group strict at once is SAT only if every member's
+        own check is SAT (strictness only removes plans), so one SAT answer
+        clears the group. An UNSAT group is split in halves, except when its
+        core names a single color: that color is necessary on its own, and
+        the rest of the group is tested again without it. With k helpers
+        among n agents this takes O(k log n) solves.
+        """
+        necessary = self._necessary & set(colors)
+        undecided = set()
+        groups = [list(colors)]
+        while groups:
+            known = necessary | self._cleared
+            group = [c for c in groups.pop() if c not in known]
+            if not group:
+                continue
+            sat = self._selective_strict_sat(group)
+            if sat:
+                continue
+            if len(group) == 1:
+                (undecided if sat is None else necessary).add(group[0])
+                continue
+            core = self._last_core
+            if sat is False and core is not None and len(core) == 1:
+                necessary |= core
+                groups.append([c for c in group if c not in core])
+                continue
+            mid = len(group) // 2
+            groups.append(group[mid:])
+            groups.append(group[:mid])
+        return necessary, undecided
+
+    def _selective_strict_sat(self, colors) -> bool | None:
+        """Solvable with the lasers of colors strict; None when out of budget.
+
+        After an UNSAT answer on the shared solver, _last_core holds the
+        colors of its core, otherwise None.
+        """
+        colors = frozenset(colors)
+        self._last_core = None
+        variant = selective_variant(colors)
+        if self.result_store is not None:
+            stored = self.result_store.get(self.world, self.T_MAX, variant)
+            if stored is not None:
+                return stored.satisfiable
+
+        queries = self._query_solver()
+        if colors & self._necessary:
+            sat = False
+        elif len(colors) == 1 and colors <= self._cleared:
+            sat = True
+        elif queries is not None:
+            sat, model = queries.solve_selective(colors)
+            if sat:
+                self._note_model(queries, model)
+            elif sat is False:
+                self._last_core = queries.last_core
+        else:
+            with self._new_solver(
+                WorldSolverSelectiveStrictLaser, strict_colors=colors
+            ) as solver:
+                sat, _ = solver.solve()
+        if sat:
+            self._cleared |= colors
+        if self.result_store is not None and sat is not None:
+            self.result_store.put(self.world, self.T_MAX, variant, sat)
+        return None if sat is None else bool(sat)
+
+    def _extract_helper_events(self, trajectories) -> set[HelperEvent]:
+        """Helper events of an (A, T + 1, 2) position array, agents by color."""
         events: set[HelperEvent] = set()
         beam_paths = self._raw_beam_paths()
+        colors = sorted(agent.color for agent in self.world.agents)
 
-        for t, positions in positions_by_time.items():
+        for t in range(trajectories.shape[1]):
+            positions = {
+                color: (x, y)
+                for color, (x, y) in zip(colors, trajectories[:, t].tolist())
+            }
             for helper, helper_pos in positions.items():
                 for source_pos, path in beam_paths.get(helper, []):
                     if helper_pos not in path:
@@ -1,13 +1,17 @@
 from dataclasses import dataclass
 
+from .backends import DEFAULT_SOLVER_BACKEND
+from .budget import SolveBudget
 from .constraints.movements import METHOD_LOCAL
+from .portfolio_solver import Portfolio
+from .result_store import VARIANT_STRICT, ResultStore
 from .world_data import WorldData
 from .world_solver_strict_laser import WorldSolverStrictLaser
 
 
 @dataclass
 class CooperationResult:
-    cooperation_needed: bool
+    cooperation_needed: bool | None  # None when the strict check ran out of budget
 
 
 class CooperationSolver:
@@ -16,16 +20,53 @@ class CooperationSolver:
     Cooperation is needed iff strict-laser solver is UNSAT.
     """
 
-    def __init__(self, world: WorldData, T_MAX: int = 10, movement_method=METHOD_LOCAL):
+    def __init__(
+        self,
+        world: WorldData,
+        T_MAX: int = 10,
+        movement_method=METHOD_LOCAL,
+        solver_backend=DEFAULT_SOLVER_BACKEND,
+        portfolio: Portfolio | None = None,
+        budget: SolveBudget | None = None,
+        result_store: ResultStore | None = None,
+    ):
         self.world = world
         self.T_MAX = T_MAX
         self.movement_method = movement_method
+        self.solver_backend = solver_backend
+        # When set, the strict check races the portfolio's configurations.
+        self.portfolio = portfolio
+        self.budget = budget
+        # Strict answers are read from and written to it.
+        self.result_store = result_store
 
     def analyze(self) -> CooperationResult:
-        strict_sat, _ = WorldSolverStrictLaser(
-            self.world,
-            T_MAX=self.T_MAX,
-            movement_method=self.movement_method,
-        ).solve()
+        if self.result_store is not None:
+            stored = self.result_store.get(self.world, self.T_MAX, VARIANT_STRICT)
+            if stored is not None:
+                return CooperationResult(cooperation_needed=not stored.satisfiable)
 
-        return CooperationResult(cooperation_needed=not bool(strict_sat))
+        if self.portfolio is not None:
+            solver = self.portfolio.solver(
+                self.world,
+                self.T_MAX,
+                solver_cls=WorldSolverStrictLaser,
+                budget=self.budget,
+            )
+        else:
+            solver = WorldSolverStrictLaser(
+                self.world,
+                T_MAX=self.T_MAX,
+                movement_method=self.movement_method,
+                streaming=True,
+                solver_backend=self.solver_backend,
+                budget=self.budget,
+            )
+        with solver:
+            strict_sat, _ = solver.solve()
+
+        if strict_sat is None:
+            return CooperationResult(cooperation_needed=None)
+        if self.result_store is not None:
+            self.result_store.put(self.world, self.T_MAX, VARIANT_STRICT, strict_sat)
+        return CooperationResult(cooperation_needed=not strict_sat)
@@ -0,0 +1,102 @@
+from .backends import new_solver
+from .constraints import MovementConstraints
+from .model import SolverSink
+from .world_data import WorldData
+from .world_solver import WorldSolver
+
+
+class IncrementalWorldSolver(WorldSolver):
+    """
+    WorldSolver that keeps one live SAT solver across horizons.
+
+    Initialization, movement and laser clauses are encoded layer by layer,
+    only when a query needs a horizon beyond the encoded one. The goal of
+    each horizon k (every exit occupied at time k) is guarded by its own
+    activation literal and switched on through solver assumptions, so
+    asking "solvable at T=k?" for many k costs one encoding plus cheap
+    incremental solves.
+
+    Layers beyond k do not change the answer at horizon k: agents may always
+    stay in place, so any plan of length k extends to the encoded horizon.
+    Pruning only uses the earliest arrival times, which do not depend on T.
+    """
+
+    fixed_horizon = False
+
+    def __init__(self, world: WorldData, T_MAX=0, **kwargs):
+        if kwargs.get("cnf_cache") is not None:
+            raise ValueError("IncrementalWorldSolver cannot use a CNF cache")
+        super().__init__(world, T_MAX, **kwargs)
+        self._goal_literals = {}
+
+    def _movement_constraints(self):
+        # The goal depends on the horizon, so it is guarded per query instead.
+        self.movement = MovementConstraints(
+            self.ctx,
+            movement_method=self.movement_method,
+            include_goal=False,
+            amo_encoding=self.amo_encoding,
+            collision_encoding=self.collision_encoding,
+        )
+        return self.movement
+
+    def build_model(self):
+        self.extend_to(self.T_MAX)
+
+    def extend_to(self, T):
+        """Encode every time layer up to horizon T into the live solver."""
+        if self._solver is not None and T <= self.T_MAX:
+            return
+
+        if self._solver is None:
+            t_from = 0
+            self._solver = new_solver(self.solver_backend)
+            if self.streaming:
+                self._sink = SolverSink(self._solver)
+        else:
+            t_from = self.T_MAX + 1
+        self.ctx.extend_horizon(T)
+        self.T_MAX = self.ctx.T_MAX
+        for constraint in self.constraints:
+            constraint.t_from = t_from
+
+        first_new = len(self.model)
+        self._encode_constraints()
+        if not self.streaming:
+            self._solver.append_formula(self.model.iter_clauses(first_new))
+        self._model_built = True
+
+    def _goal_literal(self, T):
+        lit = self._goal_literals.get(T)
+        if lit is None:
+            lit = self.var.goal(T)
+            clauses = self.movement.goal_clauses(T)
+            if self.ctx.prune:
+                clauses = self.ctx.simplify(clauses)
+            for clause in clauses:
+                guarded = [-lit] + clause
+                if not self.streaming:
+                    self.model.add_clause(guarded)
+                self._solver.add_clause(guarded)
+            self._goal_literals[T] = lit
+        return lit
+
+    def solve(self, T=None):
+        """Solve at horizon T (defaults to the largest encoded horizon)."""
+        T = self.T_MAX if T is None else T
+        if T < 0:
+            raise ValueError(f"T must be >= 0. Got {T}")
+        self.extend_to(T)
+
+        assumptions = [self._goal_literal(T)]
+        result, model, solve_time = self._run_solver(self._solver, assumptions)
+
+        if self.profiler:
+            self.profiler.set_solve_results(solve_time, result)
+
+        return result, model
+
+    def is_satisfiable(self, T) -> bool | None:
+        """Whether a plan of horizon T exists; None if the budget ran out."""
+        result, _ = self.solve(T)
+        return None if result is None else bool(result)
@@ -0,0 +1,210 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from .constraints.movements import METHOD_LOCAL
+from .incremental_world_solver import IncrementalWorldSolver
+from .world_data import WorldData
+
+# Search strategy constants
+SEARCH_LINEAR = "linear"
+SEARCH_BINARY = "binary"
+SEARCH_EXPONENTIAL = "exponential"
+
+
+@dataclass(frozen=True)
+class MakespanStep:
+    """One SAT query issued by the search."""
+
+    T: int
+    satisfiable: bool
+    solve_time: float
+
+
+@dataclass
+class MakespanResult:
+    makespan: int | None  # None when no plan exists up to max_T
+    plan: list | None
+    lower_bound: int | None  # None when some agent cannot reach any exit
+    steps: list[MakespanStep] = field(default_factory=list)
+    total_time: float = 0.0
+
+
+class MakespanSearch:
+    """
+    Finds the smallest horizon T for which a world is solvable.
+
+    The search starts at a shortest-path lower bound no plan can beat (see
+    lower_bound). Every SAT answer is tightened with
+    the model itself: the first step at which all exits are occupied is a
+    valid horizon too, so the upper bound jumps straight there. The remaining
+    gap is searched linearly, by doubling the horizon then bisecting, or by
+    exponential probing followed by bisection. Both probe upwards from the
+    lower bound, so max_T is only a cap and never the first horizon encoded.
+    All queries share one IncrementalWorldSolver.
+    """
+
+    def __init__(
+        self,
+        world: WorldData,
+        strategy=SEARCH_EXPONENTIAL,
+        max_T=None,
+        movement_method=METHOD_LOCAL,
+    ):
+        if strategy not in (SEARCH_LINEAR, SEARCH_BINARY, SEARCH_EXPONENTIAL):
+            raise ValueError(f"Unknown search strategy: {strategy}")
+        self.world = world
+        self.strategy = strategy
+        self.max_T = (
+            world.width * world.height * max(1, len(world.agents))
+            if max_T is None
+            else max_T
+        )
+        self.movement_method = movement_method
+        self._solver = None
+        self._steps = []
+        self._best = None  # (T, model) of the tightest SAT answer so far
+
+    def lower_bound(self) -> int | None:
+        """A horizon no plan can beat, or None if no plan exists at all.
+
+        Every exit must be occupied at T, so some agent has to reach each of
+        them. When there are enough exits for all agents, every agent must
+        also end on one (the same rule as ConstraintContext's pruning), and
+        its distance to the nearest exit counts too.
+        """
+        blocked = set(self.world.wall_positions) | {
+            src.position for src in self.world.laser_sources
+        }
+        exits = set(self.world.exit_positions)
+        starts = {agent.position for agent in self.world.agents}
+        bound = 0
+        for exit_pos in exits:
+            distance = self._distance(exit_pos, starts, blocked)
+            if distance is None:
+                return None
+            bound = max(bound, distance)
+        if len(exits) < len(starts):
+            return bound
+        for start in starts:
+            distance = self._distance(start, exits, blocked)
+            if distance is None:
+                return None
+            bound = max(bound, distance)
+        return bound
+
+    def _distance(self, start, targets, blocked) -> int | None:
+        """Shortest-path distance from start to the nearest target."""
+        seen = {start}
+        queue = deque([(start, 0)])
+        while queue:
+            pos, dist = queue.popleft()
+            if pos in targets:
+                return dist
+            for nxt in self.world.get_neighbors(pos):
+                if nxt in seen or nxt in blocked:
+                    continue
+                seen.add(nxt)
+                queue.append((nxt, dist + 1))
+        return None
+
+    def find_min_makespan(self) -> MakespanResult:
+        start_time = time.perf_counter()
+        self._steps = []
+        self._best = None
+
+        lower = self.lower_bound()
+        if lower is None or lower > self.max_T:
+            return MakespanResult(
+                makespan=None,
+                plan=None,
+                lower_bound=lower,
+                total_time=time.perf_counter() - start_time,
+            )
+
+        with IncrementalWorldSolver(
+            self.world, T_MAX=lower, movement_method=self.movement_method
+        ) as solver:
+            self._solver = solver
+            if self.strategy == SEARCH_LINEAR:
+                self._search_linear(lower)
+            elif self.strategy == SEARCH_BINARY:
+                self._search_binary(lower)
+            else:
+                self._search_exponential(lower)
+
+            plan = None
+            if self._best is not None:
+                T, model = self._best
+                plan = solver.extract_plan(model, T=T)
+            self._solver = None
+
+        return MakespanResult(
+            makespan=None if self._best is None else self._best[0],
+            plan=plan,
+            lower_bound=lower,
+            steps=self._steps,
+            total_time=time.perf_counter() - start_time,
+        )
+
+    def _search_linear(self, lower):
+        for T in range(lower, self.max_T + 1):
+            if self._query(T):
+                return
+
+    def _search_binary(self, lower):
+        T = lower
+        while not self._query(T):
+            if T >= self.max_T:
+                return
+            lower = T + 1
+            T = min(max(2 * T, T + 1), self.max_T)
+        self._bisect(lower, self._best[0])
+
+    def _search_exponential(self, lower):
+        step = 1
+        T = lower
+        while True:
+            if self._query(T):
+                self._bisect(lower, self._best[0])
+                return
+            lower = T + 1
+            if T >= self.max_T:
+                return
+            T = min(T + step, self.max_T)
+            step *= 2
+
+    def _bisect(self, lo, hi):
+        """Shrink [lo, hi], where hi is known SAT, down to the optimum."""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._query(mid):
+                hi = self._best[0]
+            else:
+                lo = mid + 1
+
+    def _query(self, T) -> bool:
+        start_solve_time = time.perf_counter()
+        result, model = self._solver.solve(T)
+        self._steps.append(
+            MakespanStep(
+                T=T,
+                satisfiable=bool(result),
+                solve_time=time.perf_counter() - start_solve_time,
+            )
+        )
+        if result:
+            T = self._arrival_time(model, T)
+            if self._best is None or T < self._best[0]:
+                self._best = (T, model)
+        return bool(result)
+
+    def _arrival_time(self, model, T) -> int:
+        """First step at which every exit is occupied in the model's plan."""
+        positions = self._solver.decode_positions(model, T).tolist()
+        exits = set(self.world.exit_positions)
+        for t in range(T + 1):
+            occupied = {tuple(path[t]) for path in positions}
+            if exits <= occupied:
+                return t
+        return T
@@ -1,12 +1,146 @@
+from array import array
+
+import numpy as np
 from pysat.formula import CNF
 
 
 class SATModel:
+    """
+    Clause store in CSR form.
+
+    All literals live in one flat int32 buffer; offsets[i] is where clause i
+    starts and offsets[i + 1] where it ends. Clauses are appended one by one
+    or as whole (n, width) NumPy blocks, and solvers are fed slices of the
+    buffer, so no per-clause Python list is kept around.
+    """
+
     def __init__(self):
-        self.cnf = CNF()
+        self.literals = array("i")
+        self.offsets = array("q", [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_literals(self):
+        return len(self.literals)
 
     def add_clause(self, clause):
-        self.cnf.append(clause)
+        self.literals.extend(clause)
+        self.offsets.append(len(self.literals))
+
+    def add_block(self, block: np.ndarray):
+        """Append every row of an (n, width) literal array as one clause."""
+        n, width = block.shape
+        start = len(self.literals)
+        self.literals.frombytes(np.ascontiguousarray(block, dtype=np.int32).tobytes())
+        ends = start + width * np.arange(1, n + 1, dtype=np.int64)
+        self.offsets.frombytes(ends.tobytes())
 
     def extend(self, clauses):
-        self.cnf.clauses.extend(clauses)
+        """Append clauses; 2D NumPy entries are added as clause blocks."""
+        for clause in clauses:
+            if isinstance(clause, np.ndarray):
+                self.add_block(clause)
+            else:
+                self.add_clause(clause)
+
+    def clause(self, i):
+        """Clause i as a memoryview of the buffer (no copy)."""
+        return memoryview(self.literals)[self.offsets[i] : self.offsets[i + 1]]
+
+    def iter_clauses(self, start=0):
+        """
+        Yield clauses start..end as memoryviews of the buffer (no copy).
+
+        pysat solvers take them as they are. A view pins the buffer, so
+        drop the views before adding clauses again.
+        """
+        literals = memoryview(self.literals)
+        offsets = self.offsets
+        try:
+            for i in range(start, len(offsets) - 1):
+                yield literals[offsets[i] : offsets[i + 1]]
+        finally:
+            literals.release()
+
+    @classmethod
+    def from_arrays(cls, literals: np.ndarray, offsets: np.ndarray) -> "SATModel":
+        """Model over an int32 literal buffer and its int64 clause offsets."""
+        model = cls()
+        model.literals = array("i")
+        model.literals.frombytes(np.ascontiguousarray(literals, dtype=np.int32).tobytes())
+        model.offsets = array("q")
+        model.offsets.frombytes(np.ascontiguousarray(offsets, dtype=np.int64).tobytes())
+        return model
+
+    def to_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """(literals, offsets) as int32 and int64 arrays sharing the buffers."""
+        return (
+            np.frombuffer(self.literals, dtype=np.int32),
+            np.frombuffer(self.offsets, dtype=np.int64),
+        )
+
+    def write_dimacs(self, filepath, num_vars):
+        """Write the clauses as a DIMACS CNF file over num_vars variables."""
+        with open(filepath, "w") as f:
+            f.write(f"p cnf {num_vars} {len(self)}\n")
+            for clause in self.iter_clauses():
+                f.write(" ".join(map(str, clause)))
+                f.write(" 0\n")
+
+    @property
+    def cnf(self):
+        """The clauses as a pysat CNF. Materializes one list per clause."""
+        return CNF(from_clauses=[clause.tolist() for clause in self.iter_clauses()])
+
+
+class SolverSink:
+    """
+    Feeds clauses straight into a live pysat solver instead of storing them.
+
+    Clauses given one by one are handed over with append_formula in chunks
+    of chunk_size, so at most one chunk of Python lists exists at any time.
+    NumPy blocks go in as memoryviews of their rows, without any list.
+    """
+
+    chunk_size = 1 << 16
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.num_clauses = 0
+
+    def __len__(self):
+        return self.num_clauses
+
+    def add_clause(self, clause):
+        self.solver.add_clause(clause)
+        self.num_clauses += 1
+
+    def add_block(self, block: np.ndarray):
+        """Append every row of an (n, width) literal array as one clause."""
+        n, width = block.shape
+        literals = memoryview(np.ascontiguousarray(block, dtype=np.int32).reshape(-1))
+        self.solver.append_formula(
+            literals[i * width : (i + 1) * width] for i in range(n)
+        )
+        self.num_clauses += n
+
+    def extend(self, clauses):
+        """Append clauses; 2D NumPy entries are added as clause blocks."""
+        chunk = []
+        for clause in clauses:
+            if isinstance(clause, np.ndarray):
+                self._flush(chunk)
+                self.add_block(clause)
+            else:
+                chunk.append(clause)
+                if len(chunk) >= self.chunk_size:
+                    self._flush(chunk)
+        self._flush(chunk)
+
+    def _flush(self, chunk):
+        if chunk:
+            self.solver.append_formula(chunk)
+            self.num_clauses += len(chunk)
+            chunk.clear()
@@ -0,0 +1,264 @@
+import multiprocessing as mp
+import queue
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .backends import DEFAULT_SOLVER_BACKEND, canonical_backend
+from .constraints.movements import METHOD_GLOBAL, METHOD_LOCAL
+from .world_data import WorldData, WorldSnapshot
+from .world_solver import WorldSolver
+
+
+@dataclass(frozen=True)
+class PortfolioConfig:
+    """One contestant of the race: encoding, backend and diversification seed."""
+
+    movement_method: str = METHOD_LOCAL
+    solver_backend: str = DEFAULT_SOLVER_BACKEND
+    seed: int | None = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "PortfolioConfig":
+        """Parse METHOD[:BACKEND[:SEED]], e.g. "global:cadical195:3"."""
+        method, *rest = spec.split(":")
+        if len(rest) > 2:
+            raise ValueError(f"Invalid portfolio config: {spec}")
+        backend = rest[0] if rest else DEFAULT_SOLVER_BACKEND
+        seed = int(rest[1]) if len(rest) > 1 else None
+        return cls(method, backend, seed)
+
+    @property
+    def label(self) -> str:
+        label = f"{self.movement_method}:{self.solver_backend}"
+        return label if self.seed is None else f"{label}:{self.seed}"
+
+
+DEFAULT_PORTFOLIO = (
+    PortfolioConfig(METHOD_LOCAL, "minisat22"),
+    PortfolioConfig(METHOD_GLOBAL, "minisat22"),
+    PortfolioConfig(METHOD_LOCAL, "cadical195"),
+    PortfolioConfig(METHOD_GLOBAL, "glucose4"),
+)
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    satisfiable: bool | None  # None when every config ran out of budget
+    model: list | None
+    winner: PortfolioConfig | None
+    solve_time: float  # wall clock of the whole race, worker start-up included
+    winner_solve_time: float  # SAT call of the winner alone
+
+
+@dataclass
+class Portfolio:
+    """
+    A set of configurations to race, plus the win statistics of every race
+    run through it. Share one Portfolio across solvers to collect wins over
+    a whole generation or analysis run.
+    """
+
+    configs: tuple[PortfolioConfig, ...] = DEFAULT_PORTFOLIO
+    wins: Counter = field(default_factory=Counter)
+    races: int = 0
+
+    def __post_init__(self):
+        if not self.configs:
+            raise ValueError("A portfolio needs at least one config")
+        configs = []
+        for config in self.configs:
+            if config.movement_method not in (METHOD_LOCAL, METHOD_GLOBAL):
+                raise ValueError(f"Unknown movement method: {config.movement_method}")
+            configs.append(
+                PortfolioConfig(
+                    config.movement_method,
+                    canonical_backend(config.solver_backend),
+                    config.seed,
+                )
+            )
+        self.configs = tuple(configs)
+
+    @classmethod
+    def from_specs(cls, specs) -> "Portfolio":
+        return cls(configs=tuple(PortfolioConfig.parse(spec) for spec in specs))
+
+    def solver(self, world: WorldData, T_MAX=10, solver_cls=WorldSolver, **kwargs):
+        return PortfolioSolver(world, T_MAX, self, solver_cls=solver_cls, **kwargs)
+
+    def record(self, result: PortfolioResult):
+        self.races += 1
+        if result.winner is not None:
+            self.wins[result.winner.label] += 1
+
+    def win_rates(self) -> dict[str, float]:
+        return {
+            config.label: self.wins[config.label] / self.races if self.races else 0.0
+            for config in self.configs
+        }
+
+
+class PortfolioSolver:
+    """
+    Races several configurations of one solver variant across processes.
+
+    Every configuration encodes and solves the same world in its own worker
+    process. The first SAT/UNSAT answer wins; the remaining workers are
+    terminated. Configs that exhaust their budget drop out of the race, and
+    if all of them do, the answer is None. solve() returns (result, model)
+    like WorldSolver.solve, and the model is decoded with the winner's
+    variable layout, so var and the decode_*/extract_* methods work as on a
+    plain solver.
+    """
+
+    def __init__(
+        self,
+        world: WorldData,
+        T_MAX=10,
+        portfolio: Portfolio | None = None,
+        solver_cls=WorldSolver,
+        **solver_kwargs,
+    ):
+        self.world = world
+        self.T_MAX = T_MAX
+        self.portfolio = Portfolio() if portfolio is None else portfolio
+        self.solver_cls = solver_cls
+        self.solver_kwargs = solver_kwargs
+        self.last_result: PortfolioResult | None = None
+        self._decoder = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Workers never outlive solve(); kept for use as a context manager."""
+
+    @property
+    def winner(self) -> PortfolioConfig | None:
+        return None if self.last_result is None else self.last_result.winner
+
+    def solve(self):
+        start_time = time.perf_counter()
+        configs = self.portfolio.configs
+        world = WorldSnapshot.from_world(self.world)
+        jobs = [
+            (self.solver_cls, world, self.T_MAX, config, self.solver_kwargs)
+            for config in configs
+        ]
+        if len(jobs) == 1:
+            index, result, model, solve_time = _solve_config(0, jobs[0])
+        else:
+            index, result, model, solve_time = self._race(jobs)
+
+        self.last_result = PortfolioResult(
+            satisfiable=None if result is None else bool(result),
+            model=model,
+            winner=None if result is None else configs[index],
+            solve_time=time.perf_counter() - start_time,
+            winner_solve_time=solve_time,
+        )
+        self._decoder = None
+        self.portfolio.record(self.last_result)
+        return result, model
+
+    def _race(self, jobs):
+        ctx = mp.get_context()
+        answers = ctx.Queue()
+        workers = [
+            ctx.Process(target=_race_worker, args=(index, job, answers), daemon=True)
+            for index, job in enumerate(jobs)
+        ]
+        for worker in workers:
+            worker.start()
+
+        failures = []
+        undecided = []
+        try:
+            while len(failures) + len(undecided) < len(workers):
+                try:
+                    answer = answers.get(timeout=0.1)
+                except queue.Empty:
+                    if any(worker.is_alive() for worker in workers):
+                        continue
+                    if answers.empty():
+                        break
+                    continue
+                if answer[1] == "error":
+                    failures.append(answer)
+                    continue
+                if answer[1] is None:
+                    undecided.append(answer)
+                    continue
+                return answer
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join()
+            answers.close()
+
+        if undecided:
+            return undecided[0]
+        configs = self.portfolio.configs
+        details = "; ".join(f"{configs[i].label}: {error}" for i, _, error in failures)
+        raise RuntimeError(f"Every portfolio config failed ({details or 'no answer'})")
+
+    def _winner_solver(self):
+        """Unbuilt solver of the winning config, used to decode its model."""
+        if self.winner is None:
+            raise ValueError("No winning config to decode a model with")
+        if self._decoder is None:
+            config = self.last_result.winner
+            self._decoder = self.solver_cls(
+                self.world,
+                T_MAX=self.T_MAX,
+                movement_method=config.movement_method,
+                solver_backend=config.solver_backend,
+                **self.solver_kwargs,
+            )
+        return self._decoder
+
+    @property
+    def var(self):
+        return self._winner_solver().var
+
+    def decode_positions(self, model, T=None):
+        return self._winner_solver().decode_positions(model, T)
+
+    def decode_trajectories(self, model, T=None):
+        return self._winner_solver().decode_trajectories(model, T)
+
+    def extract_positions(self, model, T=None):
+        return self._winner_solver().extract_positions(model, T)
+
+    def extract_plan(self, model, T=None):
+        return self._winner_solver().extract_plan(model, T=T)
+
+
+def _solve_config(index, job):
+    solver_cls, world, T_MAX, config, solver_kwargs = job
+    with solver_cls(
+        world,
+        T_MAX=T_MAX,
+        movement_method=config.movement_method,
+        solver_backend=config.solver_backend,
+        seed=config.seed,
+        # Clause shuffling needs the stored model; otherwise stream.
+        streaming=config.seed is None,
+        **solver_kwargs,
+    ) as solver:
+        solver.build_model()
+        start_solve_time = time.perf_counter()
+        result, model = solver.solve()
+        return index, result, model, time.perf_counter() - start_solve_time
+
+
+def _race_worker(index, job, answers):
+    try:
+        answers.put(_solve_config(index, job))
+    except Exception as exc:
+        answers.put((index, "error", repr(exc)))
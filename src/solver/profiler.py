@@ -25,6 +25,10 @@ class SolverProfiler:
         self.total_generation_time = 0.0
         self.solve_time = 0.0
         self.satisfiable = None
+        # True when the model came from the CNF cache instead of encoding
+        self.cnf_cache_hit = False
+        # backend -> {solves, sat, unsat, solve_time, conflicts, decisions, ...}
+        self.backend_stats: Dict[str, Dict[str, Any]] = {}
 
     def start_constraint(self, constraint_name: str) -> "ConstraintProfiler":
         """Start profiling a constraint"""
@@ -36,11 +40,34 @@ class SolverProfiler:
         self.total_clauses += profile.num_clauses
         self.total_generation_time += profile.generation_time
 
+    def set_cache_load(self, load_time: float, num_clauses: int):
+        """Record a model loaded from the CNF cache; no constraint breakdown"""
+        self.cnf_cache_hit = True
+        self.total_clauses = num_clauses
+        self.total_generation_time = load_time
+
     def set_solve_results(self, solve_time: float, satisfiable):
         """Record solving results"""
         self.solve_time = solve_time
         self.satisfiable = satisfiable
 
+    def add_backend_solve(
+        self, backend: str, solve_time: float, satisfiable, stats: Dict[str, int]
+    ):
+        """Accumulate one solver call under its backend"""
+        entry = self.backend_stats.setdefault(
+            backend,
+            {"solves": 0, "sat": 0, "unsat": 0, "unknown": 0, "solve_time": 0.0},
+        )
+        entry["solves"] += 1
+        if satisfiable is None:
+            entry["unknown"] += 1
+        else:
+            entry["sat" if satisfiable else "unsat"] += 1
+        entry["solve_time"] += solve_time
+        for key, value in stats.items():
+            entry[key] = entry.get(key, 0) + value
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert profiling data to dictionary"""
         return {
@@ -48,6 +75,8 @@ class SolverProfiler:
             "total_generation_time": self.total_generation_time,
             "solve_time": self.solve_time,
             "satisfiable": self.satisfiable,
+            "cnf_cache_hit": self.cnf_cache_hit,
+            "backends": self.backend_stats,
             "constraints": {
                 name: asdict(profile)
                 for name, profile in self.constraint_profiles.items()
@@ -158,3 +187,9 @@ class MethodProfiler:
         clause_list = list(clauses)
         self.clause_count += len(clause_list)
         return clause_list
+
+    def count_blocks(self, blocks):
+        """Count clauses from an iterator of (n, width) literal blocks"""
+        block_list = list(blocks)
+        self.clause_count += sum(len(block) for block in block_list)
+        return block_list
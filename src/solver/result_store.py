@@ -0,0 +1,232 @@
+"""
+Persistent store of solve and cooperation-analysis outcomes.
+
+Regenerating a dataset or re-running an analysis over the same level corpus
+asks the same questions again: is this world solvable at T_MAX, with strict
+lasers, with agent c's lasers strict, and what is its cooperation profile?
+ResultStore keeps the answers in a SQLite file, keyed by a canonical world
+hash, T_MAX and an analysis variant. Only decided answers are stored: a
+budget that ran out leaves nothing behind.
+
+Answers do not depend on the encoding or backend used to reach them, so
+solvers with different options share entries. A stored plan (and the
+profile built from it) is the one of whichever run stored it first.
+
+Every write commits at once (write-through). The database runs in WAL mode
+with a busy timeout, and each process opens its own connection, so worker
+processes can share one file. Least recently used rows are evicted past
+max_entries and max_bytes, every evict_every writes of a process (and when
+it closes the store), so a store can overshoot its bounds by that many rows
+per process in between.
+"""
+
+import io
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .cnf_cache import world_fingerprint
+from .world_data import WorldData
+
+# Analysis variants
+VARIANT_SOLVE = "solve"
+VARIANT_STRICT = "strict"
+VARIANT_PROFILE = "profile"
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+DEFAULT_EVICT_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    world_hash TEXT NOT NULL,
+    t_max INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    satisfiable INTEGER NOT NULL,
+    plan BLOB,
+    data TEXT,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (world_hash, t_max, variant)
+)
+"""
+
+# Recency is a logical clock, so rows touched in quick succession still
+# order strictly; wall-clock stamps can tie.
+_NEXT_USE = "(SELECT COALESCE(MAX(last_used), 0) + 1 FROM results)"
+
+
+def selective_variant(strict_colors) -> str:
+    """Variant of a selective strict-laser check, e.g. "selective:0,2"."""
+    return "selective:" + ",".join(str(c) for c in sorted(strict_colors))
+
+
+def canonical_world_hash(world: WorldData) -> str:
+    """
+    sha256 of a world up to the order of its components.
+
+    The canonical world_fingerprint: every listing of the same level hashes
+    alike, and agents keep their colors, which the plan and the cooperation
+    profile refer to.
+    """
+    return world_fingerprint(world, canonical=True)
+
+
+@dataclass(frozen=True)
+class StoredResult:
+    satisfiable: bool
+    plan: np.ndarray | None  # (A, T + 1, 2) positions, agents by color
+    data: dict | None  # variant-specific payload, e.g. a cooperation profile
+
+
+class ResultStore:
+    """SQLite-backed answers keyed by (canonical world hash, T_MAX, variant)."""
+
+    def __init__(
+        self,
+        path,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        max_bytes=None,
+        evict_every=DEFAULT_EVICT_EVERY,
+    ):
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be > 0. Got {max_entries}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be > 0. Got {max_bytes}")
+        if evict_every <= 0:
+            raise ValueError(f"evict_every must be > 0. Got {evict_every}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+
+    def __getstate__(self):
+        # Connections do not cross processes; workers open their own.
+        state = dict(self.__dict__)
+        state["_conn"] = None
+        state["_pid"] = None
+        state["_writes"] = 0
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            if self._writes:
+                self._evict(self._conn)
+            self._conn.close()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, world: WorldData, T_MAX: int, variant: str) -> StoredResult | None:
+        key = (canonical_world_hash(world), T_MAX, variant)
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT satisfiable, plan, data FROM results"
+            " WHERE world_hash = ? AND t_max = ? AND variant = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        conn.execute(
+            f"UPDATE results SET last_used = {_NEXT_USE}"
+            " WHERE world_hash = ? AND t_max = ? AND variant = ?",
+            key,
+        )
+        self.hits += 1
+        satisfiable, plan, data = row
+        return StoredResult(
+            satisfiable=bool(satisfiable),
+            plan=None if plan is None else np.load(io.BytesIO(plan)),
+            data=None if data is None else json.loads(data),
+        )
+
+    def put(
+        self,
+        world: WorldData,
+        T_MAX: int,
+        variant: str,
+        satisfiable: bool,
+        plan: np.ndarray | None = None,
+        data: dict | None = None,
+    ):
+        """Store a decided answer, replacing any previous one."""
+        plan_blob = None
+        if plan is not None:
+            buffer = io.BytesIO()
+            np.save(buffer, np.asarray(plan, dtype=np.int16))
+            plan_blob = buffer.getvalue()
+        data_text = None if data is None else json.dumps(data)
+        size = len(plan_blob or b"") + len(data_text or "")
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results"
+                f" VALUES (?, ?, ?, ?, ?, ?, ?, {_NEXT_USE})",
+                (
+                    canonical_world_hash(world),
+                    T_MAX,
+                    variant,
+                    int(bool(satisfiable)),
+                    plan_blob,
+                    data_text,
+                    size,
+                ),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Drop least recently used rows until the bounds hold."""
+        conn.execute(
+            "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results"
+            " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        if self.max_bytes is not None:
+            conn.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM"
+                " (SELECT rowid, SUM(size) OVER (ORDER BY last_used DESC) AS kept"
+                " FROM results) WHERE kept > ?)",
+                (self.max_bytes,),
+            )
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
@@ -1,18 +1,231 @@
-from pysat.formula import IDPool
+from bisect import bisect_right
+
+import numpy as np
 
 
 class VariableFactory:
+    """
+    Numbers variables arithmetically instead of interning tuples.
+
+    Time layers are laid out one after the other. Inside layer t, every agent
+    color, laser color and (color, direction) beam owns one H*W slab, so
+
+        agent(c, x, y, t) = layer_base[t] + agent_offset[c] + x * W + y
+
+    and likewise for lasers and beams. Layers are appended on demand, which
+    lets incremental solvers grow the horizon. Singleton variables (the pruned
+    false literal, goal activation literals) are numbered from the same
+    counter and kept in a small name table; auxiliary variables of the
+    cardinality encodings are numbered from it too but stay anonymous.
+    """
+
     def __init__(self):
-        self.pool = IDPool(start_from=1)
+        self._next = 1
+        self._ids = {}
+        self._objects = {}
+        self._layer_bases = []
+        self.layer_size = 0
+        self.height = 0
+        self.width = 0
+        self._agent_offsets = {}
+        self._laser_offsets = {}
+        self._beam_offsets = {}
+        self._slabs = []  # (offset, kind, key) sorted by offset, for decoding
+
+    def declare_layout(self, height, width, agent_colors, laser_colors, beam_keys):
+        """Fix the per-layer slab layout. Must be called before adding layers."""
+        if self._layer_bases:
+            raise ValueError("Layout cannot change once layers are allocated")
+        self.height = height
+        self.width = width
+        cells = height * width
+        offset = 0
+        for offsets, kind, keys in (
+            (self._agent_offsets, "agent", agent_colors),
+            (self._laser_offsets, "laser", laser_colors),
+            (self._beam_offsets, "beam", beam_keys),
+        ):
+            for key in keys:
+                if key in offsets:
+                    continue
+                offsets[key] = offset
+                self._slabs.append((offset, kind, key))
+                offset += cells
+        self.layer_size = offset
+
+    def ensure_layers(self, num_layers):
+        """Allocate time layers 0..num_layers - 1."""
+        while len(self._layer_bases) < num_layers:
+            self._layer_bases.append(self._next)
+            self._next += self.layer_size
+
+    @property
+    def num_layers(self):
+        return len(self._layer_bases)
+
+    @property
+    def num_vars(self):
+        return self._next - 1
+
+    def layer_base(self, t):
+        return self._layer_bases[t]
+
+    def agent_offset(self, color):
+        return self._agent_offsets[color]
+
+    def laser_offset(self, color):
+        return self._laser_offsets[color]
+
+    def beam_offset(self, color, direction):
+        return self._beam_offsets[color, direction]
 
     def agent(self, color, x, y, t):
-        return self.pool.id(("agent", color, (x, y), t))
+        return self._layer_bases[t] + self._agent_offsets[color] + x * self.width + y
 
     def laser(self, color, x, y, t):
-        return self.pool.id(("laser", color, (x, y), t))
+        return self._layer_bases[t] + self._laser_offsets[color] + x * self.width + y
 
     def beam(self, color, direction, x, y, t):
-        return self.pool.id(("beam", color, direction, (x, y), t))
+        return (
+            self._layer_bases[t]
+            + self._beam_offsets[color, direction]
+            + x * self.width
+            + y
+        )
+
+    def named(self, obj):
+        """Id of a singleton variable, allocated on first use."""
+        var = self._ids.get(obj)
+        if var is None:
+            var = self._next
+            self._next += 1
+            self._ids[obj] = var
+            self._objects[var] = obj
+        return var
+
+    def fresh(self, count=1):
+        """First id of `count` new anonymous auxiliary variables."""
+        var = self._next
+        self._next += count
+        return var
+
+    def false(self):
+        """Stands for every pruned variable; never emitted in a clause."""
+        return self.named(("false",))
+
+    def goal(self, t):
+        return self.named(("goal", t))
 
     def name(self, lit: int):
-        return self.pool.obj(abs(lit))
+        var = abs(lit)
+        obj = self._objects.get(var)
+        if obj is not None:
+            return obj
+
+        t = bisect_right(self._layer_bases, var) - 1
+        if t < 0:
+            return None
+        offset = var - self._layer_bases[t]
+        if offset >= self.layer_size:
+            return None
+
+        cells = self.height * self.width
+        slab_offset, kind, key = self._slabs[offset // cells]
+        x, y = divmod(offset - slab_offset, self.width)
+        if kind == "beam":
+            color, direction = key
+            return ("beam", color, direction, (x, y), t)
+        return (kind, key, (x, y), t)
+
+
+class AgentVariables:
+    """
+    agent_var[c, x, y, t] view over the factory layout.
+
+    With a liveness mask, cells outside an agent's reachability window
+    resolve to the shared false literal and are not "in" the view.
+    """
+
+    def __init__(self, var_factory: VariableFactory, false_var=None):
+        # The factory only ever appends to these, so the views stay current.
+        self._bases = var_factory._layer_bases
+        self._offsets = var_factory._agent_offsets
+        self._width = var_factory.width
+        self._cells = var_factory.height * var_factory.width
+        self._false_var = false_var
+        self._live = [] if false_var is not None else None
+
+    def set_live(self, t, mask: bytearray):
+        while len(self._live) <= t:
+            self._live.append(None)
+        self._live[t] = mask
+
+    def __getitem__(self, key):
+        c, x, y, t = key
+        offset = self._offsets[c] + x * self._width + y
+        if self._live is not None and not self._live[t][offset]:
+            return self._false_var
+        return self._bases[t] + offset
+
+    def __contains__(self, key):
+        c, x, y, t = key
+        if t >= len(self._bases):
+            return False
+        offset = self._offsets[c] + x * self._width + y
+        return self._live is None or bool(self._live[t][offset])
+
+    def block(self, c, times):
+        """Literals of color c as a (len(times), H*W) array, pruned cells false."""
+        offset = self._offsets[c]
+        lits = _layer_block(self._bases, offset, self._cells, times)
+        if self._live is None:
+            return lits
+        live = np.stack(
+            [
+                np.frombuffer(self._live[t], dtype=np.uint8)[offset : offset + self._cells]
+                for t in times
+            ]
+        ).reshape(lits.shape)
+        return np.where(live != 0, lits, self._false_var)
+
+
+class LaserVariables:
+    """laser_var[c, x, y, t] view over the factory layout."""
+
+    def __init__(self, var_factory: VariableFactory):
+        self._bases = var_factory._layer_bases
+        self._offsets = var_factory._laser_offsets
+        self._width = var_factory.width
+        self._cells = var_factory.height * var_factory.width
+
+    def __getitem__(self, key):
+        c, x, y, t = key
+        return self._bases[t] + self._offsets[c] + x * self._width + y
+
+    def block(self, c, times):
+        """Literals of color c as a (len(times), H*W) array."""
+        return _layer_block(self._bases, self._offsets[c], self._cells, times)
+
+
+class BeamVariables:
+    """beam_var[c, d, x, y, t] view over the factory layout."""
+
+    def __init__(self, var_factory: VariableFactory):
+        self._bases = var_factory._layer_bases
+        self._offsets = var_factory._beam_offsets
+        self._width = var_factory.width
+        self._cells = var_factory.height * var_factory.width
+
+    def __getitem__(self, key):
+        c, d, x, y, t = key
+        return self._bases[t] + self._offsets[c, d] + x * self._width + y
+
+    def block(self, c, d, times):
+        """Literals of beam (c, d) as a (len(times), H*W) array."""
+        return _layer_block(self._bases, self._offsets[c, d], self._cells, times)
+
+
+def _layer_block(bases, offset, cells, times):
+    """bases[t] + offset + cell for every t in times and every cell index."""
+    layer = np.array([bases[t] for t in times], dtype=np.int64).reshape(-1, 1)
+    return layer + (offset + np.arange(cells, dtype=np.int64))
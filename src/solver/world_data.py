@@ -8,11 +8,14 @@ imports lle directly — it only depends on this module.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Protocol, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Protocol, Tuple
 
 Position = Tuple[int, int]
 
+# LLE's direction letters, as used in laser cells like "L0E".
+_DIRECTION_DELTAS = {"N": (-1, 0), "S": (1, 0), "E": (0, 1), "W": (0, -1)}
+
 
 @dataclass(frozen=True)
 class AgentData:
@@ -68,3 +71,95 @@ class WorldData(Protocol):
         ...
 
     def is_wall(self, pos: Position) -> bool: ...
+
+
+@dataclass(frozen=True)
+class WorldSnapshot:
+    """
+    Plain, immutable WorldData.
+
+    Holds nothing but tuples, so it pickles cheaply and can be shipped to
+    worker processes, unlike an adapter around a live lle.World. The wall
+    set and the neighbor table are computed once, at construction.
+    """
+
+    width: int
+    height: int
+    agents: Tuple[AgentData, ...]
+    laser_sources: Tuple[LaserSourceData, ...]
+    exit_positions: Tuple[Position, ...]
+    wall_positions: Tuple[Position, ...]
+    _wall_set: FrozenSet[Position] = field(init=False, repr=False, compare=False)
+    _neighbors: Dict[Position, Tuple[Position, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        object.__setattr__(self, "_wall_set", frozenset(self.wall_positions))
+        neighbors = {}
+        for i in range(self.height):
+            for j in range(self.width):
+                neighbors[i, j] = tuple(
+                    (i + di, j + dj)
+                    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                    if 0 <= i + di < self.height and 0 <= j + dj < self.width
+                )
+        object.__setattr__(self, "_neighbors", neighbors)
+
+    @classmethod
+    def from_world(cls, world: WorldData) -> "WorldSnapshot":
+        return cls(
+            width=world.width,
+            height=world.height,
+            agents=tuple(world.agents),
+            laser_sources=tuple(world.laser_sources),
+            exit_positions=tuple(world.exit_positions),
+            wall_positions=tuple(world.wall_positions),
+        )
+
+    @classmethod
+    def from_layout(cls, layout, height: int, width: int) -> "WorldSnapshot":
+        """
+        The world a generator layout describes, without building an lle.World.
+
+        layout has agents, exits and walls as positions and lasers as
+        (color, position, direction) triples, the direction an LLE letter
+        or an enum whose value is one. Components are listed the way LLE
+        lists them once parsed: agents by color, the rest in row-major
+        order, laser sources among the walls. So the snapshot equals the
+        one of the built world, as long as LLE accepts the layout.
+        """
+        lasers = sorted(layout.lasers, key=lambda laser: laser[1])
+        return cls(
+            width=width,
+            height=height,
+            agents=tuple(
+                AgentData(color=color, position=tuple(pos))
+                for color, pos in enumerate(layout.agents)
+            ),
+            laser_sources=tuple(
+                LaserSourceData(
+                    color=color,
+                    direction=_DIRECTION_DELTAS[getattr(direction, "value", direction)],
+                    position=tuple(pos),
+                )
+                for color, pos, direction in lasers
+            ),
+            exit_positions=tuple(sorted(tuple(pos) for pos in layout.exits)),
+            wall_positions=tuple(
+                sorted(tuple(pos) for pos in [*layout.walls, *(p for _, p, _ in lasers)])
+            ),
+        )
+
+    def all_positions(self) -> List[Position]:
+        return list(self._neighbors)
+
+    def is_within_bounds(self, pos: Position) -> bool:
+        i, j = pos
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def get_neighbors(self, pos: Position) -> List[Position]:
+        return list(self._neighbors[pos])
+
+    def is_wall(self, pos: Position) -> bool:
+        return pos in self._wall_set
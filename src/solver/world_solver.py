@@ -1,28 +1,52 @@
 import time
 
+import numpy as np
 from lle import Action
-from pysat.solvers import Minisat22
 
+from .backends import (
+    DEFAULT_SOLVER_BACKEND,
+    canonical_backend,
+    new_solver,
+    solver_stats,
+)
+from .budget import SolveBudget
+from .cnf_cache import CNFCache, world_fingerprint
 from .constraints import (
     ConstraintContext,
     InitializationConstraints,
     LaserConstraints,
     MovementConstraints,
 )
-from .constraints.movements import METHOD_LOCAL
-from .model import SATModel
+from .constraints.cardinality import AMO_PAIRWISE
+from .constraints.lasers import LASER_BEAM
+from .constraints.movements import COLLISION_PAIRWISE, METHOD_LOCAL
+from .model import SATModel, SolverSink
 from .profiler import SolverProfiler
 from .variables import VariableFactory
 from .world_data import WorldData
 
 
 class WorldSolver:
+    # Whether T_MAX stays put after construction, which allows pruning agent
+    # variables that could no longer reach an exit in time.
+    fixed_horizon = True
+
     def __init__(
         self,
         world: WorldData,
         T_MAX=10,
         enable_profiling=False,
         movement_method=METHOD_LOCAL,
+        prune=True,
+        vectorized=False,
+        streaming=False,
+        amo_encoding=AMO_PAIRWISE,
+        collision_encoding=COLLISION_PAIRWISE,
+        laser_encoding=LASER_BEAM,
+        solver_backend=DEFAULT_SOLVER_BACKEND,
+        seed=None,
+        budget: SolveBudget | None = None,
+        cnf_cache: CNFCache | None = None,
     ):
         self.world = world
         self.T_MAX = T_MAX
@@ -31,22 +55,122 @@ class WorldSolver:
         self.enable_profiling = enable_profiling
         self.profiler = SolverProfiler() if enable_profiling else None
         self.movement_method = movement_method
+        self.amo_encoding = amo_encoding
+        self.collision_encoding = collision_encoding
+        self.laser_encoding = laser_encoding
+        self.solver_backend = canonical_backend(solver_backend)
+        # Diversifies the search without changing the formula: clauses reach
+        # the solver in a seeded order (stored builds only) and every variable
+        # starts from a seeded random phase.
+        self.seed = seed
+        # Per-call limits; solve() then answers None once they run out.
+        self.budget = budget
+        # Built models are loaded from / saved to this cache; a hit skips
+        # encoding. Caching needs the stored model, so it overrides streaming.
+        self.cnf_cache = cnf_cache
+
+        self.prune = prune
+        self.vectorized = vectorized
+        # Streaming builds write clauses into a live solver as they are
+        # generated; self.model then stays empty.
+        self.streaming = streaming
+        self._solver = None
+        self._sink = None
 
-        self.ctx = ConstraintContext(world, self.var, T_MAX)
+        self.ctx = ConstraintContext(
+            world,
+            self.var,
+            T_MAX,
+            prune=prune,
+            fixed_horizon=self.fixed_horizon,
+            vectorized=vectorized,
+            beam_variables=laser_encoding == LASER_BEAM,
+        )
 
         self.constraints = [
             InitializationConstraints(self.ctx),
-            MovementConstraints(self.ctx, movement_method=movement_method),
-            LaserConstraints(self.ctx),
+            self._movement_constraints(),
+            self._laser_constraints(),
         ]
         self._model_built = False
 
+    def _movement_constraints(self):
+        return MovementConstraints(
+            self.ctx,
+            movement_method=self.movement_method,
+            amo_encoding=self.amo_encoding,
+            collision_encoding=self.collision_encoding,
+        )
+
+    def _laser_constraints(self):
+        """Laser rules of this solver variant."""
+        return LaserConstraints(self.ctx, self.laser_encoding)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Release the live solver of a streaming or incremental build."""
+        if self._solver is not None:
+            self._solver.delete()
+            self._solver = None
+            self._sink = None
+
     def build_model(self):
         if self._model_built:
             return
 
+        if self.cnf_cache is not None:
+            key = self.cnf_cache.key(self.encoding_signature())
+            if not self._load_cached_model(key):
+                self._encode_constraints()
+                self.cnf_cache.store(key, self.model, self.var.num_vars)
+            self._model_built = True
+            return
+
+        if self.streaming:
+            self._solver = new_solver(self.solver_backend)
+            self._sink = SolverSink(self._solver)
+        self._encode_constraints()
+        self._model_built = True
+
+    def encoding_signature(self) -> dict:
+        """Everything the clauses and their variable numbering depend on."""
+        return {
+            "variant": type(self).__name__,
+            "world": world_fingerprint(self.world),
+            "T_MAX": self.T_MAX,
+            "movement_method": self.movement_method,
+            "amo_encoding": self.amo_encoding,
+            "collision_encoding": self.collision_encoding,
+            "laser_encoding": self.laser_encoding,
+            "prune": self.prune,
+            "vectorized": self.vectorized,
+        }
+
+    def _load_cached_model(self, key) -> bool:
+        start_time = time.perf_counter()
+        cached = self.cnf_cache.load(key)
+        if cached is None:
+            return False
+        self.model = cached.model
+        # Auxiliary variables of the encodings are numbered past the layers.
+        if cached.num_vars > self.var.num_vars:
+            self.var.fresh(cached.num_vars - self.var.num_vars)
+        if self.profiler:
+            self.profiler.set_cache_load(
+                time.perf_counter() - start_time, len(self.model)
+            )
+        return True
+
+    def _encode_constraints(self):
+        """Append the clauses of every constraint to the model, or stream them."""
         for constraint in self.constraints:
             constraint_name = constraint.__class__.__name__
+            constraint.sink = self._sink
 
             if self.profiler:
                 with self.profiler.start_constraint(
@@ -58,21 +182,58 @@ class WorldSolver:
             else:
                 self.model.extend(constraint.generate())
 
-        self._model_built = True
-
     def solve(self):
         self.build_model()
-        with Minisat22(bootstrap_with=self.model.cnf.clauses) as solver:
-            start_solve_time = time.perf_counter()
-            result = solver.solve()
-            solve_time = time.perf_counter() - start_solve_time
-            model = solver.get_model() if result else None
+        if self._solver is not None:
+            result, model, solve_time = self._run_solver(self._solver)
+        else:
+            with new_solver(
+                self.solver_backend, bootstrap_with=self._ordered_clauses()
+            ) as solver:
+                result, model, solve_time = self._run_solver(solver)
 
         if self.profiler:
             self.profiler.set_solve_results(solve_time, result)
 
         return result, model
 
+    def _ordered_clauses(self):
+        if self.seed is None:
+            return self.model.iter_clauses()
+        order = np.random.default_rng(self.seed).permutation(len(self.model))
+        return (self.model.clause(i) for i in order)
+
+    def _randomize_phases(self, solver):
+        rng = np.random.default_rng([self.seed, 1])
+        num_vars = self.var.num_vars
+        signs = rng.choice(np.array([-1, 1]), size=num_vars)
+        try:
+            solver.set_phases((np.arange(1, num_vars + 1) * signs).tolist())
+        except NotImplementedError:
+            pass
+
+    def _run_solver(self, solver, assumptions=()):
+        if self.seed is not None:
+            self._randomize_phases(solver)
+        stats_before = solver_stats(solver) if self.profiler else None
+        start_solve_time = time.perf_counter()
+        if self.budget is None or self.budget.unlimited:
+            result = solver.solve(assumptions=assumptions)
+        else:
+            result = self.budget.run(solver, assumptions)
+        solve_time = time.perf_counter() - start_solve_time
+        model = solver.get_model() if result else None
+        if self.profiler:
+            # Live solvers accumulate statistics across calls; keep this call's.
+            stats = {
+                key: value - stats_before.get(key, 0)
+                for key, value in solver_stats(solver).items()
+            }
+            self.profiler.add_backend_solve(
+                self.solver_backend, solve_time, result, stats
+            )
+        return result, model, solve_time
+
     def get_profiling_data(self):
         return self.profiler.to_dict() if self.profiler else None
 
@@ -91,45 +252,81 @@ class WorldSolver:
             name = self.var.name(lit)
             print(f"{'-' if lit < 0 else ''}{name}")
 
-    def extract_plan(self, model):
+    def decode_positions(self, model, T=None) -> np.ndarray:
+        """
+        Agent positions as an (A, T + 1, 2) int array, agents ordered by color.
+
+        Only the agent block is read: the position at t + 1 is one of the few
+        cells around the one at t, so each step costs a handful of lookups
+        into the model (model[v - 1] is the literal of variable v), O(A * T)
+        overall. T defaults to T_MAX.
+        """
+        T = self.T_MAX if T is None else T
+        agents = sorted(self.ctx.agents, key=lambda entry: entry[0].color)
+        agent_var = self.ctx.agent_var
+        false_var = self.ctx.false_var
+        neighbor_map = self.ctx.neighbor_map
+        num_lits = len(model)
+
+        positions = np.empty((len(agents), T + 1, 2), dtype=np.int64)
+        for a, (agent, pos) in enumerate(agents):
+            c = agent.color
+            positions[a, 0] = pos
+            for t in range(1, T + 1):
+                for x, y in neighbor_map[pos]:
+                    var = agent_var[c, x, y, t]
+                    if var != false_var and var <= num_lits and model[var - 1] > 0:
+                        pos = (x, y)
+                        break
+                else:
+                    raise ValueError(f"No position for agent {c} at t={t}")
+                positions[a, t] = pos
+        return positions
+
+    def decode_trajectories(self, model, T=None) -> tuple[np.ndarray, np.ndarray]:
+        """(A, T + 1, 2) positions and the (A, T) lle.Action values between them."""
+        positions = self.decode_positions(model, T)
+        return positions, actions_from_positions(positions)
+
+    def extract_positions(self, model, T=None):
+        """Returns {color: {t: (x, y)}} for t in 0..T (T defaults to T_MAX)."""
+        positions = self.decode_positions(model, T)
+        colors = sorted(agent.color for agent, _ in self.ctx.agents)
+        return {
+            color: {t: (int(x), int(y)) for t, (x, y) in enumerate(path)}
+            for color, path in zip(colors, positions)
+        }
+
+    def extract_plan(self, model, T=None):
         """
         Returns:
             list of tuples, each of length (#agents),
-            containing lle.Action enums.
+            containing lle.Action enums. T defaults to T_MAX.
         """
-        positions = {}
-        for lit in model:
-            if lit <= 0:
-                continue
-            obj = self.var.pool.obj(abs(lit))
-            if not obj or obj[0] != "agent":
-                continue
-            _, color, (x, y), t = obj
-            positions.setdefault(color, {})[t] = (x, y)
-
-        agent_colors = sorted(positions.keys())
-
-        plan = []
-        for t in range(self.T_MAX):
-            timestep_actions = []
-            for color in agent_colors:
-                x1, y1 = positions[color][t]
-                x2, y2 = positions[color][t + 1]
-                dx, dy = x2 - x1, y2 - y1
-                if dx == 0 and dy == 0:
-                    action = Action.STAY
-                elif dx == -1 and dy == 0:
-                    action = Action.NORTH
-                elif dx == 1 and dy == 0:
-                    action = Action.SOUTH
-                elif dx == 0 and dy == -1:
-                    action = Action.WEST
-                elif dx == 0 and dy == 1:
-                    action = Action.EAST
-                else:
-                    raise ValueError(
-                        f"Invalid movement for agent {color} at t={t}->{t + 1}"
-                    )
-                timestep_actions.append(action)
-            plan.append(tuple(timestep_actions))
-        return plan
+        _, actions = self.decode_trajectories(model, T)
+        return plan_from_actions(actions)
+
+
+# _ACTION_CODES[dx + 1, dy + 1] is the lle.Action value of a move by (dx, dy).
+_ACTION_CODES = np.full((3, 3), -1, dtype=np.int64)
+for _action in Action.variants():
+    _ACTION_CODES[_action.delta[0] + 1, _action.delta[1] + 1] = _action.value
+
+
+def actions_from_positions(positions: np.ndarray) -> np.ndarray:
+    """(A, T) lle.Action values of the moves in an (A, T + 1, 2) position array."""
+    deltas = np.diff(positions, axis=1)
+    if deltas.size and np.abs(deltas).max() > 1:
+        a, t = np.argwhere(np.abs(deltas).max(axis=2) > 1)[0]
+        raise ValueError(f"Invalid movement for agent {a} at t={t}->{t + 1}")
+    actions = _ACTION_CODES[deltas[..., 0] + 1, deltas[..., 1] + 1]
+    if (actions < 0).any():
+        a, t = np.argwhere(actions < 0)[0]
+        raise ValueError(f"Invalid movement for agent {a} at t={t}->{t + 1}")
+    return actions
+
+
+def plan_from_actions(actions: np.ndarray) -> list[tuple[Action, ...]]:
+    """One tuple of lle.Action per step from an (A, T) action value array."""
+    variants = Action.variants()
+    return [tuple(variants[code] for code in step) for step in actions.T.tolist()]
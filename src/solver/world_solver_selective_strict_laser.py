@@ -1,26 +1,19 @@
-from .constraints import (
-    InitializationConstraints,
-    MovementConstraints,
-    SelectiveStrictLaserConstraints,
-)
-from .constraints.movements import METHOD_LOCAL
+from .constraints import SelectiveStrictLaserConstraints
 from .world_data import WorldData
 from .world_solver import WorldSolver
 
 
 class WorldSolverSelectiveStrictLaser(WorldSolver):
-    def __init__(
-        self,
-        world: WorldData,
-        strict_colors,
-        T_MAX=10,
-        enable_profiling=False,
-        movement_method=METHOD_LOCAL,
-    ):
-        super().__init__(world, T_MAX, enable_profiling, movement_method)
+    def __init__(self, world: WorldData, strict_colors, T_MAX=10, **kwargs):
         self.strict_colors = frozenset(strict_colors)
-        self.constraints = [
-            InitializationConstraints(self.ctx),
-            MovementConstraints(self.ctx, movement_method=movement_method),
-            SelectiveStrictLaserConstraints(self.ctx, self.strict_colors),
-        ]
+        super().__init__(world, T_MAX, **kwargs)
+
+    def _laser_constraints(self):
+        return SelectiveStrictLaserConstraints(
+            self.ctx, self.strict_colors, self.laser_encoding
+        )
+
+    def encoding_signature(self):
+        return dict(
+            super().encoding_signature(), strict_colors=sorted(self.strict_colors)
+        )
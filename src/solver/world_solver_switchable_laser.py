@@ -0,0 +1,79 @@
+from .backends import new_solver
+from .constraints import SwitchableLaserConstraints
+from .world_data import WorldData
+from .world_solver import WorldSolver
+
+
+class WorldSolverSwitchableLaser(WorldSolver):
+    """
+    One warm solver for the normal, strict and selective strict variants.
+
+    The laser rules of every color are switched by selector literals (see
+    SwitchableLaserConstraints), so each variant is a solve(assumptions=...)
+    call on the same live solver: the shared initialization and movement
+    clauses are encoded once and learnt clauses carry over between queries.
+
+    After an UNSAT answer, last_core holds the colors whose strict selectors
+    appear in the solver's core. Strictness only removes plans once every
+    selector is assumed, so strictness of those colors alone already makes
+    the query UNSAT. A SAT plan tells which colors' selective strict rules
+    it happens to satisfy (strict_colors_in), which answers their checks too.
+    """
+
+    def __init__(self, world: WorldData, T_MAX=10, **kwargs):
+        super().__init__(world, T_MAX, **kwargs)
+        self.last_core = None
+
+    def _laser_constraints(self):
+        self.lasers = SwitchableLaserConstraints(self.ctx, self.laser_encoding)
+        return self.lasers
+
+    @property
+    def laser_colors(self) -> frozenset[int]:
+        return frozenset(self.lasers.nonblocking)
+
+    def build_model(self):
+        if self._solver is not None:
+            return
+        super().build_model()
+        if self._solver is None:
+            self._solver = new_solver(
+                self.solver_backend, bootstrap_with=self._ordered_clauses()
+            )
+
+    def solve(self, nonblocking=(), vulnerable=()):
+        """Solve with the given colors' strict rules switched on."""
+        self.build_model()
+        assumptions = self.lasers.assumptions(nonblocking, vulnerable)
+        result, model, solve_time = self._run_solver(self._solver, assumptions)
+        self.last_core = None
+        if result is False:
+            self.last_core = self.lasers.colors_of(self._solver.get_core() or [])
+
+        if self.profiler:
+            self.profiler.set_solve_results(solve_time, result)
+
+        return result, model
+
+    def solve_strict(self):
+        """WorldSolverStrictLaser's question: no agent blocks its own beam."""
+        return self.solve(nonblocking=self.laser_colors)
+
+    def solve_selective(self, strict_colors):
+        """WorldSolverSelectiveStrictLaser's question for strict_colors."""
+        return self.solve(nonblocking=strict_colors, vulnerable=strict_colors)
+
+    def strict_colors_in(self, model) -> frozenset[int]:
+        """Agent colors whose selective strict rules the model's plan satisfies.
+
+        A color's selective strict rules hold when no agent ever stands on
+        the full rays of its lasers, read from the decoded positions rather
+        than from the selectors, which the query pinned. Colors without a
+        laser have no strict rule and always count.
+        """
+        rays = {}
+        for laser, ray in self.ctx.laser_rays:
+            rays.setdefault(laser.color, set()).update(ray)
+        visited = set(map(tuple, self.decode_positions(model).reshape(-1, 2).tolist()))
+        colors = {agent.color for agent, _ in self.ctx.agents}
+        return frozenset(c for c in colors if not rays.get(c, set()) & visited)
@@ -0,0 +1,70 @@
+from collections import Counter
+from itertools import product
+
+import pytest
+from lle import World
+from pysat.solvers import Minisat22
+
+from solver import LLEAdapter, WorldSolver
+from solver.constraints.cardinality import AMO_ENCODINGS, at_most_one
+from solver.constraints.movements import METHOD_GLOBAL, METHOD_LOCAL
+
+
+def _fresh_from(first):
+    counter = [first]
+
+    def fresh(count=1):
+        var = counter[0]
+        counter[0] += count
+        return var
+
+    return fresh
+
+
+@pytest.mark.parametrize("encoding", AMO_ENCODINGS)
+@pytest.mark.parametrize("n", [1, 2, 5, 7, 10])
+def test_at_most_one_accepts_exactly_the_assignments_with_one_true_literal(
+    encoding, n
+):
+    lits = list(range(1, n + 1))
+    clauses = list(at_most_one(lits, encoding, _fresh_from(n + 1)))
+
+    with Minisat22(bootstrap_with=clauses) as solver:
+        for values in product([False, True], repeat=n):
+            assumptions = [lit if value else -lit for lit, value in zip(lits, values)]
+            assert solver.solve(assumptions=assumptions) == (sum(values) <= 1)
+
+
+def test_at_most_one_rejects_unknown_encodings():
+    with pytest.raises(ValueError, match="Unknown AMO encoding"):
+        list(at_most_one([1, 2], "nope", _fresh_from(3)))
+
+
+@pytest.mark.parametrize("encoding", AMO_ENCODINGS)
+@pytest.mark.parametrize("level,t", [(1, 9), (1, 10), (3, 9), (3, 10)])
+def test_global_method_gives_the_same_answer_with_every_encoding(encoding, level, t):
+    world = World.level(level)
+    world.reset()
+    reference = WorldSolver(LLEAdapter(world), T_MAX=t, movement_method=METHOD_GLOBAL)
+    solver = WorldSolver(
+        LLEAdapter(world),
+        T_MAX=t,
+        movement_method=METHOD_GLOBAL,
+        amo_encoding=encoding,
+    )
+
+    assert bool(solver.solve()[0]) == bool(reference.solve()[0])
+
+
+@pytest.mark.parametrize("movement_method", [METHOD_LOCAL, METHOD_GLOBAL])
+@pytest.mark.parametrize("level", [1, 3, 6])
+def test_encoding_has_no_duplicate_clauses(movement_method, level):
+    world = World.level(level)
+    world.reset()
+    solver = WorldSolver(
+        LLEAdapter(world), T_MAX=8, movement_method=movement_method, prune=False
+    )
+    solver.build_model()
+
+    counts = Counter(tuple(sorted(c)) for c in solver.model.iter_clauses())
+    assert max(counts.values()) == 1
@@ -29,6 +29,24 @@ def test_constructive_generator_produces_satisfiable_worlds(seed):
     assert generator.last_attempts <= generator.max_attempts
 
 
+def test_constructive_generator_evaluates_candidates_in_parallel():
+    generator = ConstructiveSolvableGenerator(
+        size=(6, 6),
+        agents=2,
+        lasers=1,
+        num_walls=6,
+        t_max=8,
+        max_attempts=50,
+        seed=0,
+        workers=2,
+    )
+
+    world = generator.generate()
+
+    assert is_satisfiable(world, generator.t_max)
+    assert generator.last_attempts <= generator.max_attempts
+
+
 @pytest.mark.parametrize(
     "rows,cols,agents,lasers,num_walls,t_max",
     [
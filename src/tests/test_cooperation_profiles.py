@@ -2,7 +2,16 @@ import pytest
 from lle import World
 
 from generators.world_builder import Direction, WorldBuilder
-from solver import CooperationProfileAnalyzer, CooperationProfileResult, LLEAdapter
+from solver import (
+    CooperationProfileAnalyzer,
+    CooperationProfileResult,
+    LLEAdapter,
+    SolveBudget,
+    WorldSolver,
+    WorldSolverSelectiveStrictLaser,
+    WorldSolverSwitchableLaser,
+)
+from levels import LLE_LEVELS
 
 
 def analyze(world: World, t: int):
@@ -70,6 +79,234 @@ def test_lle_levels_have_expected_profile_signals(
     assert result.dependency_edges == expected_edges
 
 
+@pytest.mark.parametrize("backend", ["glucose4", "cadical195"])
+@pytest.mark.parametrize("level", [3, 4])
+def test_analyzer_answers_do_not_depend_on_the_backend(level, backend):
+    world = World.level(level)
+    world.reset()
+    expected = analyze(world, 10)
+    result = CooperationProfileAnalyzer(
+        LLEAdapter(world), T_MAX=10, solver_backend=backend
+    ).analyze()
+
+    assert result.cooperation_required == expected.cooperation_required
+    assert result.necessary_helpers == expected.necessary_helpers
+
+
+@pytest.mark.parametrize("level", [1, 3, 4, 5, 6])
+def test_shared_encoding_answers_like_separate_solvers(level):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    adapted = LLEAdapter(world)
+
+    shared = CooperationProfileAnalyzer(adapted, T_MAX=t).analyze()
+    separate = CooperationProfileAnalyzer(
+        adapted, T_MAX=t, shared_encoding=False
+    ).analyze()
+
+    assert shared.solvable == separate.solvable
+    assert shared.cooperation_required == separate.cooperation_required
+    assert shared.necessary_helpers == separate.necessary_helpers
+
+
+# Same-color lasers facing different ways, where a free strictness selector
+# used to let the shared solver answer "normal or strict".
+_SAME_COLOR_WORLDS = [
+    """
+    S0  .  .   .  .
+    L0W .  L0S .  .
+    .   .  .   .  .
+    .   .  .   .  X
+    """,
+    """
+    .   .   X   .
+    S2  S1  .   .
+    .   .   .   .
+    L2E .   L2N .
+    .   S0  X   X
+    """,
+    """
+    .   .   .   S2  L1S
+    L2S .   .   .   S1
+    .   S0  .   X   X
+    .   @   .   @   .
+    .   L2E .   .   X
+    """,
+]
+
+
+@pytest.mark.parametrize("helper_search", ["linear", "group"])
+@pytest.mark.parametrize("world_str", _SAME_COLOR_WORLDS)
+def test_shared_encoding_answers_like_separate_solvers_on_same_color_lasers(
+    world_str, helper_search
+):
+    world = World(world_str)
+    world.reset()
+    adapted = LLEAdapter(world)
+    shared = CooperationProfileAnalyzer(
+        adapted, T_MAX=8, helper_search=helper_search
+    ).analyze()
+    separate = CooperationProfileAnalyzer(
+        adapted, T_MAX=8, helper_search=helper_search, shared_encoding=False
+    ).analyze()
+
+    assert bool(shared.solvable) == bool(WorldSolver(adapted, T_MAX=8).solve()[0])
+    assert shared.solvable == separate.solvable
+    assert shared.cooperation_required == separate.cooperation_required
+    assert shared.necessary_helpers == separate.necessary_helpers
+
+
+def test_shared_encoding_prunes_helper_checks(monkeypatch):
+    world, t = LLE_LEVELS[6]
+    world.reset()
+    queries = []
+    solve_selective = WorldSolverSwitchableLaser.solve_selective
+
+    def counting(self, strict_colors):
+        queries.append(strict_colors)
+        return solve_selective(self, strict_colors)
+
+    monkeypatch.setattr(WorldSolverSwitchableLaser, "solve_selective", counting)
+    result = CooperationProfileAnalyzer(LLEAdapter(world), T_MAX=t).analyze()
+
+    assert result.necessary_helpers
+    assert len(queries) < len(world.start_pos)
+
+
+
+_TARGETS = [
+    "any",
+    "independent",
+    "cooperative",
+    "asymmetric",
+    "mutual",
+    "chain",
+    "distributed",
+    "fully_coupled",
+]
+
+
+@pytest.mark.parametrize("level", [1, 3, 4, 6])
+def test_lazy_profile_matches_like_the_eager_result(level):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    analyzer = CooperationProfileAnalyzer(LLEAdapter(world), T_MAX=t)
+    expected = analyzer.analyze()
+
+    for target in _TARGETS:
+        with analyzer.lazy() as profile:
+            assert profile.matches_profile(target) == expected.matches_profile(target)
+            assert profile.result() == expected
+
+
+@pytest.mark.parametrize("level", [1, 3, 6])
+def test_cooperative_filtering_costs_at_most_two_solves(monkeypatch, level):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    calls = []
+    solve = WorldSolverSwitchableLaser.solve
+
+    def counting(self, *args, **kwargs):
+        calls.append(args or kwargs)
+        return solve(self, *args, **kwargs)
+
+    monkeypatch.setattr(WorldSolverSwitchableLaser, "solve", counting)
+    with CooperationProfileAnalyzer(LLEAdapter(world), T_MAX=t).lazy() as profile:
+        matched = profile.matches_profile("cooperative")
+        assert len(calls) <= 2
+        assert matched == profile.result().cooperation_required
+
+
+def test_lazy_rejection_only_describes_facts_already_read():
+    world, t = LLE_LEVELS[6]
+    world.reset()
+    with CooperationProfileAnalyzer(LLEAdapter(world), T_MAX=t).lazy() as profile:
+        assert not profile.matches_profile("independent")
+        assert not profile.undecided
+        assert profile.describe() == "solvable=True, cooperation_required=True"
+        assert "necessary_helpers" not in vars(profile)
+        assert "profile" not in vars(profile)
+
+
+def test_lazy_profile_rejects_unknown_targets():
+    world = World.level(1)
+    world.reset()
+    with CooperationProfileAnalyzer(LLEAdapter(world), T_MAX=10).lazy() as profile:
+        with pytest.raises(ValueError, match="Unknown cooperation profile"):
+            profile.matches_profile("bogus")
+        assert "solvable" not in vars(profile)
+
+def _corridor_world(num_agents):
+    """Agents cross a beam of color 0 that only agent 0 can hold back."""
+    lasers = [(0, (1, num_agents + 1), Direction.WEST)]
+    return build_world(
+        num_agents + 2,
+        4,
+        agents=[(0, c) for c in range(num_agents)],
+        exits=[(3, c) for c in range(num_agents)],
+        lasers=lasers,
+    )
+
+
+@pytest.mark.parametrize("shared_encoding", [True, False])
+@pytest.mark.parametrize("level", [1, 3, 4, 5, 6])
+def test_group_search_finds_the_same_helpers(level, shared_encoding):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    results = [
+        CooperationProfileAnalyzer(
+            LLEAdapter(world),
+            T_MAX=t,
+            shared_encoding=shared_encoding,
+            helper_search=search,
+        ).analyze()
+        for search in ("linear", "group")
+    ]
+
+    assert results[0].necessary_helpers == results[1].necessary_helpers
+
+
+def test_group_search_needs_fewer_solves_with_few_helpers(monkeypatch):
+    adapted = LLEAdapter(_corridor_world(12))
+    calls = []
+    solve = WorldSolverSelectiveStrictLaser.solve
+
+    def counting(self):
+        calls.append(self.strict_colors)
+        return solve(self)
+
+    monkeypatch.setattr(WorldSolverSelectiveStrictLaser, "solve", counting)
+    solves = {}
+    for search in ("linear", "group"):
+        calls.clear()
+        result = CooperationProfileAnalyzer(
+            adapted, T_MAX=18, shared_encoding=False, helper_search=search
+        ).analyze()
+        assert result.necessary_helpers == frozenset({0})
+        solves[search] = len(calls)
+
+    assert solves["linear"] == 12
+    assert solves["group"] < solves["linear"]
+
+
+def test_unknown_helper_search_is_rejected():
+    with pytest.raises(ValueError, match="Unknown helper search"):
+        CooperationProfileAnalyzer(None, helper_search="bisect")
+
+
+def test_exhausted_budget_gives_an_unknown_profile():
+    world = World.level(5)
+    world.reset()
+    result = CooperationProfileAnalyzer(
+        LLEAdapter(world), T_MAX=19, budget=SolveBudget(conflicts=5)
+    ).analyze()
+
+    assert result.profile == "unknown"
+    assert result.solvable is None
+    assert not result.matches_profile("any")
+    assert not result.matches_profile("independent")
+
+
 def test_lle_level_4_has_expected_coupling_metrics():
     result = analyze(World.level(4), 10)
 
@@ -96,3 +96,12 @@ def test_cooperation_lle_levels(level, expected):
     world, t = LLE_LEVELS[level]
     result = cooperation_needed(world, t)
     assert result == expected
+
+
+@pytest.mark.parametrize("backend", ["glucose4", "cadical195"])
+@pytest.mark.parametrize("level", [2, 3])
+def test_cooperation_lle_levels_on_other_backends(level, backend):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    result = CooperationSolver(LLEAdapter(world), T_MAX=t, solver_backend=backend)
+    assert result.analyze().cooperation_needed == cooperation_needed(world, t)
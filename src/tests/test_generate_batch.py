@@ -0,0 +1,60 @@
+from lle import World
+
+from cli import build_parser
+from generators.batch import JsonlLevelWriter, generate_levels, read_levels
+
+
+def _args(*extra):
+    return build_parser().parse_args(
+        ["-n", "3", *extra, "random_solvable", "--size", "5", "5", "--seed", "7"]
+    )
+
+
+def test_batch_levels_do_not_depend_on_the_worker_count():
+    serial = list(generate_levels(_args(), workers=1))
+    parallel = sorted(generate_levels(_args(), workers=2), key=lambda l: l.index)
+
+    assert parallel == serial
+    assert [level.seed for level in serial] == [7, 8, 9]
+    assert all(World(level.world).world_string == level.world for level in serial)
+
+
+def test_batch_level_i_is_the_single_level_of_seed_plus_i():
+    # Pins the per-level seeds: -n 3 --seed 7 draws levels 7, 8 and 9, not
+    # three levels from one random stream seeded with 7.
+    levels = list(generate_levels(_args(), workers=1))
+
+    for i, level in enumerate(levels):
+        args = build_parser().parse_args(
+            ["random_solvable", "--size", "5", "5", "--seed", str(7 + i)]
+        )
+        assert level.world == next(generate_levels(args)).world
+
+
+def test_jsonl_writer_appends_sharded_records(tmp_path):
+    levels = list(generate_levels(_args(), workers=1))
+    with JsonlLevelWriter(tmp_path, shard_size=2) as writer:
+        for level in levels:
+            writer.write(level)
+
+    shards = sorted(path.name for path in tmp_path.glob("*.jsonl"))
+    assert shards == ["levels-00000.jsonl", "levels-00001.jsonl"]
+    assert read_levels(tmp_path) == levels
+
+
+def test_jsonl_runs_never_reuse_shards_or_indices(tmp_path):
+    with JsonlLevelWriter(tmp_path, shard_size=1) as writer:
+        for level in generate_levels(_args(), workers=1):
+            writer.write(level)
+    (tmp_path / "levels-00001.jsonl").unlink()
+    before = {path.name: path.read_text() for path in tmp_path.glob("*.jsonl")}
+
+    with JsonlLevelWriter(tmp_path, shard_size=1) as writer:
+        assert writer.next_index == 3
+        for level in generate_levels(_args(), workers=1, start_index=writer.next_index):
+            writer.write(level)
+
+    for name, text in before.items():
+        assert (tmp_path / name).read_text() == text
+    assert (tmp_path / "levels-00003.jsonl").exists()
+    assert [level.index for level in read_levels(tmp_path)] == [0, 2, 3, 4, 5]
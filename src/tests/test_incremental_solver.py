@@ -0,0 +1,82 @@
+import pytest
+from lle import World
+
+from generators.world_builder import Direction, WorldBuilder
+from solver import IncrementalWorldSolver, LLEAdapter, WorldSolver
+
+N, S, E, W = Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST
+
+
+def _world(width, height, agents=(), exits=(), walls=(), lasers=()):
+    """Build an lle.World from components using WorldBuilder."""
+    b = WorldBuilder(width, height)
+    for idx, pos in enumerate(agents):
+        b.add_agent(idx, pos)
+    for pos in exits:
+        b.add_exit(pos)
+    for pos in walls:
+        b.add_wall(pos)
+    for color, pos, direction in lasers:
+        b.add_laser(color, pos, direction)
+    return b.build()
+
+
+def solve(world: World, t: int) -> bool:
+    world.reset()
+    return bool(WorldSolver(LLEAdapter(world), T_MAX=t).solve()[0])
+
+
+@pytest.mark.parametrize(
+    "world,horizons",
+    [
+        (_world(3, 3, [(0, 0)], [(2, 0)], [(1, 0)]), range(0, 7)),
+        (
+            _world(3, 3, [(0, 0), (0, 2)], [(2, 0), (2, 2)], [], [(0, (1, 0), E)]),
+            range(0, 7),
+        ),
+        (
+            _world(3, 3, [(0, 0), (0, 2)], [(2, 0), (2, 2)], [(1, 0), (1, 2)]),
+            range(0, 9),
+        ),
+        (World.level(3), range(7, 12)),
+    ],
+)
+def test_incremental_solver_matches_fresh_solver_at_every_horizon(world, horizons):
+    expected = {t: solve(world, t) for t in horizons}
+
+    world.reset()
+    with IncrementalWorldSolver(LLEAdapter(world)) as solver:
+        # Grow the horizon, then query smaller horizons on the warm solver.
+        for t in horizons:
+            assert solver.is_satisfiable(t) == expected[t]
+        for t in reversed(horizons):
+            assert solver.is_satisfiable(t) == expected[t]
+
+
+def test_incremental_solver_encodes_each_layer_once():
+    world = World.level(5)
+    world.reset()
+    with IncrementalWorldSolver(LLEAdapter(world), T_MAX=19) as solver:
+        assert solver.is_satisfiable(19)
+        clause_count = len(solver.model)
+
+        assert not solver.is_satisfiable(18)
+        assert solver.is_satisfiable(19)
+
+        # Only the guarded goal clauses of horizon 18 were added.
+        assert len(solver.model) - clause_count == len(world.exit_pos)
+
+
+def test_incremental_solver_plan_has_requested_length():
+    world = _world(2, 2, agents=[(0, 0)], exits=[(1, 1)])
+    world.reset()
+    with IncrementalWorldSolver(LLEAdapter(world), T_MAX=5) as solver:
+        result, model = solver.solve(2)
+        plan = solver.extract_plan(model, T=2)
+
+    assert result is True
+    assert len(plan) == 2
+    world.reset()
+    for actions in plan:
+        world.step(list(actions))
+    assert world.agents_positions == [(1, 1)]
@@ -0,0 +1,67 @@
+import pytest
+
+from generators.constrained_random_solvable_generator import (
+    SAMPLER_INCREMENTAL,
+    SAMPLER_UNIFORM,
+    ConstrainedRandomSolvableGenerator,
+)
+
+
+def _generator(seed, sampler=SAMPLER_INCREMENTAL):
+    return ConstrainedRandomSolvableGenerator(
+        size=(6, 6),
+        agents=3,
+        lasers=3,
+        num_walls=5,
+        t_max=10,
+        seed=seed,
+        sampler=sampler,
+    )
+
+
+def _connected(cells):
+    start = next(iter(cells))
+    seen, stack = {start}, [start]
+    while stack:
+        r, c = stack.pop()
+        for nxt in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if nxt in cells and nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen == cells
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_layouts_satisfy_the_constraints(seed):
+    generator = _generator(seed)
+    for _ in range(20):
+        layout = generator._make_candidate_layout()
+        assert generator.validate_candidate(layout) == (True, "ok")
+
+        sources = {pos for _, pos, _ in layout.lasers}
+        cells = {(r, c) for r in range(6) for c in range(6)}
+        assert _connected(cells - set(layout.walls) - sources)
+        for owner, src, direction in layout.lasers:
+            beam = generator._beam_tiles(src, direction, set(layout.walls), sources)
+            assert all(
+                pos not in beam
+                for color, pos in enumerate(layout.agents)
+                if color != owner
+            )
+
+
+def test_incremental_sampler_needs_fewer_attempts():
+    def attempts(sampler):
+        total = 0
+        for seed in range(8):
+            generator = _generator(seed, sampler)
+            generator.generate()
+            total += generator.last_attempts
+        return total
+
+    assert attempts(SAMPLER_INCREMENTAL) < attempts(SAMPLER_UNIFORM)
+
+
+def test_unknown_sampler_is_rejected():
+    with pytest.raises(ValueError, match="Unknown sampler"):
+        _generator(0, sampler="nope")
@@ -0,0 +1,115 @@
+import pytest
+
+from generators.world_builder import WorldBuilder
+from levels import LLE_LEVELS
+from solver import AgentData, LLEAdapter, MakespanSearch, WorldSnapshot, WorldSolver
+from solver.makespan_search import SEARCH_BINARY, SEARCH_EXPONENTIAL, SEARCH_LINEAR
+
+
+def _world(width, height, agents=(), exits=(), walls=()):
+    b = WorldBuilder(width, height)
+    for idx, pos in enumerate(agents):
+        b.add_agent(idx, pos)
+    for pos in exits:
+        b.add_exit(pos)
+    for pos in walls:
+        b.add_wall(pos)
+    return b.build()
+
+
+@pytest.mark.parametrize("strategy", [SEARCH_LINEAR, SEARCH_BINARY, SEARCH_EXPONENTIAL])
+@pytest.mark.parametrize("level", sorted(LLE_LEVELS))
+def test_min_makespan_matches_known_lle_horizons(level, strategy):
+    world, t_max = LLE_LEVELS[level]
+    world.reset()
+
+    result = MakespanSearch(LLEAdapter(world), strategy=strategy, max_T=30).find_min_makespan()
+
+    assert result.makespan == t_max
+    assert result.lower_bound <= t_max
+    assert len(result.plan) == t_max
+    assert all(step.satisfiable == (step.T >= t_max) for step in result.steps)
+
+
+def test_min_makespan_plan_reaches_the_exit():
+    world = _world(3, 3, agents=[(0, 0)], exits=[(2, 0)], walls=[(1, 0)])
+
+    result = MakespanSearch(LLEAdapter(world)).find_min_makespan()
+
+    assert result.makespan == 4
+    assert result.lower_bound == 4
+    world.reset()
+    for actions in result.plan:
+        world.step(list(actions))
+    assert world.agents_positions == [(2, 0)]
+
+
+def test_min_makespan_without_reachable_exit_skips_sat():
+    world = _world(
+        4,
+        4,
+        agents=[(0, 0), (0, 3)],
+        exits=[(3, 0), (3, 3)],
+        walls=[(2, 0), (2, 1), (2, 2), (2, 3)],
+    )
+
+    result = MakespanSearch(LLEAdapter(world)).find_min_makespan()
+
+    assert result.makespan is None
+    assert result.plan is None
+    assert result.lower_bound is None
+    assert result.steps == []
+
+
+@pytest.mark.parametrize("strategy", [SEARCH_LINEAR, SEARCH_BINARY, SEARCH_EXPONENTIAL])
+@pytest.mark.parametrize(
+    "width,agents,walls",
+    [
+        (5, [(0, 0), (0, 4)], [(0, 3)]),  # the second agent never reaches an exit
+        (6, [(0, 0), (0, 5)], []),
+    ],
+)
+def test_min_makespan_with_fewer_exits_than_agents(strategy, width, agents, walls):
+    # LLE refuses such worlds, the solver does not: only the exit must be taken.
+    world = WorldSnapshot(
+        width=width,
+        height=1,
+        agents=tuple(AgentData(color=i, position=pos) for i, pos in enumerate(agents)),
+        laser_sources=(),
+        exit_positions=((0, 1),),
+        wall_positions=tuple(walls),
+    )
+    assert WorldSolver(world, T_MAX=1).solve()[0]
+
+    result = MakespanSearch(world, strategy=strategy).find_min_makespan()
+
+    assert result.lower_bound == 1
+    assert result.makespan == 1
+
+
+def test_binary_search_never_encodes_max_t_first():
+    world, t_max = LLE_LEVELS[3]
+    world.reset()
+
+    result = MakespanSearch(
+        LLEAdapter(world), strategy=SEARCH_BINARY, max_T=100
+    ).find_min_makespan()
+
+    assert result.makespan == t_max
+    assert result.steps[0].T == result.lower_bound
+    assert max(step.T for step in result.steps) < 100
+
+
+def test_min_makespan_gives_up_past_max_t():
+    world = _world(3, 3, agents=[(0, 0)], exits=[(2, 0)], walls=[(1, 0)])
+
+    result = MakespanSearch(LLEAdapter(world), max_T=3).find_min_makespan()
+
+    assert result.makespan is None
+    assert result.plan is None
+
+
+def test_unknown_search_strategy_raises_value_error():
+    world = _world(2, 2, agents=[(0, 0)], exits=[(1, 1)])
+    with pytest.raises(ValueError, match="Unknown search strategy"):
+        MakespanSearch(LLEAdapter(world), strategy="random")
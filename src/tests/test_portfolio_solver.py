@@ -0,0 +1,145 @@
+import pytest
+
+from generators.world_builder import WorldBuilder
+from levels import LLE_LEVELS
+from solver import (
+    CooperationSolver,
+    LLEAdapter,
+    Portfolio,
+    PortfolioConfig,
+    SolveBudget,
+    WorldSnapshot,
+    WorldSolver,
+    WorldSolverSelectiveStrictLaser,
+    WorldSolverStrictLaser,
+)
+from solver.constraints.movements import METHOD_GLOBAL, METHOD_LOCAL
+
+_CONFIGS = (
+    PortfolioConfig(METHOD_LOCAL, "minisat22"),
+    PortfolioConfig(METHOD_GLOBAL, "glucose4"),
+    PortfolioConfig(METHOD_LOCAL, "cadical195", seed=7),
+)
+
+
+def _adapted(level):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    return world, LLEAdapter(world), t
+
+
+@pytest.mark.parametrize("level", [3, 5])
+@pytest.mark.parametrize("offset", [-1, 0])
+def test_portfolio_agrees_with_world_solver(level, offset):
+    _, adapted, t = _adapted(level)
+    portfolio = Portfolio(_CONFIGS)
+
+    result, _ = portfolio.solver(adapted, T_MAX=t + offset).solve()
+
+    assert bool(result) == bool(WorldSolver(adapted, T_MAX=t + offset).solve()[0])
+    assert portfolio.races == 1
+    assert sum(portfolio.wins.values()) == 1
+
+
+def test_portfolio_plan_reaches_the_exits():
+    world, adapted, t = _adapted(3)
+    solver = Portfolio(_CONFIGS).solver(adapted, T_MAX=t)
+
+    result, model = solver.solve()
+
+    assert result
+    assert solver.winner in _CONFIGS
+    world.reset()
+    for actions in solver.extract_plan(model):
+        world.step(list(actions))
+    assert sorted(world.agents_positions) == sorted(world.exit_pos)
+
+
+@pytest.mark.parametrize(
+    "solver_cls,kwargs",
+    [
+        (WorldSolverStrictLaser, {}),
+        (WorldSolverSelectiveStrictLaser, {"strict_colors": {0}}),
+    ],
+)
+def test_portfolio_races_laser_variants(solver_cls, kwargs):
+    _, adapted, t = _adapted(3)
+    expected = solver_cls(adapted, T_MAX=t, **kwargs).solve()[0]
+
+    result, _ = Portfolio(_CONFIGS).solver(adapted, t, solver_cls, **kwargs).solve()
+
+    assert bool(result) == bool(expected)
+
+
+def test_portfolio_collects_wins_across_solvers():
+    _, adapted, t = _adapted(4)
+    portfolio = Portfolio(_CONFIGS)
+
+    CooperationSolver(adapted, T_MAX=t, portfolio=portfolio).analyze()
+    portfolio.solver(adapted, T_MAX=t).solve()
+
+    assert portfolio.races == 2
+    assert set(portfolio.wins) <= {config.label for config in _CONFIGS}
+    assert sum(portfolio.win_rates().values()) == pytest.approx(1.0)
+
+
+def test_portfolio_answers_unknown_when_every_config_runs_out():
+    world = LLE_LEVELS[6][0]
+    world.reset()
+    portfolio = Portfolio(_CONFIGS)
+    solver = portfolio.solver(
+        LLEAdapter(world), T_MAX=20, budget=SolveBudget(conflicts=5)
+    )
+
+    assert solver.solve() == (None, None)
+    assert solver.winner is None
+    assert portfolio.races == 1
+    assert not portfolio.wins
+
+
+def test_portfolio_config_parses_cli_specs():
+    assert PortfolioConfig.parse("global") == PortfolioConfig(METHOD_GLOBAL)
+    assert PortfolioConfig.parse("local:cd19:3") == PortfolioConfig(
+        METHOD_LOCAL, "cd19", 3
+    )
+    assert Portfolio.from_specs(["local:cd19"]).configs == (
+        PortfolioConfig(METHOD_LOCAL, "cadical195"),
+    )
+
+
+@pytest.mark.parametrize(
+    "configs,match",
+    [
+        ((), "at least one config"),
+        ((PortfolioConfig("sideways"),), "Unknown movement method"),
+        ((PortfolioConfig(METHOD_LOCAL, "nope"),), "Unknown solver backend"),
+    ],
+)
+def test_portfolio_rejects_invalid_configs(configs, match):
+    with pytest.raises(ValueError, match=match):
+        Portfolio(configs)
+
+
+def test_portfolio_raises_when_every_config_fails():
+    _, adapted, t = _adapted(1)
+    solver = Portfolio(_CONFIGS).solver(adapted, T_MAX=t, laser_encoding="nope")
+
+    with pytest.raises(RuntimeError, match="Every portfolio config failed"):
+        solver.solve()
+
+
+def test_world_snapshot_encodes_like_the_adapter():
+    b = WorldBuilder(4, 3)
+    b.add_agent(0, (0, 0))
+    b.add_exit((2, 3))
+    b.add_wall((1, 1))
+    world = b.build()
+    world.reset()
+    adapted = LLEAdapter(world)
+
+    direct = WorldSolver(adapted, T_MAX=5)
+    snapshot = WorldSolver(WorldSnapshot.from_world(adapted), T_MAX=5)
+    direct.build_model()
+    snapshot.build_model()
+
+    assert list(snapshot.model.literals) == list(direct.model.literals)
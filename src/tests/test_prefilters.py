@@ -0,0 +1,137 @@
+import pytest
+
+from generators.prefilters import (
+    LLE_OVERLAP,
+    LLE_START_ON_BEAM,
+    LLE_TOO_FEW_EXITS,
+    PREFILTER_BEAMS,
+    PREFILTER_CONNECTIVITY,
+    PREFILTER_DISTANCE,
+    PREFILTER_MATCHING,
+    lle_refusal,
+    prefilter_layout,
+)
+from generators.random_solvable_generator import CandidateLayout, RandomSolvableGenerator
+from generators.world_builder import Direction
+from solver import LLEAdapter, WorldSnapshot
+
+
+def layout(agents, exits, walls=(), lasers=()):
+    return CandidateLayout(
+        agents=list(agents), exits=list(exits), walls=list(walls), lasers=list(lasers)
+    )
+
+
+@pytest.mark.parametrize(
+    "candidate,t_max,expected",
+    [
+        # Agent 0 is walled into the top-left corner.
+        (layout([(0, 0)], [(2, 2)], walls=[(0, 1), (1, 0)]), 9, PREFILTER_CONNECTIVITY),
+        (layout([(0, 0)], [(2, 2)]), 3, PREFILTER_DISTANCE),
+        # Agent 1's row is cut by the first cell of agent 0's beam.
+        (
+            layout(
+                [(0, 0), (1, 0)],
+                [(0, 2), (1, 2)],
+                walls=[(2, 1)],
+                lasers=[(0, (0, 1), Direction.SOUTH)],
+            ),
+            9,
+            PREFILTER_BEAMS,
+        ),
+        # Both agents only have the right exit within reach.
+        (layout([(1, 2), (2, 1)], [(0, 0), (2, 2)]), 1, PREFILTER_MATCHING),
+        (layout([(0, 0), (2, 0)], [(0, 2), (2, 2)]), 2, None),
+    ],
+)
+def test_prefilter_names_the_failing_stage(candidate, t_max, expected):
+    assert prefilter_layout(candidate, 3, 3, t_max) == expected
+
+
+def test_prefilter_only_rejects_unsolvable_layouts():
+    generator = RandomSolvableGenerator(
+        size=(5, 5), agents=2, lasers=2, t_max=6, seed=0, prefilter=False
+    )
+    rejected = 0
+    for _ in range(80):
+        candidate = generator._make_candidate_layout()
+        if prefilter_layout(candidate, 5, 5, generator.t_max) is None:
+            continue
+        rejected += 1
+        try:
+            world = generator._build_world_from_layout(candidate)
+        except Exception:
+            continue
+        assert generator._is_satisfiable(world, generator.t_max) is False
+
+    assert rejected > 0
+
+
+def test_generator_counts_prefilter_rejections_per_stage():
+    generator = RandomSolvableGenerator(size=(5, 5), agents=3, lasers=3, t_max=5, seed=0)
+    attempts = 0
+    for _ in range(3):
+        generator.generate()
+        attempts += generator.last_attempts
+
+    rejections = generator.prefilter_rejections
+    # Starts inside a beam are LLE refusals, counted before the prefilter.
+    assert sum(rejections.values()) > 0
+    assert generator.lle_rejections[LLE_START_ON_BEAM] > 0
+    assert sum(rejections.values()) + sum(generator.lle_rejections.values()) < attempts
+
+
+@pytest.mark.parametrize(
+    "candidate,expected",
+    [
+        (layout([(0, 0)], [(0, 0)]), LLE_OVERLAP),
+        (layout([(0, 0)], [(2, 2)], lasers=[(0, (2, 2), Direction.NORTH)]), LLE_OVERLAP),
+        (layout([(0, 0), (1, 1)], [(2, 2)]), LLE_TOO_FEW_EXITS),
+        # Agent 1 starts in agent 0's beam.
+        (
+            layout([(0, 0), (2, 1)], [(0, 2), (2, 2)], lasers=[(0, (0, 1), Direction.SOUTH)]),
+            LLE_START_ON_BEAM,
+        ),
+        # Agent 0 blocks its own beam, so agent 1 behind it is safe.
+        (
+            layout(
+                [(1, 1), (2, 1)], [(0, 2), (2, 2)], lasers=[(0, (0, 1), Direction.SOUTH)]
+            ),
+            None,
+        ),
+    ],
+)
+def test_lle_refusal_names_the_reason(candidate, expected):
+    assert lle_refusal(candidate, 3, 3) == expected
+
+
+def test_lle_refusal_predicts_what_lle_builds():
+    generator = RandomSolvableGenerator(size=(5, 5), agents=3, lasers=3, seed=0)
+    refused = 0
+    for _ in range(200):
+        candidate = generator._make_candidate_layout()
+        try:
+            world = generator._build_world_from_layout(candidate)
+            built = WorldSnapshot.from_world(LLEAdapter(world)) == WorldSnapshot.from_layout(
+                candidate, 5, 5
+            )
+        except Exception:
+            built = False
+        refusal = lle_refusal(candidate, 5, 5)
+        refused += refusal is not None
+        assert (refusal is None) == built
+
+    assert refused > 0
+
+
+def test_generator_rejects_lle_refusals_before_sat(monkeypatch):
+    generator = RandomSolvableGenerator(size=(3, 3), agents=2, seed=0)
+    monkeypatch.setattr(
+        generator, "_accept_world", lambda world: pytest.fail("SAT was called")
+    )
+    candidate = layout(
+        [(0, 0), (2, 1)], [(0, 2), (2, 2)], lasers=[(0, (0, 1), Direction.SOUTH)]
+    )
+
+    assert generator._evaluate_layout(1, candidate) is None
+    assert generator.lle_rejections[LLE_START_ON_BEAM] == 1
@@ -4,6 +4,8 @@ from benchmark.plots import _sort_level_keys as plot_sort_level_keys
 from benchmark.report import _sort_level_keys as report_sort_level_keys
 from benchmark.runner import run_benchmark
 from generators.random_solvable_generator import RandomSolvableGenerator
+from lle import World
+from solver import CNFCache, LLEAdapter, SolveBudget, WorldSnapshot
 
 
 @pytest.mark.parametrize(
@@ -25,6 +27,14 @@ from generators.random_solvable_generator import RandomSolvableGenerator
             {"size": (0, 3), "agents": 1},
             "grid dimensions must be >= 1",
         ),
+        (
+            {"size": (3, 3), "agents": 1, "solver_backend": "nope"},
+            "Unknown solver backend",
+        ),
+        (
+            {"size": (3, 3), "agents": 1, "workers": 0},
+            "workers must be >= 1",
+        ),
     ],
 )
 def test_random_solvable_generator_validates_invalid_inputs(kwargs, match):
@@ -32,6 +42,64 @@ def test_random_solvable_generator_validates_invalid_inputs(kwargs, match):
         RandomSolvableGenerator(**kwargs)
 
 
+def test_generator_rejects_candidates_that_exhaust_the_budget():
+    generator = RandomSolvableGenerator(
+        size=(3, 3), agents=1, t_max=19, budget=SolveBudget(conflicts=5)
+    )
+
+    accepted, reason = generator._accept_world(World.level(5))
+
+    assert not accepted
+    assert reason == "solver_budget_exhausted[conflicts=5]"
+
+
+def test_generation_does_not_depend_on_the_worker_count():
+    def generate(workers):
+        generator = RandomSolvableGenerator(
+            size=(5, 5), agents=2, t_max=8, seed=3, workers=workers
+        )
+        world = generator.generate()
+        return world.world_string, generator.last_attempts
+
+    first = generate(workers=1)
+
+    assert generate(workers=2) == first
+    assert generate(workers=3) == first
+
+
+def test_layout_snapshots_match_the_built_world():
+    generator = RandomSolvableGenerator(size=(5, 6), agents=3, lasers=3, seed=0)
+    built = 0
+    for _ in range(40):
+        layout = generator._make_candidate_layout()
+        snapshot = WorldSnapshot.from_layout(layout, generator.rows, generator.cols)
+        try:
+            world = generator._build_world_from_layout(layout)
+        except Exception:
+            continue
+        built += 1
+        assert WorldSnapshot.from_world(LLEAdapter(world)) == snapshot
+        assert generator._is_satisfiable(snapshot, 6) == generator._is_satisfiable(world, 6)
+
+    assert built > 0
+
+
+def test_generator_builds_lle_worlds_only_on_acceptance(monkeypatch):
+    generator = RandomSolvableGenerator(size=(5, 5), agents=2, t_max=4, seed=1)
+    builds = []
+    build = RandomSolvableGenerator._build_world_from_layout
+
+    def counting(self, layout):
+        builds.append(layout)
+        return build(self, layout)
+
+    monkeypatch.setattr(RandomSolvableGenerator, "_build_world_from_layout", counting)
+    generator.generate()
+
+    assert generator.last_attempts > 1
+    assert len(builds) == 1
+
+
 def test_sort_level_keys_orders_numeric_values_numerically():
     keys = [10, "custom", 2, 1]
     expected = [1, 2, 10, "custom"]
@@ -43,3 +111,19 @@ def test_sort_level_keys_orders_numeric_values_numerically():
 def test_run_benchmark_rejects_non_positive_num_runs():
     with pytest.raises(ValueError, match="num_runs must be >= 1"):
         run_benchmark(num_runs=0, levels=[])
+
+
+def test_run_benchmark_defaults_to_the_movement_methods():
+    assert list(run_benchmark(num_runs=1, levels=[])) == ["local", "global"]
+
+
+def test_run_benchmark_times_cached_loads_with_the_encoded_breakdown(tmp_path):
+    cache = CNFCache(tmp_path)
+    levels = [(3, World.level(3), 10)]
+
+    plain = run_benchmark(num_runs=1, levels=levels, methods=["local"])
+    cached = run_benchmark(num_runs=2, levels=levels, methods=["local"], cnf_cache=cache)
+
+    assert len(cache) == 1 and cache.hits == 2
+    for key in ("total_clauses", "constraint_clauses", "satisfiable"):
+        assert cached["local"][3][key] == plain["local"][3][key]
@@ -0,0 +1,233 @@
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+from lle import World
+
+from benchmark.runner import run_benchmark
+from generators.random_solvable_generator import RandomSolvableGenerator
+from levels import LLE_LEVELS
+from solver import (
+    CooperationProfileAnalyzer,
+    CooperationProfileResult,
+    LLEAdapter,
+    ResultStore,
+    SolveBudget,
+    WorldSnapshot,
+    WorldSolver,
+    WorldSolverSwitchableLaser,
+    canonical_world_hash,
+)
+from solver.result_store import VARIANT_PROFILE, VARIANT_SOLVE, selective_variant
+
+
+def _adapted(level):
+    world, t = LLE_LEVELS[level]
+    world.reset()
+    return LLEAdapter(world), t
+
+
+def _forbid_solving(monkeypatch):
+    def no_solve(self):
+        raise AssertionError("a stored answer must not be solved again")
+
+    monkeypatch.setattr(WorldSolver, "solve", no_solve)
+    monkeypatch.setattr(WorldSolverSwitchableLaser, "solve", no_solve)
+
+
+def test_result_store_round_trips_answers_plans_and_data(tmp_path):
+    adapted, t = _adapted(3)
+    plan = np.arange(2 * (t + 1) * 2).reshape(2, t + 1, 2)
+    with ResultStore(tmp_path / "results.db") as store:
+        store.put(adapted, t, VARIANT_SOLVE, True, plan=plan, data={"k": [1, 2]})
+        store.put(adapted, t, selective_variant({1, 0}), False)
+
+        stored = store.get(adapted, t, VARIANT_SOLVE)
+        assert stored.satisfiable
+        assert np.array_equal(stored.plan, plan)
+        assert stored.data == {"k": [1, 2]}
+        assert not store.get(adapted, t, "selective:0,1").satisfiable
+        assert store.get(adapted, t + 1, VARIANT_SOLVE) is None
+        assert (store.hits, store.misses) == (2, 1)
+
+
+def test_canonical_world_hash_ignores_component_order():
+    adapted, _ = _adapted(6)
+    snapshot = WorldSnapshot.from_world(adapted)
+    shuffled = WorldSnapshot(
+        width=snapshot.width,
+        height=snapshot.height,
+        agents=snapshot.agents[::-1],
+        laser_sources=snapshot.laser_sources[::-1],
+        exit_positions=snapshot.exit_positions[::-1],
+        wall_positions=snapshot.wall_positions[::-1],
+    )
+
+    assert canonical_world_hash(shuffled) == canonical_world_hash(snapshot)
+
+
+@pytest.mark.parametrize("level", [3, 4, 6])
+def test_analyzer_reads_stored_profiles_without_solving(tmp_path, monkeypatch, level):
+    adapted, t = _adapted(level)
+    store = ResultStore(tmp_path / "results.db")
+    expected = CooperationProfileAnalyzer(adapted, T_MAX=t, result_store=store).analyze()
+
+    _forbid_solving(monkeypatch)
+    result = CooperationProfileAnalyzer(adapted, T_MAX=t, result_store=store).analyze()
+
+    assert result == expected
+    assert CooperationProfileResult.from_dict(expected.to_dict()) == expected
+
+
+def test_analyzer_reuses_stored_sub_answers(tmp_path, monkeypatch):
+    adapted, t = _adapted(4)
+    store = ResultStore(tmp_path / "results.db")
+    expected = CooperationProfileAnalyzer(adapted, T_MAX=t, result_store=store).analyze()
+    store._connection().execute(
+        "DELETE FROM results WHERE variant = ?", (VARIANT_PROFILE,)
+    )
+
+    _forbid_solving(monkeypatch)
+    result = CooperationProfileAnalyzer(adapted, T_MAX=t, result_store=store).analyze()
+
+    assert result == expected
+
+
+def test_undecided_analyses_are_not_stored(tmp_path):
+    world = LLE_LEVELS[6][0]
+    world.reset()
+    store = ResultStore(tmp_path / "results.db")
+
+    result = CooperationProfileAnalyzer(
+        LLEAdapter(world),
+        T_MAX=20,
+        budget=SolveBudget(conflicts=5),
+        result_store=store,
+    ).analyze()
+
+    assert result.profile == "unknown"
+    assert len(store) == 0
+
+
+def test_result_store_evicts_least_recently_used_rows(tmp_path):
+    adapted, _ = _adapted(3)
+    store = ResultStore(tmp_path / "results.db", max_entries=2, evict_every=1)
+    store.put(adapted, 1, VARIANT_SOLVE, False)
+    store.put(adapted, 2, VARIANT_SOLVE, False)
+    store.get(adapted, 1, VARIANT_SOLVE)
+    store.put(adapted, 3, VARIANT_SOLVE, False)
+
+    assert len(store) == 2
+    assert store.get(adapted, 2, VARIANT_SOLVE) is None
+    assert store.get(adapted, 1, VARIANT_SOLVE) is not None
+
+
+def test_result_store_respects_its_size_bound(tmp_path):
+    adapted, t = _adapted(3)
+    store = ResultStore(tmp_path / "results.db", max_bytes=1, evict_every=1)
+    store.put(adapted, t, VARIANT_SOLVE, True, plan=np.zeros((2, t + 1, 2)))
+
+    assert len(store) == 0
+
+
+def test_result_store_evicts_in_batches(tmp_path):
+    adapted, _ = _adapted(3)
+    store = ResultStore(tmp_path / "results.db", max_entries=2, evict_every=3)
+    for t in range(1, 6):
+        store.put(adapted, t, VARIANT_SOLVE, False)
+
+    # Evicted down to 2 rows after the third write, 2 more since.
+    assert len(store) == 4
+    store.close()
+    assert len(store) == 2
+    assert store.get(adapted, 5, VARIANT_SOLVE) is not None
+
+
+def _put_from_worker(args):
+    store, world, t = args
+    store.put(world, t, VARIANT_SOLVE, t % 2 == 0)
+    return store.get(world, t, VARIANT_SOLVE).satisfiable
+
+
+def test_result_store_is_shared_by_worker_processes(tmp_path):
+    adapted, _ = _adapted(3)
+    world = WorldSnapshot.from_world(adapted)
+    store = ResultStore(tmp_path / "results.db")
+    store.put(world, 0, VARIANT_SOLVE, True)
+
+    with mp.get_context().Pool(2) as pool:
+        answers = pool.map(_put_from_worker, [(store, world, t) for t in range(1, 9)])
+
+    assert answers == [t % 2 == 0 for t in range(1, 9)]
+    assert len(store) == 9
+
+
+def test_generator_sat_checks_go_through_the_store(tmp_path, monkeypatch):
+    world, t = World.level(3), 10
+    store = ResultStore(tmp_path / "results.db")
+    generator = RandomSolvableGenerator(size=(3, 3), result_store=store)
+    assert generator._is_satisfiable(world, t)
+
+    _forbid_solving(monkeypatch)
+
+    assert generator._is_satisfiable(world, t)
+    stored = store.get(LLEAdapter(world), t, VARIANT_SOLVE)
+    assert stored.plan.shape == (len(world.start_pos), t + 1, 2)
+
+
+def test_benchmark_rejects_answers_that_disagree_with_the_store(tmp_path):
+    world = World.level(3)
+    world.reset()
+    store = ResultStore(tmp_path / "results.db")
+    store.put(LLEAdapter(world), 10, VARIANT_SOLVE, False)
+
+    with pytest.raises(RuntimeError, match="disagrees with the stored answer"):
+        run_benchmark(
+            num_runs=1, levels=[(3, world, 10)], methods=["local"], result_store=store
+        )
+
+
+def test_benchmark_skips_the_untimed_solve_of_stored_levels(tmp_path, monkeypatch):
+    world = World.level(3)
+    world.reset()
+    store = ResultStore(tmp_path / "results.db")
+    store.put(LLEAdapter(world), 10, VARIANT_SOLVE, True)
+    solves = []
+    solve = WorldSolver.solve
+
+    def counting(self, *args, **kwargs):
+        solves.append(self)
+        return solve(self, *args, **kwargs)
+
+    monkeypatch.setattr(WorldSolver, "solve", counting)
+    results = run_benchmark(
+        num_runs=2, levels=[(3, world, 10)], methods=["local"], result_store=store
+    )
+
+    assert len(solves) == 2
+    assert results["local"][3]["satisfiable"] is True
+    assert results["local"][3]["total_clauses"] > 0
+
+
+def test_benchmark_laser_encodings_agree_on_same_color_lasers(tmp_path):
+    # Color 0 has lasers facing two ways, whose beams the beam encoding must
+    # merge into one laser variable like the ray encodings do.
+    world = World(
+        """
+        .    S0 . .
+        X    .  @ L0W
+        L0S  .  . .
+        .    .  @ .
+        """
+    )
+    world.reset()
+    store = ResultStore(tmp_path / "results.db")
+
+    results = run_benchmark(
+        num_runs=1,
+        levels=[("same_color", world, 6)],
+        methods=["local", "local_numpy", "local_ray", "local_blocker"],
+        result_store=store,
+    )
+
+    assert all(r["same_color"]["satisfiable"] for r in results.values())
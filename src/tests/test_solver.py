@@ -1,9 +1,33 @@
+from collections import Counter
+from itertools import product
+
+import numpy as np
 import pytest
 from lle import World
+from pysat.formula import CNF
 from pysat.solvers import Minisat22
 
 from generators.world_builder import Direction, WorldBuilder
-from solver import LLEAdapter, WorldSolver
+from solver import (
+    CNFCache,
+    IncrementalWorldSolver,
+    LLEAdapter,
+    WorldSolver,
+    WorldSolverSelectiveStrictLaser,
+    WorldSolverStrictLaser,
+    WorldSolverSwitchableLaser,
+)
+from solver.constraints.movements import (
+    COLLISION_OCCUPANCY,
+    METHOD_GLOBAL,
+    METHOD_LOCAL,
+    MovementConstraints,
+)
+from solver.backends import canonical_backend
+from solver.budget import SolveBudget
+from solver.constraints.lasers import LASER_BEAM, LASER_BLOCKER, LASER_RAY
+from solver.model import SATModel, SolverSink
+from solver.world_solver import actions_from_positions
 
 
 def solve(world: World, t: int) -> bool:
@@ -189,3 +213,661 @@ def test_world_solver_can_be_reused_without_accumulating_constraints():
     assert first_result is True
     assert second_result is True
     assert second_clause_count == first_clause_count
+
+
+# ==========================================================
+# Reachability pruning
+# ==========================================================
+
+
+@pytest.mark.parametrize(
+    "level,t",
+    [(1, 9), (1, 10), (3, 9), (3, 10), (5, 18), (5, 19), (6, 20), (6, 21)],
+)
+def test_pruning_keeps_lle_answers_and_shrinks_the_cnf(level, t):
+    world = World.level(level)
+    world.reset()
+    full = WorldSolver(LLEAdapter(world), T_MAX=t, prune=False)
+    pruned = WorldSolver(LLEAdapter(world), T_MAX=t)
+
+    assert bool(pruned.solve()[0]) == bool(full.solve()[0])
+    assert len(pruned.model) < len(full.model)
+
+
+def test_pruning_skips_walls_and_cells_out_of_reach():
+    world = _world(3, 3, agents=[(0, 0)], exits=[(2, 0)], walls=[(1, 0)])
+    solver = WorldSolver(LLEAdapter(world), T_MAX=4)
+    agent_var = solver.ctx.agent_var
+
+    # Never on a wall, not two steps away at t=1, and back on the exit at T.
+    assert (0, 1, 0, 2) not in agent_var
+    assert (0, 0, 2, 1) not in agent_var
+    assert (0, 0, 1, 1) in agent_var
+    assert (0, 2, 1, 4) not in agent_var
+    assert (0, 2, 0, 4) in agent_var
+    assert solver.solve()[0] is True
+
+
+# ==========================================================
+# Vectorized clause generation
+# ==========================================================
+
+
+def _clause_set(solver):
+    solver.build_model()
+    return Counter(tuple(clause) for clause in solver.model.iter_clauses())
+
+
+@pytest.mark.parametrize("level", [1, 3, 5, 6])
+@pytest.mark.parametrize("movement_method", [METHOD_LOCAL, METHOD_GLOBAL])
+@pytest.mark.parametrize("prune", [False, True])
+@pytest.mark.parametrize(
+    "make_solver",
+    [
+        lambda w, **kw: WorldSolver(w, **kw),
+        lambda w, **kw: WorldSolverStrictLaser(w, **kw),
+        lambda w, **kw: WorldSolverSelectiveStrictLaser(w, [0], **kw),
+    ],
+    ids=["normal", "strict", "selective"],
+)
+def test_vectorized_generation_emits_the_same_clauses(
+    level, movement_method, prune, make_solver
+):
+    world = World.level(level)
+    world.reset()
+    adapted = LLEAdapter(world)
+    kwargs = {"T_MAX": 8, "movement_method": movement_method, "prune": prune}
+
+    assert _clause_set(make_solver(adapted, vectorized=True, **kwargs)) == _clause_set(
+        make_solver(adapted, **kwargs)
+    )
+
+
+def test_vectorized_generation_matches_incremental_layers():
+    world = World.level(3)
+    world.reset()
+    plain = IncrementalWorldSolver(LLEAdapter(world), T_MAX=2)
+    vectorized = IncrementalWorldSolver(LLEAdapter(world), T_MAX=2, vectorized=True)
+
+    for T in (2, 5, 10):
+        assert plain.is_satisfiable(T) == vectorized.is_satisfiable(T)
+    assert _clause_set(vectorized) == _clause_set(plain)
+
+
+# ==========================================================
+# CSR clause store
+# ==========================================================
+
+
+def test_sat_model_stores_clauses_and_blocks_in_one_buffer():
+    model = SATModel()
+    model.add_clause([1, -2])
+    model.extend([np.array([[3, 4, 5], [-3, -4, -5]]), [6]])
+    model.add_block(np.empty((1, 0), dtype=np.int64))
+
+    assert len(model) == 5
+    assert model.num_literals == 9
+    assert [c.tolist() for c in model.iter_clauses()] == [
+        [1, -2],
+        [3, 4, 5],
+        [-3, -4, -5],
+        [6],
+        [],
+    ]
+    assert [c.tolist() for c in model.iter_clauses(3)] == [[6], []]
+    assert model.cnf.clauses[1] == [3, 4, 5]
+
+
+def test_sat_model_iterates_views_of_its_buffer():
+    model = SATModel()
+    model.extend([[1, -2], np.array([[3, 4], [-3, -4]])])
+
+    clauses = list(model.iter_clauses())
+    assert all(isinstance(c, memoryview) for c in clauses)
+    model.literals[0] = 7
+    assert clauses[0].tolist() == [7, -2]
+
+    del clauses
+    model.add_clause([5])
+    assert len(model) == 4
+
+
+def test_solver_sink_feeds_blocks_without_lists():
+    with Minisat22() as solver:
+        sink = SolverSink(solver)
+        sink.extend([np.array([[1, 2], [-1, 2]]), [-2, 3], np.array([[-3]])])
+
+        assert len(sink) == 4
+        assert solver.solve() is False
+
+
+def test_vectorized_solver_keeps_blocks_as_int32_literals():
+    world = World.level(6)
+    world.reset()
+    solver = WorldSolver(LLEAdapter(world), T_MAX=30, vectorized=True)
+
+    assert bool(solver.solve()[0]) is True
+    assert solver.model.literals.itemsize == 4
+    assert solver.model.offsets[-1] == solver.model.num_literals
+
+
+# ==========================================================
+# Streaming builds
+# ==========================================================
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+@pytest.mark.parametrize("level,t", [(1, 9), (1, 10), (6, 20), (6, 21)])
+def test_streaming_build_keeps_answers_without_storing_clauses(level, t, vectorized):
+    world = World.level(level)
+    world.reset()
+    stored = WorldSolver(LLEAdapter(world), T_MAX=t, enable_profiling=True)
+    with WorldSolver(
+        LLEAdapter(world),
+        T_MAX=t,
+        enable_profiling=True,
+        vectorized=vectorized,
+        streaming=True,
+    ) as streamed:
+        assert bool(streamed.solve()[0]) == bool(stored.solve()[0])
+        assert len(streamed.model) == 0
+        assert (
+            streamed.get_profiling_data()["total_clauses"]
+            == stored.get_profiling_data()["total_clauses"]
+            == len(stored.model)
+        )
+
+
+def test_streaming_sink_flushes_in_chunks():
+    solver = Minisat22()
+    sink = SolverSink(solver)
+    sink.chunk_size = 2
+    sink.extend([[1, 2], [-1], np.array([[3], [2]]), [4], [5], [6]])
+
+    assert len(sink) == 7
+    assert solver.solve() is True
+    assert {-1, 2, 3, 4, 5, 6} <= set(solver.get_model())
+    solver.delete()
+
+
+# ==========================================================
+# Occupancy collision encoding
+# ==========================================================
+
+
+@pytest.mark.parametrize("level,t", [(1, 9), (1, 10), (5, 18), (5, 19), (6, 20), (6, 21)])
+def test_occupancy_collisions_keep_lle_answers(level, t):
+    world = World.level(level)
+    world.reset()
+    pairwise = WorldSolver(LLEAdapter(world), T_MAX=t)
+    occupancy = WorldSolver(
+        LLEAdapter(world), T_MAX=t, collision_encoding=COLLISION_OCCUPANCY
+    )
+
+    assert bool(occupancy.solve()[0]) == bool(pairwise.solve()[0])
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def test_vectorized_occupancy_collisions_emit_the_same_clauses(prune):
+    world = World.level(6)
+    world.reset()
+    kwargs = {"T_MAX": 8, "prune": prune, "collision_encoding": COLLISION_OCCUPANCY}
+
+    assert _clause_set(
+        WorldSolver(LLEAdapter(world), vectorized=True, **kwargs)
+    ) == _clause_set(WorldSolver(LLEAdapter(world), **kwargs))
+
+
+def test_occupancy_allows_exactly_what_pairwise_collisions_allow():
+    world = _world(
+        3, 3, agents=[(0, 0), (0, 1), (0, 2)], exits=[(2, 0), (2, 1), (2, 2)]
+    )
+    solver = WorldSolver(LLEAdapter(world), T_MAX=1, prune=False)
+    movement = MovementConstraints(
+        solver.ctx, collision_encoding=COLLISION_OCCUPANCY
+    )
+    clauses = list(movement._no_overlap_occupancy())
+    agent_var = solver.ctx.agent_var
+
+    # Every way three agents can sit on one cell at t=0 and t=1 (both are
+    # state steps for T_MAX=1, so each also gets the vertex rule).
+    at_t = [agent_var[c, 1, 1, 0] for c in range(3)]
+    at_t1 = [agent_var[c, 1, 1, 1] for c in range(3)]
+    with Minisat22(bootstrap_with=clauses) as sat:
+        for values in product([False, True], repeat=6):
+            before, after = values[:3], values[3:]
+            allowed = sum(before) <= 1 and sum(after) <= 1 and not any(
+                after[i] and before[j] for i in range(3) for j in range(3) if i != j
+            )
+            assumptions = [
+                lit if value else -lit for lit, value in zip(at_t + at_t1, values)
+            ]
+            assert sat.solve(assumptions=assumptions) == allowed
+
+
+def test_unknown_collision_encoding_is_rejected():
+    world = _world(2, 2, agents=[(0, 0)], exits=[(0, 1)])
+    with pytest.raises(ValueError, match="Unknown collision encoding"):
+        WorldSolver(LLEAdapter(world), collision_encoding="nope")
+
+
+# ==========================================================
+# Laser encodings
+# ==========================================================
+
+
+_LASER_SOLVERS = [
+    lambda w, **kw: WorldSolver(w, **kw),
+    lambda w, **kw: WorldSolverStrictLaser(w, **kw),
+    lambda w, **kw: WorldSolverSelectiveStrictLaser(w, [0], **kw),
+]
+_LASER_SOLVER_IDS = ["normal", "strict", "selective"]
+
+
+@pytest.mark.parametrize("encoding", [LASER_RAY, LASER_BLOCKER])
+@pytest.mark.parametrize("make_solver", _LASER_SOLVERS, ids=_LASER_SOLVER_IDS)
+@pytest.mark.parametrize("level,t", [(3, 9), (3, 10), (5, 18), (5, 19), (6, 20), (6, 21)])
+def test_ray_lasers_keep_lle_answers_with_fewer_clauses(make_solver, level, t, encoding):
+    world = World.level(level)
+    world.reset()
+    beam = make_solver(LLEAdapter(world), T_MAX=t)
+    ray = make_solver(LLEAdapter(world), T_MAX=t, laser_encoding=encoding)
+
+    assert bool(ray.solve()[0]) == bool(beam.solve()[0])
+    assert len(ray.model) < len(beam.model)
+    assert ray.var.num_vars < beam.var.num_vars
+
+
+def test_ray_follows_the_beam_up_to_the_first_wall():
+    world = _world(
+        5, 2, agents=[(1, 0)], exits=[(1, 4)], walls=[(0, 3)], lasers=[(0, (0, 0), E)]
+    )
+    solver = WorldSolver(LLEAdapter(world), laser_encoding=LASER_RAY)
+
+    assert solver.ctx.laser_rays[0][1] == [(0, 1), (0, 2)]
+    assert solver.ctx.beam_var is None
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+@pytest.mark.parametrize("encoding", [LASER_BEAM, LASER_RAY, LASER_BLOCKER])
+def test_lasers_handle_same_color_lasers_facing_different_ways(encoding, vectorized):
+    # Both lasers are harmless to agent 0. The laser variable of color 0 is
+    # the union of both beams, not equal to each of them.
+    world = World(
+        """
+        L0E . .
+        S0  . .
+        .   . X
+        L0N . .
+        """
+    )
+    world.reset()
+    solver = WorldSolver(
+        LLEAdapter(world), T_MAX=3, laser_encoding=encoding, vectorized=vectorized
+    )
+    assert solver.solve()[0] is True
+
+
+def test_blocker_lasers_need_one_variable_less_per_ray_and_step():
+    world = World.level(6)
+    world.reset()
+    ray = WorldSolver(LLEAdapter(world), T_MAX=20, laser_encoding=LASER_RAY)
+    blocker = WorldSolver(LLEAdapter(world), T_MAX=20, laser_encoding=LASER_BLOCKER)
+    ray.build_model()
+    blocker.build_model()
+
+    steps = 21
+    rays = sum(1 for _, cells in ray.ctx.laser_rays if cells)
+    assert ray.var.num_vars - blocker.var.num_vars == steps * rays
+
+
+@pytest.mark.parametrize("encoding", [None, LASER_RAY, LASER_BLOCKER])
+@pytest.mark.parametrize("level,t", [(3, 9), (3, 10), (4, 10), (5, 19), (6, 21)])
+def test_switchable_lasers_answer_every_variant_on_one_solver(level, t, encoding):
+    world = World.level(level)
+    world.reset()
+    adapted = LLEAdapter(world)
+    kwargs = {} if encoding is None else {"laser_encoding": encoding}
+    colors = [agent.color for agent in adapted.agents]
+
+    with WorldSolverSwitchableLaser(adapted, T_MAX=t, **kwargs) as solver:
+        answers = [solver.solve()[0], solver.solve_strict()[0]]
+        answers += [solver.solve_selective({c})[0] for c in colors]
+
+    expected = [
+        WorldSolver(adapted, T_MAX=t, **kwargs).solve()[0],
+        WorldSolverStrictLaser(adapted, T_MAX=t, **kwargs).solve()[0],
+    ]
+    expected += [
+        WorldSolverSelectiveStrictLaser(adapted, {c}, T_MAX=t, **kwargs).solve()[0]
+        for c in colors
+    ]
+    assert list(map(bool, answers)) == list(map(bool, expected))
+
+
+def test_switchable_lasers_report_the_colors_of_an_unsat_core():
+    world = World.level(3)
+    world.reset()
+    solver = WorldSolverSwitchableLaser(LLEAdapter(world), T_MAX=10)
+
+    result, _ = solver.solve_selective({0, 1})
+
+    assert result is False
+    assert solver.last_core and solver.last_core <= {0, 1}
+    assert solver.solve_selective(solver.last_core)[0] is False
+
+
+def test_switchable_lasers_pin_every_selector():
+    # Color 0's lasers face two ways; a plain solve() must not pick strict rules.
+    world = World(
+        """
+        S0  .  .   .  .
+        L0W .  L0S .  .
+        .   .  .   .  .
+        .   .  .   .  X
+        """
+    )
+    world.reset()
+    adapted = LLEAdapter(world)
+    solver = WorldSolverSwitchableLaser(adapted, T_MAX=8)
+    selectors = {solver.lasers.nonblocking[0], solver.lasers.vulnerable[0]}
+
+    sat, model = solver.solve()
+
+    assert sat == WorldSolver(adapted, T_MAX=8).solve()[0]
+    assert all(model[v - 1] < 0 for v in selectors)
+    if 0 in solver.strict_colors_in(model):
+        assert WorldSolverSelectiveStrictLaser(adapted, {0}, T_MAX=8).solve()[0]
+
+
+# ==========================================================
+# Solver backends
+# ==========================================================
+
+
+_BACKENDS = ["glucose4", "cadical195", "lingeling", "maplechrono", "minicard"]
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+@pytest.mark.parametrize("make_solver", _LASER_SOLVERS, ids=_LASER_SOLVER_IDS)
+@pytest.mark.parametrize("level,t", [(3, 9), (3, 10)])
+def test_backends_agree_with_minisat(make_solver, level, t, backend):
+    world = World.level(level)
+    world.reset()
+    expected = make_solver(LLEAdapter(world), T_MAX=t).solve()[0]
+    with make_solver(
+        LLEAdapter(world), T_MAX=t, streaming=True, solver_backend=backend
+    ) as solver:
+        assert bool(solver.solve()[0]) == bool(expected)
+
+
+@pytest.mark.parametrize("backend", ["g4", "cadical153", "cd19"])
+def test_incremental_solver_runs_on_other_backends(backend):
+    world = World.level(3)
+    world.reset()
+    with IncrementalWorldSolver(LLEAdapter(world), solver_backend=backend) as solver:
+        assert not solver.is_satisfiable(9)
+        assert solver.is_satisfiable(10)
+
+
+def test_backend_aliases_resolve_to_canonical_names():
+    assert canonical_backend("m22") == "minisat22"
+    assert canonical_backend("cd19") == "cadical195"
+    world = _world(2, 2, agents=[(0, 0)], exits=[(0, 1)])
+    assert WorldSolver(LLEAdapter(world), solver_backend="g4").solver_backend == "glucose4"
+
+
+def test_unknown_solver_backend_is_rejected():
+    world = _world(2, 2, agents=[(0, 0)], exits=[(0, 1)])
+    with pytest.raises(ValueError, match="Unknown solver backend"):
+        WorldSolver(LLEAdapter(world), solver_backend="nope")
+
+
+def test_profiler_records_per_backend_statistics():
+    world = World.level(3)
+    world.reset()
+    solver = IncrementalWorldSolver(
+        LLEAdapter(world), enable_profiling=True, solver_backend="cadical195"
+    )
+    solver.solve(9)
+    solver.solve(10)
+    solver.close()
+
+    stats = solver.get_profiling_data()["backends"]
+    assert list(stats) == ["cadical195"]
+    assert stats["cadical195"]["solves"] == 2
+    assert stats["cadical195"]["sat"] == 1
+    assert stats["cadical195"]["unsat"] == 1
+    assert stats["cadical195"]["propagations"] > 0
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("seed", [0, 1, 42])
+@pytest.mark.parametrize("level,t", [(3, 9), (3, 10), (5, 18), (5, 19)])
+def test_seeded_solvers_keep_lle_answers(level, t, seed, streaming):
+    world = World.level(level)
+    world.reset()
+    with WorldSolver(
+        LLEAdapter(world), T_MAX=t, seed=seed, streaming=streaming
+    ) as solver:
+        assert bool(solver.solve()[0]) == solve(world, t)
+
+
+# ==========================================================
+# Solve budgets
+# ==========================================================
+
+
+def test_conflict_budget_leaves_the_answer_unknown():
+    world = World.level(6)
+    world.reset()
+    solver = WorldSolver(LLEAdapter(world), T_MAX=20, budget=SolveBudget(conflicts=5))
+    assert solver.solve() == (None, None)
+
+
+def test_propagation_budget_leaves_the_answer_unknown():
+    world = World.level(3)
+    world.reset()
+    solver = WorldSolver(
+        LLEAdapter(world), T_MAX=10, budget=SolveBudget(propagations=100)
+    )
+    assert solver.solve() == (None, None)
+
+
+def test_incremental_budget_applies_per_query():
+    world = World.level(6)
+    world.reset()
+    with IncrementalWorldSolver(
+        LLEAdapter(world), budget=SolveBudget(conflicts=5)
+    ) as solver:
+        assert solver.is_satisfiable(20) is None
+        solver.budget = None
+        assert solver.is_satisfiable(20) is False
+        assert solver.is_satisfiable(21) is True
+
+
+@pytest.mark.parametrize("make_solver", _LASER_SOLVERS, ids=_LASER_SOLVER_IDS)
+@pytest.mark.parametrize("level,t", [(3, 9), (3, 10), (6, 20), (6, 21)])
+def test_generous_budgets_keep_lle_answers(make_solver, level, t):
+    world = World.level(level)
+    world.reset()
+    expected = make_solver(LLEAdapter(world), T_MAX=t).solve()[0]
+    budget = SolveBudget(time_limit=60, conflicts=10**6, propagations=10**9)
+    result, _ = make_solver(LLEAdapter(world), T_MAX=t, budget=budget).solve()
+    assert result is not None
+    assert bool(result) == bool(expected)
+
+
+def test_time_budget_interrupts_a_hard_call():
+    from pysat.examples.genhard import PHP
+
+    with Minisat22(bootstrap_with=PHP(10).clauses) as solver:
+        assert SolveBudget(time_limit=0.2).run(solver) is None
+        # The interrupt is cleared and the solver stays usable.
+        assert SolveBudget(conflicts=10).run(solver) is None
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"time_limit": 0}, {"conflicts": -1}, {"propagations": 0}]
+)
+def test_non_positive_budgets_are_rejected(kwargs):
+    with pytest.raises(ValueError, match="must be > 0"):
+        SolveBudget(**kwargs)
+
+
+# ==========================================================
+# Trajectory decoding
+# ==========================================================
+
+
+def _decode_by_scan(solver, model, T):
+    """Reference decoder: name every true literal of the model.
+
+    Pruned cells never reach the solver, so their values are arbitrary.
+    """
+    positions = np.zeros((len(solver.ctx.agents), T + 1, 2), dtype=np.int64)
+    for lit in model:
+        obj = solver.var.name(lit) if lit > 0 else None
+        if obj and obj[0] == "agent" and obj[3] <= T:
+            _, color, pos, t = obj
+            if (color, *pos, t) in solver.ctx.agent_var:
+                positions[color, t] = pos
+    return positions
+
+
+@pytest.mark.parametrize("seed", [None, 3])
+@pytest.mark.parametrize("make_solver", _LASER_SOLVERS, ids=_LASER_SOLVER_IDS)
+@pytest.mark.parametrize("level,t", [(1, 10), (2, 10)])
+def test_decode_positions_matches_a_full_model_scan(make_solver, level, t, seed):
+    world = World.level(level)
+    world.reset()
+    solver = make_solver(LLEAdapter(world), T_MAX=t, seed=seed)
+    result, model = solver.solve()
+    assert result
+
+    positions = solver.decode_positions(model)
+
+    assert positions.shape == (len(world.start_pos), t + 1, 2)
+    assert np.array_equal(positions, _decode_by_scan(solver, model, t))
+
+
+@pytest.mark.parametrize("level,t", [(3, 10), (5, 19), (6, 21)])
+def test_decoded_actions_replay_to_the_exits(level, t):
+    world = World.level(level)
+    world.reset()
+    solver = WorldSolver(LLEAdapter(world), T_MAX=t)
+    _, model = solver.solve()
+
+    positions, actions = solver.decode_trajectories(model)
+
+    assert actions.shape == (positions.shape[0], t)
+    world.reset()
+    for step, plan_step in enumerate(solver.extract_plan(model), start=1):
+        world.step(list(plan_step))
+        assert world.agents_positions == [tuple(p) for p in positions[:, step].tolist()]
+    assert sorted(world.agents_positions) == sorted(world.exit_pos)
+
+
+def test_actions_from_positions_rejects_jumps():
+    positions = np.array([[[0, 0], [0, 1], [1, 2]]])
+    with pytest.raises(ValueError, match="Invalid movement for agent 0 at t=1->2"):
+        actions_from_positions(positions)
+
+
+# ==========================================================
+# CNF cache
+# ==========================================================
+
+
+@pytest.mark.parametrize("make_solver", _LASER_SOLVERS, ids=_LASER_SOLVER_IDS)
+@pytest.mark.parametrize("level,t", [(3, 9), (3, 10), (6, 21)])
+def test_cnf_cache_hit_skips_encoding(tmp_path, monkeypatch, make_solver, level, t):
+    world = World.level(level)
+    world.reset()
+    cache = CNFCache(tmp_path)
+    encoded = make_solver(LLEAdapter(world), T_MAX=t, cnf_cache=cache)
+    expected, _ = encoded.solve()
+
+    def no_encoding(self):
+        raise AssertionError("a cache hit must not encode")
+
+    monkeypatch.setattr(WorldSolver, "_encode_constraints", no_encoding)
+    cached = make_solver(LLEAdapter(world), T_MAX=t, cnf_cache=cache)
+    result, model = cached.solve()
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert list(cached.model.literals) == list(encoded.model.literals)
+    assert cached.var.num_vars == encoded.var.num_vars
+    assert bool(result) == bool(expected)
+    if result:
+        cached.decode_positions(model)
+
+
+def test_cnf_cache_keys_separate_variants_and_options(tmp_path):
+    world = World.level(3)
+    world.reset()
+    adapted = LLEAdapter(world)
+    solvers = [
+        WorldSolver(adapted, T_MAX=10),
+        WorldSolver(adapted, T_MAX=11),
+        WorldSolver(adapted, T_MAX=10, movement_method=METHOD_GLOBAL),
+        WorldSolver(adapted, T_MAX=10, laser_encoding=LASER_RAY),
+        WorldSolverStrictLaser(adapted, T_MAX=10),
+        WorldSolverSelectiveStrictLaser(adapted, [0], T_MAX=10),
+        WorldSolverSelectiveStrictLaser(adapted, [1], T_MAX=10),
+    ]
+
+    keys = {CNFCache.key(solver.encoding_signature()) for solver in solvers}
+
+    assert len(keys) == len(solvers)
+
+
+def test_cnf_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = CNFCache(tmp_path, max_entries=2)
+    solvers = []
+    for t in (8, 9, 10):
+        world = World.level(3)
+        world.reset()
+        solvers.append(WorldSolver(LLEAdapter(world), T_MAX=t, cnf_cache=cache))
+    keys = [CNFCache.key(solver.encoding_signature()) for solver in solvers]
+
+    solvers[0].build_model()
+    solvers[1].build_model()
+    assert cache.load(keys[0]) is not None  # refreshes the first entry
+    solvers[2].build_model()
+
+    assert len(cache) == 2
+    assert keys[0] in cache and keys[1] not in cache and keys[2] in cache
+
+
+def test_cnf_cache_respects_its_size_bound(tmp_path):
+    world = World.level(6)
+    world.reset()
+    cache = CNFCache(tmp_path, max_bytes=1)
+    WorldSolver(LLEAdapter(world), T_MAX=21, cnf_cache=cache).build_model()
+
+    assert len(cache) == 0
+
+
+def test_cnf_cache_exports_dimacs(tmp_path):
+    world = World.level(3)
+    world.reset()
+    cache = CNFCache(tmp_path / "cache")
+    solver = WorldSolver(LLEAdapter(world), T_MAX=10, cnf_cache=cache)
+    solver.build_model()
+
+    path = tmp_path / "level3.cnf"
+    cache.export_dimacs(CNFCache.key(solver.encoding_signature()), path)
+    cnf = CNF(from_file=str(path))
+
+    assert path.read_text().splitlines()[0] == (
+        f"p cnf {solver.var.num_vars} {len(solver.model)}"
+    )
+    assert cnf.clauses == [clause.tolist() for clause in solver.model.iter_clauses()]
+
+
+def test_incremental_solver_rejects_a_cnf_cache(tmp_path):
+    world = World.level(3)
+    world.reset()
+    with pytest.raises(ValueError, match="cannot use a CNF cache"):
+        IncrementalWorldSolver(LLEAdapter(world), cnf_cache=CNFCache(tmp_path))